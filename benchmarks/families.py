@@ -0,0 +1,60 @@
+"""
+Parameterised families of farmer games for benchmarking, generalising the examples in the `data` directory.
+"""
+
+from typing import Callable, Dict, List, Tuple
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.generators import GeneratedInstance, alphabet_instance, pirates_instance
+from src.farmerGame.state import State
+
+
+def _game(instance: GeneratedInstance) -> FarmerGame:
+    n_items: int = len(instance.item_names)
+    game = FarmerGame(instance.item_names)
+    game.set_source(State.from_mask(instance.source, n_items))
+    game.set_target(State.from_mask(instance.target, n_items))
+    game.add_bad_states(State.from_mask(mask, n_items) for mask in instance.bad_masks())
+    return game
+
+
+def pirates_game(n_pirates: int, n_gold: int) -> FarmerGame:
+    """
+    Creates the pirates game of `data/generatePiratesExample.py` with any number of pirates and pieces of gold.
+
+    The captain is the farmer. A state is bad when the captain is on the left with at least two pirates and less gold
+    than pirates, as the pirates would mutiny. Unlike the original script, which leaves the last piece of gold out of
+    the count, every piece of gold is counted.
+
+    Args:
+        n_pirates (int): The number of pirates.
+        n_gold (int): The number of pieces of gold.
+
+    Returns:
+        FarmerGame: The game of moving everything from the right to the left side, with its bad states enumerated.
+    """
+    return _game(pirates_instance(n_pirates, n_gold))
+
+
+def alphabet_game(n_consonants: int, n_vowels: int, n_symbols: int) -> FarmerGame:
+    """
+    Creates the alphabet game of `data/generateAlphabetExample.py` with groups of any size.
+
+    The first consonant is the farmer. A state is bad when exactly one other consonant, one vowel and one symbol are on
+    one side and everything else is on the other side.
+
+    Args:
+        n_consonants (int): The number of consonants, including the farmer.
+        n_vowels (int): The number of vowels.
+        n_symbols (int): The number of symbols.
+
+    Returns:
+        FarmerGame: The game of moving everything from the right to the left side, with its bad states enumerated.
+    """
+    return _game(alphabet_instance(n_consonants, n_vowels, n_symbols))
+
+
+# the instances of each family, from the size of the examples in `data` upwards
+FAMILIES: Dict[str, Tuple[Callable[..., FarmerGame], List[Tuple[int, ...]]]] = {
+    "pirates": (pirates_game, [(3, 5), (4, 6), (5, 7), (6, 8)]),
+    "alphabet": (alphabet_game, [(3, 3, 3), (4, 4, 4), (5, 5, 5), (6, 6, 6)]),
+}
@@ -0,0 +1,202 @@
+"""
+Runs every search strategy on families of generated games and records the time, memory and states expanded.
+
+### Example, from the root of the repository:
+    python -m benchmarks.run --family pirates --output results.json
+    python -m benchmarks.run --compare results.json --output new-results.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+from src.farmerGame.batch import STRATEGIES
+from src.farmerGame.farmerGame import FarmerGame
+from .families import FAMILIES
+
+
+def _parse_size(text: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in text.split(","))
+
+
+def measure(game: FarmerGame, strategy: str, repeat: int = 3, memory: bool = True) -> Dict[str, Any]:
+    """
+    Solves a game with one strategy and measures the search.
+
+    The time is the best of `repeat` runs without tracing, the peak memory comes from one extra run under
+    `tracemalloc`, which slows the search down too much to time it at the same time. Only the memory of the calling
+    process is traced, so the workers of `parallel_bfs` are not counted.
+
+    Args:
+        game (FarmerGame): The game to solve, with its source and target set.
+        strategy (str): The name of the `FarmerGame` search method.
+        repeat (int, optional): The number of timed runs. Defaults to 3.
+        memory (bool, optional): Whether to measure the peak memory. Defaults to True.
+
+    Returns:
+        Dict[str, Any]: The strategy, whether a path was found, its number of steps, the best time in seconds, the
+        peak memory in bytes (None when not measured), the states expanded and the states expanded per second.
+    """
+    seconds: float = float("inf")
+    success: bool = False
+    steps: Optional[int] = None
+    for _ in range(repeat):
+        gc.collect()
+        start: float = time.perf_counter()
+        path, success = getattr(game, strategy)()
+        seconds = min(seconds, time.perf_counter() - start)
+        steps = len(path) - 1 if success else None
+
+    peak_bytes: Optional[int] = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        getattr(game, strategy)()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "strategy": strategy,
+        "success": success,
+        "steps": steps,
+        "seconds": seconds,
+        "peak_bytes": peak_bytes,
+        "states_expanded": game.states_expanded,
+        "states_per_second": game.states_expanded / seconds if seconds > 0 else None,
+    }
+
+
+def run(
+    families: List[str],
+    strategies: List[str],
+    sizes: Optional[List[Tuple[int, ...]]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    progress: Any = sys.stderr,
+) -> List[Dict[str, Any]]:
+    """
+    Measures every strategy on every instance of the given families.
+
+    Strategies that fail on an instance, for example `vectorized_bfs` without numpy, are recorded with their error.
+
+    Args:
+        families (List[str]): The names of the families in `FAMILIES`.
+        strategies (List[str]): The names of the `FarmerGame` search methods.
+        sizes (Optional[List[Tuple[int, ...]]], optional): The parameters of the instances, used for every family.
+            Defaults to None, which takes the default sizes of each family.
+        repeat (int, optional): The number of timed runs per measurement. Defaults to 3.
+        memory (bool, optional): Whether to measure the peak memory. Defaults to True.
+        progress (optional): The stream progress lines are written to, None to stay silent. Defaults to standard
+            error.
+
+    Returns:
+        List[Dict[str, Any]]: One record per family, instance and strategy, see `measure`.
+    """
+    results: List[Dict[str, Any]] = []
+    for family in families:
+        generator, default_sizes = FAMILIES[family]
+        for size in sizes or default_sizes:
+            game: FarmerGame = generator(*size)
+            for strategy in strategies:
+                record: Dict[str, Any] = {
+                    "family": family,
+                    "size": list(size),
+                    "n_items": len(game.itemNames),
+                    "n_bad_states": len(game.badStates),
+                }
+                try:
+                    record.update(measure(game, strategy, repeat, memory))
+                except Exception as error:
+                    record.update({"strategy": strategy, "error": f"{type(error).__name__}: {error}"})
+                results.append(record)
+                if progress is not None:
+                    progress.write(_describe(record) + "\n")
+    return results
+
+
+def _describe(record: Dict[str, Any]) -> str:
+    name: str = f"{record['family']}{tuple(record['size'])} {record['strategy']}"
+    if "error" in record:
+        return f"{name}: {record['error']}"
+    memory: str = f", {record['peak_bytes'] / 2 ** 20:.1f} MiB" if record["peak_bytes"] is not None else ""
+    return f"{name}: {record['seconds']:.4f}s{memory}, {record['states_expanded']} states expanded"
+
+
+def compare(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> List[str]:
+    """
+    Lists the change in time and memory of every measurement that appears in both runs.
+
+    Args:
+        previous (List[Dict[str, Any]]): The results of the earlier run.
+        current (List[Dict[str, Any]]): The results of the new run.
+
+    Returns:
+        List[str]: One line per measurement, with the ratio of the new to the old time and peak memory.
+    """
+    def key(record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return record["family"], tuple(record["size"]), record["strategy"]
+
+    old: Dict[Tuple[Any, ...], Dict[str, Any]] = {key(record): record for record in previous if "error" not in record}
+    lines: List[str] = []
+    for record in current:
+        before: Optional[Dict[str, Any]] = old.get(key(record))
+        if before is None or "error" in record:
+            continue
+        line: str = (
+            f"{record['family']}{tuple(record['size'])} {record['strategy']}: "
+            f"time x{record['seconds'] / before['seconds']:.2f}"
+        )
+        if record["peak_bytes"] and before["peak_bytes"]:
+            line += f", memory x{record['peak_bytes'] / before['peak_bytes']:.2f}"
+        lines.append(line)
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search strategies on generated farmer games.")
+    parser.add_argument("--family", action="append", choices=sorted(FAMILIES), help="family to run, default all")
+    parser.add_argument("--strategy", action="append", choices=STRATEGIES, help="strategy to run, default all")
+    parser.add_argument(
+        "--size", action="append", type=_parse_size, help="comma-separated family parameters, such as 3,5 for pirates"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per measurement")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("-o", "--output", default="benchmark-results.json", help="JSON file for the results")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = run(
+        args.family or sorted(FAMILIES),
+        args.strategy or list(STRATEGIES),
+        args.size,
+        args.repeat,
+        not args.no_memory,
+        None if args.quiet else sys.stderr,
+    )
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            previous: List[Dict[str, Any]] = json.load(file)["results"]
+        for line in compare(previous, results):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
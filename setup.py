@@ -33,4 +33,8 @@ setup(
     py_modules=[splitext(basename(path))[0] for path in glob("src/*.py")],
     include_package_data=True,
     zip_safe=False,
+    extras_require={
+        # vectorized search, bad-state arrays and fast instance generation
+        "fast": ["numpy"],
+    },
 )
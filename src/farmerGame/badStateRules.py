@@ -0,0 +1,312 @@
+import hashlib
+from array import array
+from typing import Callable, Container, List, Optional, Sequence, Union
+from .stateSet import SortedMaskArray, StateBitSet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+def _items_mask(items: Sequence[int]) -> int:
+    mask: int = 0
+    for item in items:
+        mask |= 1 << item
+    return mask
+
+
+def _count(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _count_array(masks: "np.ndarray", items_mask: int) -> "np.ndarray":
+    selected = masks & np.uint64(items_mask)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(selected).astype(np.int64)
+    counts = np.zeros(masks.shape, dtype=np.int64)
+    for i in range(64):
+        if items_mask >> i & 1:
+            counts += ((selected >> np.uint64(i)) & np.uint64(1)).astype(np.int64)
+    return counts
+
+
+class BadStateRule:
+    """
+    Base class for a rule that decides whether a state is bad by looking at its bitmask.
+
+    Rules are checked lazily during the search, so the bad states never have to be enumerated or stored. A subclass
+    implements `is_bad` and can override `is_bad_array` with a NumPy version for the vectorized search.
+    """
+
+    def is_bad(self, mask: int) -> bool:
+        """
+        Decides whether the state with the given bitmask is bad.
+
+        Args:
+            mask (int): The bitmask of the state, bit `i` is set when item `i` is on the left side.
+
+        Returns:
+            bool: True if the state is bad.
+        """
+        raise NotImplementedError
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        """
+        Decides for an array of `uint64` bitmasks which of them are bad.
+
+        Args:
+            masks (np.ndarray): The bitmasks of the states.
+
+        Returns:
+            np.ndarray: A boolean array that is True where the state is bad.
+        """
+        return np.fromiter(map(self.is_bad, masks.tolist()), dtype=bool, count=masks.size)
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        Describes the rule by a string that is the same in every run, used to key cached solutions.
+
+        Returns:
+            Optional[str]: The description, or None if the rule cannot be described, such as an arbitrary predicate.
+        """
+        return None
+
+    def __call__(self, mask: int) -> bool:
+        return self.is_bad(mask)
+
+
+def _mask_bytes(masks: Sequence[int]) -> Union[bytes, memoryview]:
+    """
+    Gives the bytes of a sequence of unsigned 64-bit masks, without copying buffers such as a memory-mapped file.
+    """
+    try:
+        view: memoryview = memoryview(masks)  # type: ignore[arg-type]
+    except TypeError:
+        return array("Q", masks).tobytes()
+    if view.itemsize == 8 and view.format.lstrip("@=") in ("Q", "L") and view.c_contiguous:
+        return view.cast("B")
+    return array("Q", masks).tobytes()
+
+
+class PredicateRule(BadStateRule):
+    """
+    A rule given by an arbitrary predicate over the bitmask.
+
+    ### Example, the farmer may never be on the left with item 1 and item 2:
+        PredicateRule(lambda mask: mask & 0b111 == 0b111)
+    """
+
+    def __init__(
+        self,
+        predicate: Callable[[int], bool],
+        vectorized: Optional[Callable[["np.ndarray"], "np.ndarray"]] = None,
+    ) -> None:
+        """
+        Args:
+            predicate (Callable[[int], bool]): Function returning True for the bitmask of a bad state.
+            vectorized (Optional[Callable[[np.ndarray], np.ndarray]], optional): The same predicate over an array of
+                bitmasks, used by the vectorized search. Defaults to None, in which case `predicate` is applied to every
+                element.
+        """
+        self.predicate: Callable[[int], bool] = predicate
+        self.vectorized: Optional[Callable[["np.ndarray"], "np.ndarray"]] = vectorized
+
+    def is_bad(self, mask: int) -> bool:
+        return bool(self.predicate(mask))
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        if self.vectorized is None:
+            return super().is_bad_array(masks)
+        return np.asarray(self.vectorized(masks), dtype=bool)
+
+
+class ContainerRule(BadStateRule):
+    """
+    A rule that marks the bitmasks stored in a container as bad, used to feed bad states read in bulk to a game.
+
+    ### Example, using the bad states of a large file without creating `State` objects:
+        ContainerRule(bad_state_bitset_reader("./data/alphabetBadStates.txt"))
+    """
+
+    def __init__(self, masks: Container[int]) -> None:
+        """
+        Args:
+            masks (Container[int]): The bitmasks of the bad states, for example a `StateBitSet`, a `SortedMaskArray`,
+                a `frozenset` or a sorted NumPy array of `uint64`.
+        """
+        self.masks: Container[int] = masks
+
+    def is_bad(self, mask: int) -> bool:
+        if np is not None and isinstance(self.masks, np.ndarray):
+            position: int = int(np.searchsorted(self.masks, mask))
+            return position < self.masks.size and int(self.masks[position]) == mask
+        return mask in self.masks
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        if isinstance(self.masks, StateBitSet):
+            bits = np.frombuffer(self.masks.bits, dtype=np.uint8)
+            selected = bits[(masks >> np.uint64(3)).astype(np.intp)]
+            return ((selected >> (masks & np.uint64(7)).astype(np.uint8)) & 1).astype(bool)
+        sorted_masks: Optional["np.ndarray"] = None
+        if isinstance(self.masks, np.ndarray):
+            sorted_masks = self.masks
+        elif isinstance(self.masks, SortedMaskArray):
+            sorted_masks = np.frombuffer(self.masks.masks, dtype=np.uint64)
+        if sorted_masks is None:
+            return super().is_bad_array(masks)
+        if sorted_masks.size == 0:
+            return np.zeros(masks.shape, dtype=bool)
+        positions = np.minimum(np.searchsorted(sorted_masks, masks), sorted_masks.size - 1)
+        return sorted_masks[positions] == masks
+
+    def fingerprint(self) -> Optional[str]:
+        data: Union[bytes, bytearray, memoryview]
+        if isinstance(self.masks, StateBitSet):
+            data = self.masks.bits
+        elif isinstance(self.masks, SortedMaskArray):
+            data = _mask_bytes(self.masks.masks)
+        elif isinstance(self.masks, (set, frozenset)):
+            data = array("Q", sorted(self.masks)).tobytes()
+        elif np is not None and isinstance(self.masks, np.ndarray):
+            data = self.masks.astype(np.uint64).tobytes()
+        else:
+            return None
+        return f"{type(self.masks).__name__}:{hashlib.sha256(data).hexdigest()}"
+
+
+class TogetherWithoutRule(BadStateRule):
+    """
+    A rule that forbids the items of `together` to be on one side while none of the items of `without` are there.
+
+    ### Example for the Farmer Wolf Goat Cabbage problem, the goat cannot be left with the wolf or the cabbage:
+        TogetherWithoutRule([1, 2], [0])
+        TogetherWithoutRule([2, 3], [0])
+    """
+
+    def __init__(self, together: Sequence[int], without: Sequence[int]) -> None:
+        """
+        Args:
+            together (Sequence[int]): Indices of the items that may not be on one side together unattended.
+            without (Sequence[int]): Indices of the items of which at least one has to be present to keep the peace.
+        """
+        self.together: int = _items_mask(together)
+        self.without: int = _items_mask(without)
+
+    def is_bad(self, mask: int) -> bool:
+        on_left: bool = mask & self.together == self.together and not mask & self.without
+        on_right: bool = not mask & self.together and mask & self.without == self.without
+        return on_left or on_right
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        together = np.uint64(self.together)
+        without = np.uint64(self.without)
+        on_left = ((masks & together) == together) & ((masks & without) == 0)
+        on_right = ((masks & together) == 0) & ((masks & without) == without)
+        return on_left | on_right
+
+    def fingerprint(self) -> Optional[str]:
+        return f"TogetherWithout:{self.together}:{self.without}"
+
+
+class CountRule(BadStateRule):
+    """
+    A rule that forbids the number of `items` on one side to be between two thresholds.
+
+    ### Example, no more than two of the items 1, 2 and 3 may be on the left side:
+        CountRule([1, 2, 3], at_least=3)
+    """
+
+    def __init__(
+        self,
+        items: Sequence[int],
+        at_least: int = 0,
+        at_most: Optional[int] = None,
+        left: bool = True,
+    ) -> None:
+        """
+        Args:
+            items (Sequence[int]): Indices of the counted items.
+            at_least (int, optional): The state is bad when at least this many items are on the side. Defaults to 0.
+            at_most (Optional[int], optional): The state is only bad when at most this many items are on the side.
+                Defaults to None, meaning no upper threshold.
+            left (bool, optional): Whether the items on the left side (True) or on the right side (False) are counted.
+                Defaults to True.
+        """
+        self.items: int = _items_mask(items)
+        self.at_least: int = at_least
+        self.at_most: int = len(items) if at_most is None else at_most
+        self.left: bool = left
+
+    def is_bad(self, mask: int) -> bool:
+        side: int = mask if self.left else ~mask
+        return self.at_least <= _count(side & self.items) <= self.at_most
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        counts = _count_array(masks if self.left else ~masks, self.items)
+        return (counts >= self.at_least) & (counts <= self.at_most)
+
+    def fingerprint(self) -> Optional[str]:
+        return f"Count:{self.items}:{self.at_least}:{self.at_most}:{self.left}"
+
+
+class OutnumberRule(BadStateRule):
+    """
+    A rule that forbids the items of `group` to outnumber the items of `others` on one side.
+
+    ### Example, pirates 1 to 3 may not outnumber gold 4 to 8 on the left side:
+        OutnumberRule([1, 2, 3], [4, 5, 6, 7, 8])
+    """
+
+    def __init__(self, group: Sequence[int], others: Sequence[int], left: bool = True) -> None:
+        """
+        Args:
+            group (Sequence[int]): Indices of the items that may not be in the majority.
+            others (Sequence[int]): Indices of the items they are compared to.
+            left (bool, optional): Whether the left side (True) or the right side (False) is checked. Defaults to True.
+        """
+        self.group: int = _items_mask(group)
+        self.others: int = _items_mask(others)
+        self.left: bool = left
+
+    def is_bad(self, mask: int) -> bool:
+        side: int = mask if self.left else ~mask
+        return _count(side & self.group) > _count(side & self.others)
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        side = masks if self.left else ~masks
+        return _count_array(side, self.group) > _count_array(side, self.others)
+
+    def fingerprint(self) -> Optional[str]:
+        return f"Outnumber:{self.group}:{self.others}:{self.left}"
+
+
+class AllOf(BadStateRule):
+    """
+    A rule that marks a state as bad only when all of its sub-rules do.
+
+    ### Example, a mutiny happens when the captain and at least two pirates are left with less gold than pirates:
+        AllOf(CountRule([0], at_least=1), CountRule([1, 2, 3], at_least=2), OutnumberRule([1, 2, 3], [4, 5, 6, 7, 8]))
+    """
+
+    def __init__(self, *rules: BadStateRule) -> None:
+        """
+        Args:
+            *rules (BadStateRule): The rules that all have to mark a state as bad.
+        """
+        self.rules: tuple[BadStateRule, ...] = rules
+
+    def is_bad(self, mask: int) -> bool:
+        return all(rule.is_bad(mask) for rule in self.rules)
+
+    def is_bad_array(self, masks: "np.ndarray") -> "np.ndarray":
+        bad = np.ones(masks.shape, dtype=bool)
+        for rule in self.rules:
+            bad &= rule.is_bad_array(masks)
+        return bad
+
+    def fingerprint(self) -> Optional[str]:
+        fingerprints: List[Optional[str]] = [rule.fingerprint() for rule in self.rules]
+        if None in fingerprints:
+            return None
+        return f"AllOf({','.join(fingerprints)})"  # type: ignore[arg-type]
@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+from .binaryFormat import load_instance
+from .dataReader import bad_state_reader, game_reader
+from .farmerGame import FarmerGame
+from .state import State
+
+STRATEGIES: tuple[str, ...] = (
+    "bfs",
+    "compact_bfs",
+    "bidirectional_bfs",
+    "astar",
+    "ida_star",
+    "vectorized_bfs",
+    "parallel_bfs",
+    "external_bfs",
+    "dijkstra",
+)
+BINARY_SUFFIX: str = ".fgb"
+# number of shared pools tried for an instance before it is solved in a pool of its own, to find the one that crashes
+SHARED_POOL_ATTEMPTS: int = 2
+
+
+class Instance:
+    """
+    A farmer game stored on disk, either as a text data file with an optional bad-states file or as a binary file.
+
+    Attributes:
+        name (str): The name of the instance used in the results.
+        data_path (str): Path to the text data file or to the binary instance file.
+        bad_states_path (Optional[str]): Path to the text bad-states file, None for binary files or games without
+            bad states.
+    """
+
+    def __init__(self, name: str, data_path: str, bad_states_path: Optional[str] = None) -> None:
+        self.name: str = name
+        self.data_path: str = data_path
+        self.bad_states_path: Optional[str] = bad_states_path
+
+    def load(self) -> FarmerGame:
+        """
+        Reads the game from disk.
+
+        Returns:
+            FarmerGame: The game with its source, target and bad states set.
+        """
+        if self.data_path.endswith(BINARY_SUFFIX):
+            return load_instance(self.data_path)
+        game: FarmerGame = game_reader(self.data_path)
+        if self.bad_states_path is not None:
+            game.add_bad_states(bad_state_reader(self.bad_states_path))
+        return game
+
+
+def find_instances(path: str) -> List[Instance]:
+    """
+    Lists the instances in a directory or a manifest file.
+
+    In a directory every binary `.fgb` file is an instance, and so is every text file whose name ends in `data.txt`
+    (ignoring case), paired with the file with the same prefix ending in `badstates.txt` when there is one, such as
+    `alphabetData.txt` and `alphabetBadStates.txt`.
+
+    A manifest is a text file listing one instance per line: the path to a data file optionally followed by the path
+    to its bad-states file, or the path to a binary file. Relative paths are relative to the manifest and lines
+    starting with `#` are skipped.
+
+    Args:
+        path (str): Path to the directory or the manifest.
+
+    Raises:
+        ValueError: If a line of the manifest lists more than two paths.
+
+    Returns:
+        List[Instance]: The instances, in the order of the manifest or sorted by name for a directory.
+    """
+    instances: List[Instance] = []
+    if os.path.isdir(path):
+        file_names: Dict[str, str] = {name.lower(): name for name in os.listdir(path)}
+        for lower_name, file_name in sorted(file_names.items()):
+            if lower_name.endswith(BINARY_SUFFIX):
+                instances.append(Instance(file_name[: -len(BINARY_SUFFIX)], os.path.join(path, file_name)))
+            elif lower_name.endswith("data.txt"):
+                prefix: str = lower_name[: -len("data.txt")]
+                bad_states_name: Optional[str] = file_names.get(prefix + "badstates.txt")
+                instances.append(
+                    Instance(
+                        file_name[: -len("data.txt")] or "data",
+                        os.path.join(path, file_name),
+                        os.path.join(path, bad_states_name) if bad_states_name else None,
+                    )
+                )
+        return instances
+
+    directory: str = os.path.dirname(path)
+    with open(path, "r") as manifest:
+        for line_number, line in enumerate(manifest, start=1):
+            paths: List[str] = line.split()
+            if not paths or paths[0].startswith("#"):
+                continue
+            if len(paths) > 2:
+                raise ValueError(f"{path}:{line_number}: expected a data file and a bad-states file, got {line.strip()!r}")
+            paths = [os.path.join(directory, file_path) for file_path in paths]
+            name: str = os.path.splitext(os.path.basename(paths[0]))[0]
+            instances.append(Instance(name, *paths))
+    return instances
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _raise_timeout(signum: int, frame: Any) -> None:
+    raise _Timeout()
+
+
+def _new_record(instance: Instance, strategy: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "instance": instance.name,
+        "data": instance.data_path,
+        "bad_states": instance.bad_states_path,
+        "strategy": strategy,
+        "status": "error",
+        "steps": None,
+        "path": None,
+        "states_expanded": None,
+        "seconds": None,
+        "error": error,
+    }
+
+
+def solve_instance(instance: Instance, strategy: str = "bfs", timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Loads and solves one instance, meant to run in a worker process.
+
+    Every call reads its own game, so the item names of one instance never leak into another. The timeout is enforced
+    with `SIGALRM` where the platform supports it.
+
+    Args:
+        instance (Instance): The instance to solve.
+        strategy (str, optional): The name of the `FarmerGame` search method to use. Defaults to "bfs".
+        timeout (Optional[float], optional): The number of seconds after which the search is abandoned. Defaults to
+            None, meaning no timeout.
+
+    Returns:
+        Dict[str, Any]: The result record: the instance name and paths, the status (`"solved"`, `"unsolvable"`,
+        `"timeout"` or `"error"`), the number of steps, the path as rows of the text format, the number of expanded
+        states, the elapsed seconds and an error message if any.
+    """
+    record: Dict[str, Any] = _new_record(instance, strategy)
+    use_alarm: bool = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)  # type: ignore[arg-type]
+
+    start: float = time.perf_counter()
+    try:
+        game: FarmerGame = instance.load()
+        path: List[State]
+        success: bool
+        path, success = getattr(game, strategy)()
+        record["states_expanded"] = game.states_expanded
+        if success:
+            record["status"] = "solved"
+            record["steps"] = len(path) - 1
+            record["path"] = [" ".join(str(int(left)) for left in state.items_left) for state in path]
+        else:
+            record["status"] = "unsolvable"
+    except _Timeout:
+        record["status"] = "timeout"
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def _solve_in_pool(
+    instances: List[Instance], strategy: str, timeout: Optional[float], workers: Optional[int]
+) -> Iterator[tuple[Instance, Optional[Dict[str, Any]]]]:
+    """
+    Solves instances in one process pool and yields every instance with its record as soon as it is done.
+
+    The record is None when the pool broke before the instance was solved, because a worker process died. Other
+    failures to get a result are turned into an `"error"` record.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: Dict[Future, Instance] = {
+            executor.submit(solve_instance, instance, strategy, timeout): instance for instance in instances
+        }
+        for future in as_completed(futures):
+            instance: Instance = futures[future]
+            try:
+                yield instance, future.result()
+            except BrokenProcessPool:
+                yield instance, None
+            except Exception as error:
+                yield instance, _new_record(instance, strategy, f"{type(error).__name__}: {error}")
+
+
+def solve_batch(
+    instances: List[Instance],
+    output: TextIO,
+    strategy: str = "bfs",
+    timeout: Optional[float] = None,
+    workers: Optional[int] = None,
+    progress: Optional[TextIO] = sys.stderr,
+) -> Dict[str, int]:
+    """
+    Solves instances in parallel worker processes and writes one JSON line per instance as soon as it is solved.
+
+    When a worker process dies, for example because it ran out of memory, the pool breaks and the instances it had
+    not finished are solved again in a fresh pool. Instances that were unfinished in `SHARED_POOL_ATTEMPTS` broken
+    pools are then solved one pool each, so the instance that kills its worker is reported as an `"error"` and the
+    others are still solved.
+
+    Args:
+        instances (List[Instance]): The instances to solve.
+        output (TextIO): The stream the JSON Lines results are written to.
+        strategy (str, optional): The name of the `FarmerGame` search method to use. Defaults to "bfs".
+        timeout (Optional[float], optional): The number of seconds per instance. Defaults to None, meaning no timeout.
+        workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+        progress (Optional[TextIO], optional): The stream progress lines are written to, None to stay silent.
+            Defaults to standard error.
+
+    Returns:
+        Dict[str, int]: The number of instances per status.
+    """
+    counts: Dict[str, int] = {}
+    done: int = 0
+    pending: List[Instance] = list(instances)
+    attempt: int = 0
+    while pending:
+        attempt += 1
+        isolated: bool = attempt > SHARED_POOL_ATTEMPTS
+        unfinished: List[Instance] = []
+        for pool in ([instance] for instance in pending) if isolated else [pending]:
+            for instance, record in _solve_in_pool(pool, strategy, timeout, 1 if isolated else workers):
+                if record is None:
+                    if not isolated:
+                        unfinished.append(instance)
+                        continue
+                    record = _new_record(instance, strategy, "BrokenProcessPool: the worker process died")
+                done += 1
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+                if progress is not None:
+                    steps: str = f", {record['steps']} steps" if record["steps"] is not None else ""
+                    seconds: str = f" in {record['seconds']:.3f}s" if record["seconds"] is not None else ""
+                    progress.write(
+                        f"[{done}/{len(instances)}] {record['instance']}: {record['status']}{seconds}{steps}\n"
+                    )
+        if unfinished and progress is not None:
+            progress.write(f"a worker process died, solving {len(unfinished)} unfinished instances again\n")
+        pending = unfinished
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve many farmer game instances in parallel.")
+    parser.add_argument("instances", help="directory of instance files or manifest listing them")
+    parser.add_argument("-o", "--output", default="-", help="JSON Lines file for the results, - for standard output")
+    parser.add_argument("-s", "--strategy", choices=STRATEGIES, default="bfs")
+    parser.add_argument("-t", "--timeout", type=float, default=None, help="seconds per instance")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    instances: List[Instance] = find_instances(args.instances)
+    progress: Optional[TextIO] = None if args.quiet else sys.stderr
+    if args.output == "-":
+        counts = solve_batch(instances, sys.stdout, args.strategy, args.timeout, args.workers, progress)
+    else:
+        with open(args.output, "w") as output:
+            counts = solve_batch(instances, output, args.strategy, args.timeout, args.workers, progress)
+
+    if progress is not None:
+        progress.write(", ".join(f"{count} {status}" for status, count in sorted(counts.items())) + "\n")
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
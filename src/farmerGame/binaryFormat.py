@@ -0,0 +1,258 @@
+"""
+A binary on-disk format for farmer games, which is memory-mapped on load so no parsing is needed.
+
+All integers are little-endian. The file consists of:
+1. A header of `HEADER.size` bytes: the magic bytes `MAGIC`, the format version, the bad-state encoding, the number of
+   items, the source and target bitmasks, the length of the item names in bytes and the number of bad states.
+2. The item names, encoded as UTF-8 and separated by newlines, padded with zero bytes to a multiple of 8 bytes.
+3. The bad states, either as a sorted array of unsigned 64-bit bitmasks (`ENCODING_SORTED`) or as a dense bit array
+   with one bit per possible state (`ENCODING_DENSE`), laid out like a `StateBitSet`.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterable, List, Optional, Sequence, Union
+from .badStateRules import ContainerRule
+from .dataReader import game_reader, iter_bad_state_masks
+from .farmerGame import FarmerGame
+from .state import State
+from .stateSet import SortedMaskArray, StateBitSet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+MAGIC: bytes = b"FGAMEBIN"
+VERSION: int = 1
+ENCODING_SORTED: int = 0
+ENCODING_DENSE: int = 1
+# magic, version, encoding, reserved, number of items, source, target, length of the names, number of bad states
+HEADER: struct.Struct = struct.Struct("<8sHBBIQQQQ")
+# number of masks written at once when streaming sorted bad states
+CHUNK_SIZE: int = 1 << 16
+
+
+def _padding(length: int) -> int:
+    return -length % 8
+
+
+def _little_endian(masks: array) -> array:
+    if sys.byteorder == "big":
+        masks.byteswap()
+    return masks
+
+
+def _write_sorted(file: BinaryIO, bad_masks: Iterable[int], presorted: bool) -> int:
+    """
+    Writes bitmasks as a sorted array of unsigned 64-bit integers and returns how many were written.
+
+    When `presorted` is set the masks are streamed in chunks, otherwise they are sorted in memory first.
+    """
+    if not presorted:
+        bad_masks = sorted(set(bad_masks))
+
+    written: int = 0
+    previous: int = -1
+    chunk: array = array("Q")
+    for mask in bad_masks:
+        if mask <= previous:
+            raise ValueError(f"Bad states should be strictly increasing, got {mask} after {previous}")
+        previous = mask
+        chunk.append(mask)
+        if len(chunk) == CHUNK_SIZE:
+            _little_endian(chunk).tofile(file)
+            written += len(chunk)
+            chunk = array("Q")
+    _little_endian(chunk).tofile(file)
+    return written + len(chunk)
+
+
+def _write_sorted_chunks(file: BinaryIO, chunks: Iterable[Sequence[int]]) -> int:
+    """
+    Writes chunks of bitmasks as one sorted array of unsigned 64-bit integers and returns how many were written.
+
+    NumPy arrays are checked and written as a whole, other chunks go through `_write_sorted` one mask at a time.
+    """
+    written: int = 0
+    previous: int = -1
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        if np is not None and isinstance(chunk, np.ndarray):
+            masks: "np.ndarray" = chunk.astype("<u8", copy=False)
+            if int(masks[0]) <= previous or not np.all(masks[1:] > masks[:-1]):
+                raise ValueError(f"Bad states should be strictly increasing, got a chunk starting at {int(masks[0])}")
+            file.write(masks.tobytes())
+            written += len(masks)
+        else:
+            if chunk[0] <= previous:
+                raise ValueError(f"Bad states should be strictly increasing, got {chunk[0]} after {previous}")
+            written += _write_sorted(file, chunk, presorted=True)
+        previous = int(chunk[-1])
+    return written
+
+
+def write_instance(
+    file_path: str,
+    item_names: tuple[str, ...],
+    source: int,
+    target: int,
+    bad_masks: Iterable[int],
+    encoding: str = "auto",
+    presorted: bool = False,
+    chunked: bool = False,
+) -> None:
+    """
+    Writes a farmer game to a binary instance file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        item_names (tuple[str, ...]): The names of the items, the first one being the farmer.
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        bad_masks (Iterable[int]): The bitmasks of the bad states.
+        encoding (str, optional): `"sorted"` for a sorted array of masks, `"dense"` for a bit array with 2^n bits, or
+            `"auto"` for whichever is smaller. Defaults to "auto".
+        presorted (bool, optional): Whether `bad_masks` is already strictly increasing, which lets the sorted encoding
+            stream the masks to disk without holding them in memory. Defaults to False.
+        chunked (bool, optional): Whether `bad_masks` yields strictly increasing chunks of masks, such as NumPy
+            arrays, instead of single masks. Chunks are written with the sorted encoding as a whole, which is much
+            faster for NumPy arrays. Defaults to False.
+
+    Raises:
+        ValueError: If the encoding is unknown or a presorted stream of masks is not strictly increasing.
+        ValueError: If chunked bad states are given with another encoding than `"sorted"`.
+        ValueError: If the game has more than 64 items.
+    """
+    n_items: int = len(item_names)
+    if n_items > 64:
+        raise ValueError(f"The binary format holds at most 64 items, got {n_items}")
+    if encoding not in ("auto", "sorted", "dense"):
+        raise ValueError(f"Unknown bad-state encoding {encoding!r}")
+    if chunked and encoding != "sorted":
+        raise ValueError(f"Chunked bad states are written with the sorted encoding, got {encoding!r}")
+
+    names: bytes = "\n".join(item_names).encode("utf-8")
+    n_bytes_dense: int = max(1, (1 << n_items) >> 3)
+    if encoding == "auto":
+        # the number of bad states is only known up front for a collection
+        if not isinstance(bad_masks, (list, tuple, set, frozenset, StateBitSet, SortedMaskArray)):
+            bad_masks = list(bad_masks)
+        encoding = "dense" if n_bytes_dense < 8 * len(bad_masks) else "sorted"  # type: ignore[arg-type]
+
+    with open(file_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, 0, n_items, source, target, len(names), 0))
+        file.write(names + bytes(_padding(len(names))))
+
+        if encoding == "dense":
+            bad_states: StateBitSet = StateBitSet.from_masks(bad_masks, n_items)
+            file.write(bad_states.bits)
+            n_bad_states: int = len(bad_states)
+            encoding_id: int = ENCODING_DENSE
+        elif chunked:
+            n_bad_states = _write_sorted_chunks(file, bad_masks)  # type: ignore[arg-type]
+            encoding_id = ENCODING_SORTED
+        else:
+            n_bad_states = _write_sorted(file, bad_masks, presorted)
+            encoding_id = ENCODING_SORTED
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, encoding_id, 0, n_items, source, target, len(names), n_bad_states))
+
+
+def convert_text_instance(
+    data_path: str, bad_states_path: str, file_path: str, encoding: str = "auto"
+) -> None:
+    """
+    Converts a game in the text format of `dataReader` into a binary instance file.
+
+    ### Example:
+        convert_text_instance("./data/alphabetData.txt", "./data/alphabetBadStates.txt", "./data/alphabet.fgb")
+
+    Args:
+        data_path (str): Path to the text file with the item names, the source and the target.
+        bad_states_path (str): Path to the text file with the bad states.
+        file_path (str): Path of the binary file to write.
+        encoding (str, optional): The encoding of the bad states, see `write_instance`. Defaults to "auto".
+    """
+    game: FarmerGame = game_reader(data_path)
+    bad_masks: Iterable[int] = iter_bad_state_masks(bad_states_path, len(game.itemNames))
+    write_instance(
+        file_path,
+        game.itemNames,
+        game.source.mask,  # type: ignore[union-attr]
+        game.target.mask,  # type: ignore[union-attr]
+        bad_masks,
+        encoding,
+    )
+
+
+def load_instance(file_path: str) -> FarmerGame:
+    """
+    Loads a binary instance file by memory-mapping it.
+
+    The bad states are not parsed or copied: the game checks them through a `ContainerRule` over a `SortedMaskArray`
+    or a `StateBitSet` that reads straight from the mapped file, so loading takes the same time for any file size.
+
+    Args:
+        file_path (str): Path to the binary instance file.
+
+    Raises:
+        ValueError: If the file is not a binary instance file or has an unsupported version or encoding.
+
+    Returns:
+        FarmerGame: The game described by the file, with its bad states as a rule in `badRules`.
+    """
+    with open(file_path, "rb") as file:
+        mapped: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < HEADER.size:
+        raise ValueError(f"{file_path} is too short to be a binary instance file")
+    magic, version, encoding, _, n_items, source, target, names_length, n_bad_states = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"{file_path} is not a binary instance file")
+    if version != VERSION:
+        raise ValueError(f"{file_path} has version {version}, only version {VERSION} is supported")
+
+    offset: int = HEADER.size
+    item_names: tuple[str, ...] = tuple(
+        bytes(mapped[offset:offset + names_length]).decode("utf-8").split("\n")
+    ) if names_length else ()
+    offset += names_length + _padding(names_length)
+
+    view: memoryview = memoryview(mapped)
+    bad_states: Union[SortedMaskArray, StateBitSet]
+    if encoding == ENCODING_SORTED:
+        masks: Union[memoryview, array] = view[offset:offset + 8 * n_bad_states].cast("Q")
+        if sys.byteorder == "big":
+            masks = _little_endian(array("Q", masks))
+        bad_states = SortedMaskArray(masks)
+    elif encoding == ENCODING_DENSE:
+        n_bytes: int = max(1, (1 << n_items) >> 3)
+        bad_states = StateBitSet(n_items, view[offset:offset + n_bytes])  # type: ignore[arg-type]
+    else:
+        raise ValueError(f"{file_path} has unknown bad-state encoding {encoding}")
+
+    game: FarmerGame = FarmerGame(item_names, bad_rules=[ContainerRule(bad_states)])
+    State.add_item_names(item_names)
+    game.set_source(State.from_mask(source, n_items))
+    game.set_target(State.from_mask(target, n_items))
+    return game
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert a text farmer game into a binary instance file.")
+    parser.add_argument("data", help="text file with the item names, the source and the target")
+    parser.add_argument("bad_states", help="text file with the bad states")
+    parser.add_argument("output", help="binary instance file to write")
+    parser.add_argument("--encoding", choices=("auto", "sorted", "dense"), default="auto")
+    args = parser.parse_args(argv)
+    convert_text_instance(args.data, args.bad_states, args.output, args.encoding)
+
+
+if __name__ == "__main__":
+    main()
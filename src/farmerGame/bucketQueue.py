@@ -0,0 +1,73 @@
+from typing import List
+
+
+class BucketQueue:
+    """
+    A monotone priority queue for small integer priorities, as used by Dial's variant of Dijkstra's algorithm.
+
+    In Dijkstra's algorithm with edge costs between 0 and `max_step`, every queued priority lies between the priority
+    last popped and that plus `max_step`. The queue therefore keeps `max_step + 1` buckets in a ring, indexed by the
+    priority modulo the number of buckets, and pushing and popping take constant time instead of the logarithmic time
+    of a binary heap. Items with the same priority are popped last in, first out.
+
+    Attributes:
+        max_step (int): The largest difference between a pushed priority and the priority last popped.
+    """
+
+    __slots__ = ("max_step", "_buckets", "_current", "_size")
+
+    def __init__(self, max_step: int) -> None:
+        """
+        Creates an empty queue whose smallest priority is 0.
+
+        Args:
+            max_step (int): The largest edge cost, at least 0.
+
+        Raises:
+            ValueError: If `max_step` is negative.
+        """
+        if max_step < 0:
+            raise ValueError(f"The largest step should be at least 0, got {max_step}")
+        self.max_step: int = max_step
+        self._buckets: List[List[int]] = [[] for _ in range(max_step + 1)]
+        self._current: int = 0
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, priority: int, item: int) -> None:
+        """
+        Adds an item to the queue.
+
+        Args:
+            priority (int): The priority of the item, between the priority last popped and that plus `max_step`.
+            item (int): The item, such as the bitmask of a state.
+
+        Raises:
+            ValueError: If the priority is outside the range the queue can hold.
+        """
+        if not self._current <= priority <= self._current + self.max_step:
+            raise ValueError(
+                f"Priority {priority} is outside the range [{self._current}, {self._current + self.max_step}]"
+            )
+        self._buckets[priority % len(self._buckets)].append(item)
+        self._size += 1
+
+    def pop(self) -> tuple[int, int]:
+        """
+        Removes an item with the smallest priority from the queue.
+
+        Raises:
+            IndexError: If the queue is empty.
+
+        Returns:
+            tuple(int, int): The priority and the item.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty bucket queue")
+        buckets: List[List[int]] = self._buckets
+        while not buckets[self._current % len(buckets)]:
+            self._current += 1
+        self._size -= 1
+        return self._current, buckets[self._current % len(buckets)].pop()
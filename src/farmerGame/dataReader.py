@@ -1,6 +1,47 @@
 from .state import State
 from .farmerGame import FarmerGame
-from typing import Set, List
+from .stateSet import StateBitSet
+from typing import Set, List, Iterator, Optional, TextIO
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+def _parse_mask(line: str, n_items: Optional[int], file_path: str, line_number: int) -> tuple[int, int]:
+    """
+    Parses a line of space-separated `0`/`1` values directly into a bitmask.
+
+    Args:
+        line (str): The line to parse, where `1` at position `i` indicates that item `i` is on the left side.
+        n_items (Optional[int]): The expected number of values, or None to accept any number of values.
+        file_path (str): The file the line comes from, used in error messages.
+        line_number (int): The number of the line in the file, used in error messages.
+
+    Raises:
+        ValueError: If the line does not contain `n_items` values or contains values other than `0` and `1`.
+
+    Returns:
+        tuple(int, int): The bitmask, where bit `i` is set when item `i` is on the left side, and the number of values.
+    """
+    values: List[str] = line.split()
+    digits: str = "".join(values)
+    if n_items is not None and len(values) != n_items:
+        raise ValueError(
+            f"{file_path}:{line_number}: expected {n_items} values, got {len(values)}"
+        )
+    if len(digits) != len(values) or digits.strip("01"):
+        raise ValueError(f"{file_path}:{line_number}: values should be 0 or 1, got {line.strip()!r}")
+    # the first value is the lowest bit, so the digits are read in reverse
+    return (int(digits[::-1], 2) if digits else 0), len(values)
+
+
+def _read_line(file: TextIO, file_path: str, line_number: int) -> str:
+    line: str = file.readline()
+    if not line:
+        raise ValueError(f"{file_path}:{line_number}: unexpected end of file")
+    return line
 
 
 def game_reader(file_path: str) -> FarmerGame:
@@ -13,7 +54,7 @@ def game_reader(file_path: str) -> FarmerGame:
     3. A binary representation of the target state, where `1` at position `i` indicates that item `i` is on the left side.
 
     This method reads the item names, the source state, and the target state from the file. It does not initialize the `bad_states`
-    property; that is done separately via the `badStateReader`.
+    property; that is done separately via the `badStateReader`. Anything after the third line is ignored.
 
     ### Example of a valid data file:
         Farmer Wolf Goat Cabbage
@@ -23,26 +64,79 @@ def game_reader(file_path: str) -> FarmerGame:
     Args:
         file_path (str): Path to the file containing the data for the `FarmerGame` object.
 
+    Raises:
+        ValueError: If the file ends early or the source or target does not have a value for every item.
+
     Returns:
         FarmerGame: The `FarmerGame` object associated with the given input file
     """
-    def bool_mapping(x): return x == "1"
-
     with open(file_path, "r") as file:
-        lines: List[str] = file.readlines()
-        item_names: tuple[str, ...] = tuple(lines[0].split())
+        item_names: tuple[str, ...] = tuple(_read_line(file, file_path, 1).split())
+        n_items: int = len(item_names)
         game = FarmerGame(item_names)
-        State.add_item_names(item_names)
 
-        source: State = State(list(map(bool_mapping, lines[1].split())))
-        target: State = State(list(map(bool_mapping, lines[2].split())))
+        source_mask, _ = _parse_mask(_read_line(file, file_path, 2), n_items, file_path, 2)
+        target_mask, _ = _parse_mask(_read_line(file, file_path, 3), n_items, file_path, 3)
+        State.add_item_names(item_names)
 
-        game.set_source(source)
-        game.set_target(target)
+        game.set_source(State.from_mask(source_mask, n_items))
+        game.set_target(State.from_mask(target_mask, n_items))
 
     return game
 
 
+def _read_bad_states(file_path: str, n_items: Optional[int]) -> Iterator[tuple[int, int]]:
+    """
+    Streams the bad states of a file as bitmasks together with the number of items, one line at a time.
+
+    Args:
+        file_path (str): Path to the file containing the data for the bad_states.
+        n_items (Optional[int]): The number of items of every state, or None to take the width of the first state.
+
+    Raises:
+        ValueError: If the count on the first line is not a number or the file holds fewer states than it declares.
+        ValueError: If a state does not have the same number of values as the others or contains values other than
+            `0` and `1`.
+
+    Yields:
+        tuple(int, int): The bitmask of a bad state and the number of items.
+    """
+    with open(file_path, "r") as file:
+        header: str = _read_line(file, file_path, 1)
+        try:
+            n_bad_states: int = int(header)
+        except ValueError:
+            raise ValueError(f"{file_path}:1: expected the number of bad states, got {header.strip()!r}") from None
+
+        for i in range(n_bad_states):
+            line: str = file.readline()
+            if not line:
+                raise ValueError(
+                    f"{file_path}: {n_bad_states} bad states were declared, but the file ends after {i}"
+                )
+            mask, n_items = _parse_mask(line, n_items, file_path, i + 2)
+            yield mask, n_items
+
+
+def iter_bad_state_masks(file_path: str, n_items: Optional[int] = None) -> Iterator[int]:
+    """
+    Streams the bad states of a file as bitmasks, in the format read by `bad_state_reader`.
+
+    The file is read one line at a time, so the memory use does not depend on the size of the file. The declared
+    count and the width of every row are validated while reading.
+
+    Args:
+        file_path (str): Path to the file containing the data for the bad_states.
+        n_items (Optional[int], optional): The number of items of every state. Defaults to None, which takes the
+            width of the first state.
+
+    Yields:
+        int: The bitmask of a bad state, where bit `i` is set when item `i` is on the left side.
+    """
+    for mask, _ in _read_bad_states(file_path, n_items):
+        yield mask
+
+
 def bad_state_reader(file_path: str) -> Set[State]:
     """
     Creates a set of states from a file
@@ -67,13 +161,47 @@ def bad_state_reader(file_path: str) -> Set[State]:
     Returns:
         Set[State]: A set of `State` objects representing the bad states.
     """
-    def bool_mapping(x): return x == "1"
+    return {
+        State.from_mask(mask, n_items)
+        for mask, n_items in _read_bad_states(file_path, None)
+    }
 
-    with open(file_path, "r") as file:
-        lines: List[str] = file.readlines()
-        n_bad_states: int = int(lines[0])
-        bad_states: set[State] = set()
-        for i in range(n_bad_states):
-            state = State(list(map(bool_mapping, lines[i + 1].split())))
-            bad_states.add(state)
-    return bad_states
+
+def bad_state_bitset_reader(file_path: str, n_items: Optional[int] = None) -> StateBitSet:
+    """
+    Streams the bad states of a file straight into a `StateBitSet`, without creating `State` objects.
+
+    Args:
+        file_path (str): path to the file containing the data for the bad_states.
+        n_items (Optional[int], optional): The number of items of every state. Defaults to None, which takes the
+            width of the first state.
+
+    Returns:
+        StateBitSet: The set of the bad states' bitmasks.
+    """
+    bad_states: Optional[StateBitSet] = None
+    for mask, width in _read_bad_states(file_path, n_items):
+        if bad_states is None:
+            bad_states = StateBitSet(width)
+        bad_states.add(mask)
+    return bad_states if bad_states is not None else StateBitSet(n_items or 0)
+
+
+def bad_state_array_reader(file_path: str, n_items: Optional[int] = None) -> "np.ndarray":
+    """
+    Streams the bad states of a file straight into a sorted NumPy array of `uint64` bitmasks without duplicates.
+
+    Args:
+        file_path (str): path to the file containing the data for the bad_states.
+        n_items (Optional[int], optional): The number of items of every state. Defaults to None, which takes the
+            width of the first state.
+
+    Raises:
+        ImportError: If numpy is not installed.
+
+    Returns:
+        np.ndarray: The sorted bitmasks of the bad states.
+    """
+    if np is None:
+        raise ImportError("Reading bad states into an array requires numpy, install it with `pip install numpy`")
+    return np.unique(np.fromiter(iter_bad_state_masks(file_path, n_items), dtype=np.uint64))
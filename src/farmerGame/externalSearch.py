@@ -0,0 +1,174 @@
+import heapq
+import mmap
+import os
+import tempfile
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional
+from .state import State
+from .stateSet import SortedMaskArray
+
+# number of masks read from or written to a layer file at once
+CHUNK_SIZE: int = 1 << 16
+# number of generated masks held in memory before they are sorted and spilled to a run file
+MEMORY_LIMIT: int = 1 << 20
+
+
+def _read_masks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[int]:
+    """
+    Streams the masks of a file of unsigned 64-bit integers in native byte order, one chunk at a time.
+    """
+    with open(file_path, "rb") as file:
+        while True:
+            chunk: array = array("Q")
+            try:
+                chunk.fromfile(file, chunk_size)
+            except EOFError:
+                # the masks of a short last chunk are still read
+                yield from chunk
+                return
+            yield from chunk
+
+
+def _write_masks(file_path: str, masks: Iterable[int], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Writes masks to a file of unsigned 64-bit integers in native byte order and returns how many were written.
+    """
+    written: int = 0
+    with open(file_path, "wb") as file:
+        chunk: array = array("Q")
+        for mask in masks:
+            chunk.append(mask)
+            if len(chunk) == chunk_size:
+                chunk.tofile(file)
+                written += len(chunk)
+                chunk = array("Q")
+        chunk.tofile(file)
+    return written + len(chunk)
+
+
+def _unique(masks: Iterable[int]) -> Iterator[int]:
+    """
+    Drops the repeated masks of a sorted stream.
+    """
+    previous: Optional[int] = None
+    for mask in masks:
+        if mask != previous:
+            yield mask
+            previous = mask
+
+
+def _subtract(masks: Iterable[int], exclude: Iterable[int]) -> Iterator[int]:
+    """
+    Streams the masks of a sorted stream that do not appear in a second sorted stream.
+    """
+    excluded: Iterator[int] = iter(exclude)
+    current: Optional[int] = next(excluded, None)
+    for mask in masks:
+        while current is not None and current < mask:
+            current = next(excluded, None)
+        if mask != current:
+            yield mask
+
+
+def _predecessor(file_path: str, mask: int, n_items: int, capacity: int) -> int:
+    """
+    Finds a neighbour of `mask` in a sorted layer file by binary search over the memory-mapped file.
+    """
+    with open(file_path, "rb") as file:
+        mapped: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view: memoryview = memoryview(mapped).cast("Q")
+    layer: SortedMaskArray = SortedMaskArray(view)
+    try:
+        return next(
+            neighbour for neighbour in State.neighbour_masks(mask, n_items, capacity) if neighbour in layer
+        )
+    finally:
+        del layer
+        view.release()
+        mapped.close()
+
+
+def external_bfs(
+    n_items: int,
+    source: int,
+    target: int,
+    capacity: int = 1,
+    is_bad: Optional[Callable[[int], bool]] = None,
+    directory: Optional[str] = None,
+    memory_limit: int = MEMORY_LIMIT,
+) -> tuple[Optional[List[int]], int]:
+    """
+    Breadth-first search over bitmasks that keeps its layers in files, so the number of states is bounded by the disk.
+
+    Every layer is stored as a sorted file of unsigned 64-bit masks. The neighbours of a layer are generated in
+    sorted runs of at most `memory_limit` masks, which are merged into one sorted stream. Every move is its own
+    inverse, so a neighbour of layer `d` is either new or in layer `d` or `d - 1`, and the duplicates are removed by
+    merging the stream with those two files. The path is rebuilt backwards from the target by looking up a neighbour
+    in every earlier layer with a binary search over the memory-mapped file.
+
+    Args:
+        n_items (int): The number of items in the game, at most 64.
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+        is_bad (Optional[Callable[[int], bool]], optional): Function returning True for the bitmask of a bad state.
+            Defaults to None, meaning no bad states.
+        directory (Optional[str], optional): The directory in which a temporary directory for the layer files is
+            created, which is removed afterwards. Defaults to None, which uses the system's temporary directory.
+        memory_limit (int, optional): The number of generated masks held in memory before they are spilled to disk.
+            Defaults to `MEMORY_LIMIT`.
+
+    Raises:
+        ValueError: If the game has more than 64 items.
+
+    Returns:
+        tuple(Optional[List[int]], int): The bitmasks on the path from `source` to `target` (or None when the target
+        cannot be reached) and the number of expanded states.
+    """
+    if n_items > 64:
+        raise ValueError(f"Layer files hold masks of at most 64 items, got {n_items}")
+    neighbour_masks: Callable[[int, int, int], List[int]] = State.neighbour_masks
+    expanded: int = 0
+
+    with tempfile.TemporaryDirectory(prefix="farmerGame-", dir=directory) as work_directory:
+        layers: List[str] = [os.path.join(work_directory, "layer0.bin")]
+        _write_masks(layers[0], [source])
+        found: bool = source == target
+
+        while not found:
+            runs: List[str] = []
+            generated: array = array("Q")
+            for mask in _read_masks(layers[-1]):
+                expanded += 1
+                generated.extend(neighbour_masks(mask, n_items, capacity))
+                if len(generated) >= memory_limit:
+                    runs.append(os.path.join(work_directory, f"run{len(runs)}.bin"))
+                    _write_masks(runs[-1], sorted(set(generated)))
+                    generated = array("Q")
+
+            candidates: Iterator[int] = _unique(
+                heapq.merge(sorted(set(generated)), *(_read_masks(run) for run in runs))
+            )
+            del generated
+            previous: Iterator[int] = heapq.merge(*(_read_masks(layer) for layer in layers[-2:]))
+
+            layer: str = os.path.join(work_directory, f"layer{len(layers)}.bin")
+
+            def new_masks() -> Iterator[int]:
+                nonlocal found
+                for candidate in _subtract(candidates, previous):
+                    if is_bad is None or not is_bad(candidate):
+                        found = found or candidate == target
+                        yield candidate
+
+            written: int = _write_masks(layer, new_masks())
+            for run in runs:
+                os.remove(run)
+            if not written:
+                return None, expanded
+            layers.append(layer)
+
+        path: List[int] = [target]
+        for layer in reversed(layers[:-1]):
+            path.append(_predecessor(layer, path[-1], n_items, capacity))
+        return path[::-1], expanded
@@ -1,8 +1,27 @@
-from typing import List, Set, Optional, Deque
+from typing import List, Set, Optional, Deque, Dict, Callable, Sequence, Container, Union, Iterator
 from .state import State
+from .badStateRules import BadStateRule
+from .stateSet import StateBitSet, mask_container, new_visited_set
+from .maskTable import DENSE_TABLE_MAX_ITEMS, MaskTable
+from .heuristics import Heuristic, misplaced_items_heuristic
+from .vectorSearch import vectorized_bfs
+from .parallelSearch import parallel_bfs
+from .externalSearch import MEMORY_LIMIT, external_bfs
+from .solutionCache import SolutionCache, instance_fingerprint
+from .searchStats import SearchStats
+from .symmetry import Counts, canonical, check_symmetric, concrete_path, count_moves, representative
+from .incremental import IncrementalTree
+from .bucketQueue import BucketQueue
 from collections import deque
+from itertools import count
+import heapq
+from functools import partial
+from time import perf_counter
 from collections.abc import Iterable
 
+# ways of combining the crossing costs of the farmer and the items in the boat into the cost of a crossing
+COST_MODES: tuple[str, ...] = ("max", "sum")
+
 
 class FarmerGame:
     """
@@ -11,12 +30,22 @@ class FarmerGame:
     Attributes:
         itemNames (tuple[str, ...]): The names of the items in the game.
         badStates (set[State]): A set of states that are invalid.
+        badRules (List[BadStateRule]): Rules that decide lazily whether a state is invalid.
+        capacity (int): The number of items the farmer can take along per crossing.
         source (State): The starting state of the game.
         target (State): The target state of the game.
+        states_expanded (int): The number of states whose neighbours the most recent search generated. The target
+            is never counted, so every strategy reports the same count for the same frontier order.
+        stats (SearchStats): The counters and timings of the most recent `bfs`.
+        item_groups (List[tuple[int, ...]]): The indices of groups of interchangeable items, see `set_item_groups`.
     """
 
     def __init__(
-        self, item_names: tuple[str, ...], bad_states: Optional[Set[State]] = None
+        self,
+        item_names: tuple[str, ...],
+        bad_states: Optional[Set[State]] = None,
+        bad_rules: Optional[Sequence[BadStateRule]] = None,
+        capacity: int = 1,
     ) -> None:
         """
         Initializes a Farmer's Game with the provided items and optionally defines bad states.
@@ -24,44 +53,177 @@ class FarmerGame:
         This method sets up the game based on a tuple of `item_names`, which represent the items involved in the game.
         The first item in the tuple is always the item (Farmer), that is required to cross the river with any other items.
         Additionally, a set of "bad" or forbidden states can be provided to specify configurations that are not allowed.
+        Bad states can also be described by rules, which are checked during the search instead of being enumerated.
 
         Args:
             item_names (tuple[str, ...]): A tuple of strings representing the names of the items in the game.
                 The first item in the tuple is the farmer, who must always accompany other items during crossings.
             bad_states (Optional[Set[State]], optional): A set of states that are considered illegal and should be avoided.
                 Defaults to None if no bad states are specified.
+            bad_rules (Optional[Sequence[BadStateRule]], optional): Rules marking states as illegal, see `badStateRules`.
+                Defaults to None if no rules are specified.
+            capacity (int, optional): The number of items, besides the farmer, that fit in the boat. Defaults to 1.
+
+        Raises:
+            ValueError: If the capacity is smaller than 1.
         """
 
+        if capacity < 1:
+            raise ValueError(f"The boat should fit at least one item besides the farmer, got capacity {capacity}")
+
         self.itemNames: tuple[str, ...] = item_names
         if not bad_states:
             self.badStates: Set[State] = set()
         else:
             self.badStates = bad_states
+        self.badRules: List[BadStateRule] = list(bad_rules) if bad_rules else []
+        self.capacity: int = capacity
         self.source: Optional[State] = None
         self.target: Optional[State] = None
+        self.states_expanded: int = 0
+        self.stats: SearchStats = SearchStats()
+        self.item_groups: List[tuple[int, ...]] = []
+        # cost of every item, combined by `cost_mode` into the cost of a crossing, see `set_crossing_costs`
+        self.crossing_costs: List[int] = [1] * len(item_names)
+        self.cost_mode: str = "max"
+        # shortest-path tree towards the target, filled by `precompute`
+        self._next_hop: Optional[MaskTable] = None
+        self._distance: Optional[MaskTable] = None
+        # connected component of every good state, filled by `label_components`
+        self._components: Optional[MaskTable] = None
+        # shortest-path tree from the source, filled by `incremental_solve` and repaired when bad states change
+        self._incremental: Optional[IncrementalTree] = None
+        # the capacity, bad states and rules the results above were computed for, see `__drop_stale`
+        self._cache_key: Optional[tuple] = None
 
     def set_source(self, source: State) -> None:
-        if self.badStates is not None:
-            if source in self.badStates:
-                raise ValueError("Source State is a bad State")
-            else:
-                self.source = source
-        else:
-            self.source = source
+        if self.is_bad(source):
+            raise ValueError("Source State is a bad State")
+        self.source = source
 
     def set_target(self, target: State) -> None:
-        if self.badStates is not None:
-            if target in self.badStates:
-                raise ValueError("Source State is a bad State")
-            else:
-                self.target = target
-        else:
-            self.target = target
+        if self.is_bad(target):
+            raise ValueError("Target State is a bad State")
+        if self.target != target:
+            self.__invalidate(bad_states_changed=False)
+        self.target = target
+
+    def __invalidate(self, bad_states_changed: bool = True) -> None:
+        """
+        Drops the results of `precompute`, which no longer hold after the target or the bad states change, and the
+        labels of `label_components` and the tree of `incremental_solve`, which only depend on the bad states.
+        """
+        self._next_hop = None
+        self._distance = None
+        if bad_states_changed:
+            self._components = None
+            self._incremental = None
+
+    def __game_key(self) -> tuple:
+        """
+        Private method that summarizes the capacity, the bad states and the rules that the cached results depend on.
+        """
+        return self.capacity, len(self.badStates), hash(frozenset(self.badStates)), tuple(self.badRules)
+
+    def __drop_stale(self) -> None:
+        """
+        Private method that drops the cached results when `capacity`, `badStates` or `badRules` were changed directly
+        instead of through the methods of this class since the results were computed.
+        """
+        if self._next_hop is None and self._components is None and self._incremental is None:
+            return
+        if self._cache_key != self.__game_key():
+            self.__invalidate()
+
+    def is_bad(self, state: State) -> bool:
+        """
+        Checks whether a state is one of the `badStates` or is marked as bad by one of the `badRules`.
+
+        Args:
+            state (State): The state to check.
+
+        Returns:
+            bool: True if the state is bad.
+        """
+        return state in self.badStates or any(
+            rule.is_bad(state.mask) for rule in self.badRules
+        )
+
+    def bad_state_checker(self) -> Callable[[int], bool]:
+        """
+        Creates a function deciding from a bitmask whether the state is bad, used in the inner loop of the searches.
+
+        The bad states are snapshotted into a set of masks, or a dense `StateBitSet` when that is smaller, so changes
+        to `badStates` or `badRules` made after calling this method are not seen by the returned function.
+
+        Returns:
+            Callable[[int], bool]: A function that returns True for the bitmask of a bad state.
+        """
+        bad_masks: Container[int] = mask_container(
+            [state.mask for state in self.badStates], len(self.itemNames)
+        )
+        rules: tuple[BadStateRule, ...] = tuple(self.badRules)
+        if not rules:
+            return bad_masks.__contains__
+
+        def is_bad_mask(mask: int) -> bool:
+            return mask in bad_masks or any(rule.is_bad(mask) for rule in rules)
+
+        return is_bad_mask
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        Computes a fingerprint of the game that is the same in every run, used to key a `SolutionCache`.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            Optional[str]: The fingerprint, or None if one of the `badRules` cannot be fingerprinted.
+        """
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        return instance_fingerprint(
+            self.itemNames,
+            self.capacity,
+            self.source.mask,
+            self.target.mask,
+            (state.mask for state in self.badStates),
+            self.badRules,
+        )
+
+    def add_bad_rules(self, bad_rules: Iterable[BadStateRule]) -> None:
+        """
+        Adds all rules in the given Iterable to `badRules`.
+
+        Args:
+            bad_rules (Iterable[BadStateRule]): Iterable of rules to be added to the `badRules` attribute of `FarmerGame`.
+
+        Raises:
+            ValueError: If a rule marks the source state as bad.
+            ValueError: If a rule marks the target state as bad.
+        """
+        for rule in bad_rules:
+            if self.source is not None and rule.is_bad(self.source.mask):
+                raise ValueError(
+                    f"Attempted to add rule {rule} which marks the source state as bad"
+                )
+            elif self.target is not None and rule.is_bad(self.target.mask):
+                raise ValueError(
+                    f"Attempted to add rule {rule} which marks the target state as bad"
+                )
+            self.badRules.append(rule)
+            self.__invalidate()
 
     def add_bad_states(self, bad_states: Iterable[State]) -> None:
         """
         Adds all states in the given Iterable to `bad_states`.
 
+        If `incremental_solve` has been called, its search tree is repaired for the new bad states instead of dropped.
+
         Args:
             bad_states (Iterable[State]): Iterable of states to be added to the `bad_states` attribute of `FarmerGame`.
 
@@ -69,16 +231,62 @@ class FarmerGame:
             ValueError: If a state equal to the source state is attempted to be added.
             ValueError: If a state equal to the target state is attempted to be added.
         """
+        self.__drop_stale()
+        tree: Optional[IncrementalTree] = self._incremental
+        added: List[int] = []
+        try:
+            for state in bad_states:
+                if state == self.source:
+                    raise ValueError(
+                        f"Attempted to add state {state} which is the source state"
+                    )
+                elif state == self.target:
+                    raise ValueError(
+                        f"Attempted to add state {state} which is the target state"
+                    )
+                if state not in self.badStates:
+                    added.append(state.mask)
+                self.badStates.add(state)
+                self.__invalidate()
+        finally:
+            # the states added before an error are kept, so the tree is repaired for those as well
+            if tree is not None and self.source is not None and tree.root == self.source.mask:
+                tree.add_bad(added, self.__is_bad_mask)
+                self._incremental = tree
+                self._cache_key = self.__game_key()
+
+    def remove_bad_states(self, bad_states: Iterable[State]) -> None:
+        """
+        Removes all states in the given Iterable from `bad_states`, ignoring states that are not in it.
+
+        A removed state can still be bad because of one of the `badRules`. If `incremental_solve` has been called, its
+        search tree is repaired for the removed states instead of dropped.
+
+        Args:
+            bad_states (Iterable[State]): Iterable of states to be removed from the `bad_states` attribute of
+                `FarmerGame`.
+        """
+        self.__drop_stale()
+        removed: List[int] = []
         for state in bad_states:
-            if state == self.source:
-                raise ValueError(
-                    f"Attempted to add state {state} which is the source state"
-                )
-            elif state == self.target:
-                raise ValueError(
-                    f"Attempted to add state {state} which is the target state"
-                )
-            self.badStates.add(state)
+            if state in self.badStates:
+                self.badStates.remove(state)
+                removed.append(state.mask)
+        if not removed:
+            return
+        tree: Optional[IncrementalTree] = self._incremental
+        self.__invalidate()
+        if tree is not None and self.source is not None and tree.root == self.source.mask:
+            tree.remove_bad(removed, self.__is_bad_mask)
+            self._incremental = tree
+            self._cache_key = self.__game_key()
+
+    def __is_bad_mask(self, mask: int) -> bool:
+        """
+        Checks whether the state of a bitmask is bad against the current bad states, unlike `bad_state_checker` which
+        takes a snapshot. Used for the few lookups of an incremental repair, where a snapshot would cost more.
+        """
+        return self.is_bad(State.from_mask(mask, len(self.itemNames)))
 
     @staticmethod
     def __back_track(end_state: State) -> tuple[List[State], bool]:
@@ -114,37 +322,58 @@ class FarmerGame:
         Returns:
             None: this method does not return any value.
         """
-        print(f"Actions required to reach State {self.target} from {self.source}:")
+        print(f"Actions required to reach State {path[-1]} from {path[0]}:")
 
         for i in range(len(path) - 1):
             curr: State = path[i]
             next_state: State = path[i + 1]
+            moved: int = curr.mask ^ next_state.mask
             left_idx: List[int] = []
             right_idx: List[int] = []
 
-            for idx, values in enumerate(zip(curr.items_left, next_state.items_left)):
-                diff: int = int(values[1]) - int(values[0])
-                if diff == 0:
+            for idx in range(curr.n_items):
+                if not moved >> idx & 1:
                     continue
-                elif diff == 1:
+                elif next_state.mask >> idx & 1:
                     left_idx.append(idx)
-                elif diff == -1:
+                else:
                     right_idx.append(idx)
 
-            left_moved_items: str = ", ".join([curr.item_names[idx] for idx in left_idx])
-            right_moved_items: str = ", ".join([curr.item_names[idx] for idx in right_idx])
+            left_moved_items: str = ", ".join([self.itemNames[idx] for idx in left_idx])
+            right_moved_items: str = ", ".join([self.itemNames[idx] for idx in right_idx])
             if left_moved_items:
                 print(f"Move {left_moved_items} left")
             elif right_moved_items:
                 print(f"move {right_moved_items} right")
 
-    def bfs(self, print_actions: bool = False) -> tuple[List[State], bool]:
+    def bfs(
+        self,
+        print_actions: bool = False,
+        cache: Optional[SolutionCache] = None,
+        on_expand: Optional[Callable[[State], None]] = None,
+        on_level: Optional[Callable[[int, SearchStats], None]] = None,
+        on_goal: Optional[Callable[[List[State], SearchStats], None]] = None,
+    ) -> tuple[List[State], bool]:
         """
         Performs a breadth-first search (BFS) to find a valid path from the source state to the target state.
 
+        The visited states are kept in a dense `StateBitSet` when the game is small enough, see `stateSet`. When the
+        components have been labelled by `label_components`, a target outside the component of the source is reported
+        unreachable without a search. The search works through the frontier one depth level at a time and records its
+        counters and timings in `stats`.
+
         Args:
             print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
                 to the target state. Defaults to False.
+            cache (Optional[SolutionCache], optional): A cache that is consulted before the search and that stores
+                its result, keyed by the `fingerprint` of the game. Games with rules that cannot be fingerprinted are
+                always searched. Defaults to None, meaning no cache.
+            on_expand (Optional[Callable[[State], None]], optional): Called with every state taken from the frontier
+                other than the target, before its neighbours are generated. Defaults to None.
+            on_level (Optional[Callable[[int, SearchStats], None]], optional): Called with the depth and the statistics
+                so far after every completed level. Defaults to None.
+            on_goal (Optional[Callable[[List[State], SearchStats], None]], optional): Called with the path and the
+                final statistics when the target is found. Defaults to None.
 
         Raises:
             ValueError: If the source state is not specified.
@@ -161,26 +390,1275 @@ class FarmerGame:
             raise ValueError("Source is not specified")
         if not isinstance(self.target, State):
             raise ValueError("Target is not specified")
+
+        stats: SearchStats = SearchStats()
+        self.stats = stats
+        self.states_expanded = 0
+        self.__drop_stale()
+        if self._components is not None and not self.is_reachable():
+            return [], False
+
+        key: Optional[str] = self.fingerprint() if cache is not None else None
+        if key is not None:
+            cached: Optional[tuple[tuple[int, ...], bool]] = cache.lookup(key)  # type: ignore[union-attr]
+            if cached is not None:
+                if not cached[1]:
+                    return [], False
+                cached_path: List[State] = self.__path_from_masks(list(cached[0]))
+                if print_actions:
+                    self.__moves_from_path(cached_path)
+                return cached_path, True
+
+        start: float = perf_counter()
         q: Deque[State] = deque()
-        visited: Set[State] = {self.source}
+        visited: Union[StateBitSet, Set[int]] = new_visited_set(len(self.itemNames))
+        visited.add(self.source.mask)
         q.append(self.source)
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        # the counters are kept in locals in the inner loop and copied to `stats` after every level
+        generated: int = 0
+        expanded: int = 0
+        duplicates: int = 0
+        bad_rejections: int = 0
+        depth: int = 0
 
         while q:
-            curr: State = q.popleft()
-            if curr == self.target:
-                path: List[State]
-                success: bool
-                path, success = self.__back_track(curr)
+            level_start: float = perf_counter()
+            stats.peak_frontier = max(stats.peak_frontier, len(q))
+            for _ in range(len(q)):
+                curr: State = q.popleft()
+                if curr == self.target:
+                    path: List[State]
+                    success: bool
+                    path, success = self.__back_track(curr)
+                    now: float = perf_counter()
+                    stats.generated, stats.expanded = generated, expanded
+                    stats.duplicates, stats.bad_rejections = duplicates, bad_rejections
+                    stats.level_seconds.append(now - level_start)
+                    stats.total_seconds = now - start
+                    self.states_expanded = expanded
+                    if on_goal is not None:
+                        on_goal(path, stats)
+                    if key is not None:
+                        cache.store(key, [state.mask for state in path], success)  # type: ignore[union-attr]
+                    if print_actions:
+                        self.__moves_from_path(path)
+                        return path, success
+                    else:
+                        return path, success
+
+                expanded += 1
+                if on_expand is not None:
+                    on_expand(curr)
+                for neighbour in curr.get_neighbours(self.capacity):
+                    generated += 1
+                    if neighbour.mask not in visited:
+                        if not is_bad(neighbour.mask):
+                            visited.add(neighbour.mask)
+                            q.append(neighbour)
+                        else:
+                            bad_rejections += 1
+                    else:
+                        duplicates += 1
+
+            stats.generated, stats.expanded = generated, expanded
+            stats.duplicates, stats.bad_rejections = duplicates, bad_rejections
+            stats.level_seconds.append(perf_counter() - level_start)
+            if on_level is not None:
+                on_level(depth, stats)
+            depth += 1
+
+        stats.total_seconds = perf_counter() - start
+        self.states_expanded = expanded
+        if key is not None:
+            cache.store(key, [], False)  # type: ignore[union-attr]
+        return [], False
+
+    def compact_bfs(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Performs a breadth-first search that records parents in a compact `MaskTable` instead of `State.prev` pointers.
+
+        The search works on bitmasks only, so apart from the queue of plain ints no object is kept alive for a
+        discovered state. The path is rebuilt from the parent table once the target is found. This uses far less peak
+        memory than `bfs` on large instances.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        n_items: int = len(self.itemNames)
+        capacity: int = self.capacity
+        source: int = self.source.mask
+        target: int = self.target.mask
+        neighbour_masks = State.neighbour_masks
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        self.states_expanded = 0
+
+        # the source is its own parent, which marks it as visited and ends the path reconstruction
+        parents: MaskTable = MaskTable(n_items)
+        parents[source] = source
+        q: Deque[int] = deque([source])
+
+        while q:
+            curr: int = q.popleft()
+            if curr == target:
+                path: List[State] = self.__path_from_masks(self.__masks_from_parents(parents, curr))
                 if print_actions:
                     self.__moves_from_path(path)
-                    return path, success
-                else:
-                    return path, success
+                return path, True
+            self.states_expanded += 1
 
-            for neighbour in curr.get_neighbours():
-                if neighbour not in visited:
-                    if neighbour not in self.badStates:
-                        visited.add(neighbour)
-                        q.append(neighbour)
+            for neighbour in neighbour_masks(curr, n_items, capacity):
+                if neighbour not in parents and not is_bad(neighbour):
+                    parents[neighbour] = curr
+                    q.append(neighbour)
 
         return [], False
+
+    @staticmethod
+    def __masks_from_parents(parents: MaskTable, end: int) -> List[int]:
+        """
+        Private method that follows a parent table from `end` back to the root, whose parent is itself.
+
+        Args:
+            parents (MaskTable): The table mapping every discovered mask to the mask it was discovered from.
+            end (int): The mask at which the path ends.
+
+        Returns:
+            List[int]: The masks on the path from the root to `end`.
+        """
+        masks: List[int] = [end]
+        while parents[end] != end:
+            end = parents[end]
+            masks.append(end)
+        return masks[::-1]
+
+    def __search_tree(
+        self,
+        root: int,
+        goals: Optional[Set[int]] = None,
+        is_bad: Optional[Callable[[int], bool]] = None,
+        dense: Optional[bool] = None,
+    ) -> tuple[MaskTable, MaskTable]:
+        """
+        Private method that runs a breadth-first search over bitmasks from `root` and keeps the whole search tree.
+
+        Every move is its own inverse, so the parent of a state in a tree grown from the target is the next hop on a
+        shortest path from that state to the target.
+
+        Args:
+            root (int): The bitmask of the state the search starts from.
+            goals (Optional[Set[int]], optional): Bitmasks after whose discovery the search may stop early. Defaults to
+                None, which explores every state reachable from `root`.
+            is_bad (Optional[Callable[[int], bool]], optional): The bad-state check to use, so that callers running
+                many searches build it once. Defaults to None, which calls `bad_state_checker`.
+            dense (Optional[bool], optional): Whether the tables are flat arrays, see `MaskTable`. Defaults to None,
+                which decides by the number of items.
+
+        Returns:
+            tuple(MaskTable, MaskTable): The parent and the distance to `root` of every discovered state. The root is
+            its own parent.
+        """
+        n_items: int = len(self.itemNames)
+        capacity: int = self.capacity
+        neighbour_masks = State.neighbour_masks
+        if is_bad is None:
+            is_bad = self.bad_state_checker()
+        remaining: Set[int] = set(goals) if goals is not None else set()
+        remaining.discard(root)
+        self.states_expanded = 0
+
+        parents: MaskTable = MaskTable(n_items, dense=dense)
+        distances: MaskTable = MaskTable(n_items, "I", dense=dense)
+        parents[root] = root
+        distances[root] = 0
+        q: Deque[int] = deque([root])
+
+        while q and (goals is None or remaining):
+            curr: int = q.popleft()
+            distance: int = distances[curr] + 1
+            self.states_expanded += 1
+            for neighbour in neighbour_masks(curr, n_items, capacity):
+                if neighbour not in parents and not is_bad(neighbour):
+                    parents[neighbour] = curr
+                    distances[neighbour] = distance
+                    remaining.discard(neighbour)
+                    q.append(neighbour)
+
+        return parents, distances
+
+    def precompute(self) -> None:
+        """
+        Runs one backward breadth-first search from the target and stores a shortest-path tree towards it.
+
+        For every state that can reach the target, the distance and the next hop towards the target are kept in a
+        compact `MaskTable`. Afterwards `path_from` answers a query for any source by following the table, in time
+        linear in the length of the path. The tables are dropped when the target, the capacity, the bad states or the
+        bad-state rules change, including direct changes to `capacity`, `badStates` or `badRules`.
+
+        Raises:
+            ValueError: If the target state is not specified.
+        """
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        self.__drop_stale()
+        self._next_hop, self._distance = self.__search_tree(self.target.mask)
+        self._cache_key = self.__game_key()
+
+    def distance_to_target(self, source: Optional[State] = None) -> Optional[int]:
+        """
+        Looks up the number of crossings from `source` to the target in the tables of `precompute`.
+
+        Args:
+            source (Optional[State], optional): The state to start from. Defaults to the source of the game.
+
+        Raises:
+            ValueError: If no source is given and the source of the game is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            Optional[int]: The length of a shortest path, or None if the target cannot be reached.
+        """
+        source = self.__precomputed_query(source)
+        return self._distance.get(source.mask)  # type: ignore[union-attr]
+
+    def path_from(
+        self, source: Optional[State] = None, print_actions: bool = False
+    ) -> tuple[List[State], bool]:
+        """
+        Finds a shortest path from `source` to the target by following the tables of `precompute`, without a search.
+
+        The tables are computed first when they are missing or outdated.
+
+        Args:
+            source (Optional[State], optional): The state to start from. Defaults to the source of the game.
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If no source is given and the source of the game is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the target
+            can be reached. If no path exists, defaults to ([], False).
+        """
+        source = self.__precomputed_query(source)
+        next_hop: MaskTable = self._next_hop  # type: ignore[assignment]
+        if source.mask not in next_hop:
+            return [], False
+
+        path: List[State] = self.__path_from_masks(
+            self.__masks_from_parents(next_hop, source.mask)[::-1]
+        )
+        if print_actions:
+            self.__moves_from_path(path)
+        return path, True
+
+    def label_components(self) -> int:
+        """
+        Labels every good state with the connected component of the move graph it belongs to.
+
+        The labels are kept in a dense `MaskTable` indexed by bitmask, so that `is_reachable` is a constant-time lookup
+        afterwards and `bfs` gives up at once on a target outside the component of the source. Labelling visits all
+        2^n states, so it pays off when several queries are asked, or when unsolvable instances are common, since
+        those make `bfs` exhaust the component of the source. The labels are dropped when the capacity, the bad states
+        or the bad-state rules change, including direct changes to `capacity`, `badStates` or `badRules`.
+
+        Raises:
+            ValueError: If the game has more than `DENSE_TABLE_MAX_ITEMS` items.
+
+        Returns:
+            int: The number of components.
+        """
+        n_items: int = len(self.itemNames)
+        if n_items > DENSE_TABLE_MAX_ITEMS:
+            raise ValueError(
+                f"Labelling visits all 2^n states and supports at most {DENSE_TABLE_MAX_ITEMS} items, got {n_items}"
+            )
+        self.__drop_stale()
+        capacity: int = self.capacity
+        neighbour_masks = State.neighbour_masks
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        labels: MaskTable = MaskTable(n_items, "I", dense=True)
+
+        label: int = 0
+        for start in range(1 << n_items):
+            if start in labels or is_bad(start):
+                continue
+            labels[start] = label
+            stack: List[int] = [start]
+            while stack:
+                curr: int = stack.pop()
+                for neighbour in neighbour_masks(curr, n_items, capacity):
+                    if neighbour not in labels and not is_bad(neighbour):
+                        labels[neighbour] = label
+                        stack.append(neighbour)
+            label += 1
+
+        self._components = labels
+        self._cache_key = self.__game_key()
+        return label
+
+    def is_reachable(self, source: Optional[State] = None, target: Optional[State] = None) -> bool:
+        """
+        Decides whether `target` can be reached from `source` by comparing their labels from `label_components`.
+
+        The components are labelled first when the labels are missing or outdated.
+
+        Args:
+            source (Optional[State], optional): The state to start from. Defaults to the source of the game.
+            target (Optional[State], optional): The state to reach. Defaults to the target of the game.
+
+        Raises:
+            ValueError: If no source is given and the source of the game is not specified.
+            ValueError: If no target is given and the target of the game is not specified.
+
+        Returns:
+            bool: True if a path from `source` to `target` exists.
+        """
+        source = source if source is not None else self.source
+        target = target if target is not None else self.target
+        if not isinstance(source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(target, State):
+            raise ValueError("Target is not specified")
+        self.__drop_stale()
+        if self._components is None:
+            self.label_components()
+
+        label: Optional[int] = self._components.get(source.mask)  # type: ignore[union-attr]
+        return label is not None and label == self._components.get(target.mask)  # type: ignore[union-attr]
+
+    def __shortest_path_layers(self) -> Optional[MaskTable]:
+        """
+        Private method that runs a breadth-first search from the source until the target is found.
+
+        All states closer to the source than the target have their final distance at that point, which is all the
+        layered graph of shortest paths needs: its edges go from a state at distance `d` to a neighbour at `d + 1`.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            Optional[MaskTable]: The distance from the source of every discovered state, or None if the target cannot
+            be reached.
+        """
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        _, distances = self.__search_tree(self.source.mask, {self.target.mask})
+        return distances if self.target.mask in distances else None
+
+    def __predecessors(self, mask: int, distances: MaskTable) -> List[int]:
+        """
+        Private method that lists the neighbours of a state one step closer to the source, in the layered graph.
+        """
+        distance: int = distances[mask]
+        return [
+            neighbour
+            for neighbour in State.neighbour_masks(mask, len(self.itemNames), self.capacity)
+            if distances.get(neighbour) == distance - 1
+        ]
+
+    def count_optimal_paths(self) -> int:
+        """
+        Counts the shortest paths from the source to the target without enumerating them.
+
+        After one breadth-first search, the number of shortest paths from every state of the layered graph to the
+        target is summed level by level from the target back to the source. Only one level of counts is kept at a time.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            int: The number of shortest paths, 0 if the target cannot be reached.
+        """
+        distances: Optional[MaskTable] = self.__shortest_path_layers()
+        if distances is None:
+            return 0
+
+        paths_to_target: Dict[int, int] = {self.target.mask: 1}  # type: ignore[union-attr]
+        for _ in range(distances[self.target.mask]):  # type: ignore[union-attr]
+            previous_level: Dict[int, int] = {}
+            for mask, paths in paths_to_target.items():
+                for predecessor in self.__predecessors(mask, distances):
+                    previous_level[predecessor] = previous_level.get(predecessor, 0) + paths
+            paths_to_target = previous_level
+        return paths_to_target[self.source.mask]  # type: ignore[union-attr]
+
+    def optimal_paths(self, limit: Optional[int] = None) -> Iterator[List[State]]:
+        """
+        Lazily generates every shortest path from the source to the target, or the first `limit` of them.
+
+        The breadth-first search runs once when this method is called. The paths are then produced one at a time by a
+        depth-first walk back from the target through the layered graph, where every step leads to the source, so
+        producing a path costs time linear in its length and the memory use never depends on the number of paths.
+        Use `count_optimal_paths` to learn how many there are.
+
+        ### Example, the first three alternatives:
+            for path in game.optimal_paths(limit=3):
+                print([state.mask for state in path])
+
+        Args:
+            limit (Optional[int], optional): The largest number of paths to generate. Defaults to None, meaning all.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            Iterator[List[State]]: The shortest paths, each as a list of states linked through `prev`.
+        """
+        distances: Optional[MaskTable] = self.__shortest_path_layers()
+        source: int = self.source.mask  # type: ignore[union-attr]
+        target: int = self.target.mask  # type: ignore[union-attr]
+
+        def generate() -> Iterator[List[State]]:
+            if distances is None or limit == 0:
+                return
+            generated: int = 0
+            # the path is built backwards from the target, with an iterator over the predecessors of every state on it
+            path: List[int] = [target]
+            stack: List[Iterator[int]] = [iter(self.__predecessors(target, distances))]
+            if target == source:
+                stack.clear()
+                yield self.__path_from_masks(path)
+
+            while stack:
+                predecessor: Optional[int] = next(stack[-1], None)
+                if predecessor is None:
+                    stack.pop()
+                    path.pop()
+                    continue
+                if predecessor != source:
+                    path.append(predecessor)
+                    stack.append(iter(self.__predecessors(predecessor, distances)))
+                    continue
+                yield self.__path_from_masks([source] + path[::-1])
+                generated += 1
+                if generated == limit:
+                    return
+
+        return generate()
+
+    def __precomputed_query(self, source: Optional[State]) -> State:
+        """
+        Private method that resolves the source of a query and makes sure the tables of `precompute` exist.
+        """
+        if source is None:
+            source = self.source
+        if not isinstance(source, State):
+            raise ValueError("Source is not specified")
+        self.__drop_stale()
+        if self._next_hop is None:
+            self.precompute()
+        return source
+
+    def solve_many(
+        self, pairs: Iterable[tuple[State, State]]
+    ) -> Iterator[tuple[int, tuple[List[State], bool]]]:
+        """
+        Solves many (source, target) queries for this game, sharing one search between queries with a common endpoint.
+
+        The queries are grouped greedily: the source or target shared by the most unanswered queries is picked, one
+        breadth-first search tree is grown from it until all the other endpoints of its queries are found, and those
+        queries are answered from the tree. Because every move is its own inverse, a tree grown from a target answers
+        the queries from any source towards it. This repeats until every query is answered. The `source` and `target`
+        of the game are not used or changed. The bad states are snapshotted once for all searches, and every search
+        keeps its tree in dicts, so a group of close endpoints costs time and memory for the states it discovers only.
+
+        Args:
+            pairs (Iterable[tuple[State, State]]): The (source, target) queries.
+
+        Yields:
+            tuple(int, tuple(List[State], bool)): The index of a query in `pairs` and its result in the format of `bfs`,
+            as soon as the group of the query is solved. Queries with a bad source or target yield ([], False).
+        """
+        queries: List[tuple[State, State]] = list(pairs)
+        # shared by all searches, a snapshot of the bad states takes longer than a search that stops after a few states
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        by_source: Dict[int, Set[int]] = {}
+        by_target: Dict[int, Set[int]] = {}
+        for index, (source, target) in enumerate(queries):
+            if self.is_bad(source) or self.is_bad(target):
+                yield index, ([], False)
+                continue
+            by_source.setdefault(source.mask, set()).add(index)
+            by_target.setdefault(target.mask, set()).add(index)
+
+        while by_source:
+            source_root: int = max(by_source, key=lambda mask: len(by_source[mask]))
+            target_root: int = max(by_target, key=lambda mask: len(by_target[mask]))
+            from_target: bool = len(by_target[target_root]) >= len(by_source[source_root])
+            root: int = target_root if from_target else source_root
+            group: Set[int] = (by_target if from_target else by_source).pop(root)
+
+            # the endpoint at the other side of every query in the group
+            other: Dict[int, int] = {
+                index: queries[index][0 if from_target else 1].mask for index in group
+            }
+            # the tables of a search that stops early are much smaller as dicts than as flat arrays over all states
+            parents, _ = self.__search_tree(root, set(other.values()), is_bad, dense=False)
+
+            for index in sorted(group):
+                end: int = other[index]
+                opposite: Dict[int, Set[int]] = by_source if from_target else by_target
+                opposite[end].discard(index)
+                if not opposite[end]:
+                    del opposite[end]
+
+                if end not in parents:
+                    yield index, ([], False)
+                    continue
+                masks: List[int] = self.__masks_from_parents(parents, end)
+                if from_target:
+                    masks.reverse()
+                yield index, (self.__path_from_masks(masks), True)
+
+    def bidirectional_bfs(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Performs a bidirectional breadth-first search from the source state and the target state at the same time.
+
+        Every move in the game is its own inverse, so the backward search uses the same `State.get_neighbours` as the
+        forward search. Each step expands one full level of the smaller frontier and the search stops as soon as the
+        two searches meet. At that moment no shorter path can exist, so the stitched path is as short as the one
+        returned by `bfs`, while only a fraction of the states is expanded.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        self.states_expanded = 0
+
+        path: List[State]
+        if self.source == self.target:
+            path = [self.source]
+            if print_actions:
+                self.__moves_from_path(path)
+            return path, True
+
+        # maps the mask of every discovered state to the State object that links back to the root of its search
+        forward: Dict[int, State] = {self.source.mask: self.source}
+        backward: Dict[int, State] = {self.target.mask: self.target}
+        forward_frontier: List[State] = [self.source]
+        backward_frontier: List[State] = [self.target]
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+
+        while forward_frontier and backward_frontier:
+            expand_forward: bool = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, seen, other = forward_frontier, forward, backward
+            else:
+                frontier, seen, other = backward_frontier, backward, forward
+
+            next_frontier: List[State] = []
+            for curr in frontier:
+                self.states_expanded += 1
+                for neighbour in curr.get_neighbours(self.capacity):
+                    if neighbour.mask in seen:
+                        continue
+                    if neighbour.mask in other:
+                        if expand_forward:
+                            path = self.__stitch(neighbour, other[neighbour.mask])
+                        else:
+                            path = self.__stitch(other[neighbour.mask], neighbour)
+                        if print_actions:
+                            self.__moves_from_path(path)
+                        return path, True
+                    if not is_bad(neighbour.mask):
+                        seen[neighbour.mask] = neighbour
+                        next_frontier.append(neighbour)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return [], False
+
+    def astar(
+        self, heuristic: Optional[Heuristic] = None, print_actions: bool = False
+    ) -> tuple[List[State], bool]:
+        """
+        Performs an A* search to find a shortest path from the source state to the target state.
+
+        States are expanded in order of the number of crossings made so far plus the estimate of the `heuristic`.
+        With an admissible and consistent heuristic the returned path is as short as the one found by `bfs`, while
+        states that lead away from the target are rarely expanded. The number of expanded states is stored in
+        `states_expanded`.
+
+        Args:
+            heuristic (Optional[Heuristic], optional): A function mapping a state and the target state to a lower bound
+                on the number of crossings between them. Defaults to `misplaced_items_heuristic` for the boat's capacity.
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        if heuristic is None:
+            heuristic = partial(misplaced_items_heuristic, capacity=self.capacity)
+        target: State = self.target
+        self.states_expanded = 0
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+
+        # ties are broken towards deeper states first and then by insertion order, so states are never compared
+        tie_breaker = count()
+        best: Dict[int, int] = {self.source.mask: 0}
+        closed: Set[int] = set()
+        heap: List[tuple[int, int, int, State]] = [
+            (heuristic(self.source, target), 0, next(tie_breaker), self.source)
+        ]
+
+        while heap:
+            _, depth, _, curr = heapq.heappop(heap)
+            cost: int = -depth
+            if curr.mask in closed:
+                continue
+            if curr == target:
+                path: List[State]
+                success: bool
+                path, success = self.__back_track(curr)
+                if print_actions:
+                    self.__moves_from_path(path)
+                return path, success
+            closed.add(curr.mask)
+            self.states_expanded += 1
+
+            for neighbour in curr.get_neighbours(self.capacity):
+                if neighbour.mask in closed or is_bad(neighbour.mask):
+                    continue
+                if cost + 1 < best.get(neighbour.mask, cost + 2):
+                    best[neighbour.mask] = cost + 1
+                    priority: int = cost + 1 + heuristic(neighbour, target)
+                    heapq.heappush(
+                        heap, (priority, -cost - 1, next(tie_breaker), neighbour)
+                    )
+
+        return [], False
+
+    def ida_star(
+        self,
+        heuristic: Optional[Heuristic] = None,
+        max_depth: Optional[int] = None,
+        table_size: int = 1 << 20,
+        print_actions: bool = False,
+    ) -> tuple[List[State], bool]:
+        """
+        Performs an iterative-deepening A* search, which finds a shortest path without keeping a visited set.
+
+        Every iteration is a depth-first search that cuts off paths whose number of crossings plus the estimate of the
+        `heuristic` exceeds a bound, which starts at the estimate for the source and grows to the smallest value that
+        was cut off. Only the current path is kept, together with a table of the fewest crossings each state was
+        reached with during the iteration, which prunes the many transpositions of the move graph. The table holds at
+        most `table_size` states, so the memory use is linear in the length of the path plus `table_size`, and only
+        linear in the length of the path with `table_size=0`, at the cost of expanding transpositions again. States are
+        expanded again in every iteration, so the search takes longer than `astar` whenever the visited states fit in
+        memory.
+
+        Proving that a game has no solution requires exhausting all paths, which can take very long. A `max_depth`
+        stops the search once the bound exceeds it.
+
+        Args:
+            heuristic (Optional[Heuristic], optional): A function mapping a state and the target state to a lower bound
+                on the number of crossings between them. Defaults to `misplaced_items_heuristic` for the boat's capacity.
+            max_depth (Optional[int], optional): The largest number of crossings to search for. Defaults to None,
+                meaning no limit.
+            table_size (int, optional): The largest number of states in the transposition table, 0 to search without
+                one. Defaults to 2^20.
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path of at most `max_depth` crossings exists, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+        if heuristic is None:
+            heuristic = partial(misplaced_items_heuristic, capacity=self.capacity)
+        n_items: int = len(self.itemNames)
+        capacity: int = self.capacity
+        neighbour_masks = State.neighbour_masks
+        target: State = self.target
+        source: int = self.source.mask
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        self.states_expanded = 0
+
+        def estimate(mask: int) -> int:
+            return heuristic(State.from_mask(mask, n_items), target)  # type: ignore[misc]
+
+        bound: int = estimate(source)
+        path: List[int] = [source]
+        found: bool = source == target.mask
+        while not found:
+            if max_depth is not None and bound > max_depth:
+                return [], False
+            next_bound: Optional[int] = None
+            path = [source]
+            on_path: Set[int] = {source}
+            fewest_crossings: Dict[int, int] = {source: 0}
+            stack: List[Iterator[int]] = [iter(neighbour_masks(source, n_items, capacity))]
+            self.states_expanded += 1
+
+            while stack:
+                child: Optional[int] = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    on_path.discard(path.pop())
+                    continue
+                crossings: int = len(path)
+                if child in on_path or is_bad(child):
+                    continue
+                seen: Optional[int] = fewest_crossings.get(child)
+                if seen is not None and seen <= crossings:
+                    continue
+                cost: int = crossings + estimate(child)
+                if cost > bound:
+                    next_bound = cost if next_bound is None else min(next_bound, cost)
+                    continue
+                path.append(child)
+                if child == target.mask:
+                    found = True
+                    break
+                if seen is not None or len(fewest_crossings) < table_size:
+                    fewest_crossings[child] = crossings
+                on_path.add(child)
+                stack.append(iter(neighbour_masks(child, n_items, capacity)))
+                self.states_expanded += 1
+
+            if not found:
+                if next_bound is None:
+                    return [], False
+                bound = next_bound
+
+        states: List[State] = self.__path_from_masks(path)
+        if print_actions:
+            self.__moves_from_path(states)
+        return states, True
+
+    def vectorized_bfs(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Performs a breadth-first search that expands every level at once with NumPy, see `vectorSearch.vectorized_bfs`.
+
+        This avoids the per-state Python loop of `bfs` and is meant for instances with millions of reachable states.
+        It requires numpy and at most 64 items. Bad-state rules are evaluated with their `is_bad_array` method.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+            ImportError: If numpy is not installed.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        n_items: int = len(self.itemNames)
+        masks: Optional[List[int]]
+        masks, self.states_expanded = vectorized_bfs(
+            self.source.mask,
+            self.target.mask,
+            State.move_masks(n_items, self.capacity),
+            (state.mask for state in self.badStates),
+            self.badRules,
+        )
+        if masks is None:
+            return [], False
+
+        path: List[State] = self.__path_from_masks(masks)
+        if print_actions:
+            self.__moves_from_path(path)
+        return path, True
+
+    def parallel_bfs(
+        self, workers: Optional[int] = None, print_actions: bool = False
+    ) -> tuple[List[State], bool]:
+        """
+        Performs a breadth-first search spread over worker processes, see `parallelSearch.parallel_bfs`.
+
+        Every worker owns a hash partition of the states and expands its part of each level, so the search scales
+        with the number of cores once levels are large. For small games starting the processes costs more than the
+        search itself.
+
+        Args:
+            workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        masks: Optional[List[int]]
+        masks, self.states_expanded = parallel_bfs(
+            len(self.itemNames),
+            self.source.mask,
+            self.target.mask,
+            self.capacity,
+            (state.mask for state in self.badStates),
+            self.badRules,
+            workers,
+        )
+        if masks is None:
+            return [], False
+
+        path: List[State] = self.__path_from_masks(masks)
+        if print_actions:
+            self.__moves_from_path(path)
+        return path, True
+
+    def __item_index(self, name: str) -> int:
+        """
+        Private method that looks up the index of an item by its name.
+
+        Raises:
+            ValueError: If `name` is not the name of exactly one item.
+        """
+        if self.itemNames.count(name) != 1:
+            raise ValueError(f"{name!r} is not the name of exactly one item")
+        return self.itemNames.index(name)
+
+    def set_item_groups(self, groups: Iterable[Iterable[str]]) -> None:
+        """
+        Declares groups of interchangeable items, which `symmetric_bfs` uses to search over counts instead of states.
+
+        Items in a group have to be interchangeable: swapping two of them never turns a good state into a bad one.
+        The farmer, who has to make every crossing, cannot be part of a group.
+
+        ### Example for the pirates game:
+            game.set_item_groups([["Pirate0", "Pirate1", "Pirate2"], ["Gold0", "Gold1", "Gold2", "Gold3"]])
+
+        Args:
+            groups (Iterable[Iterable[str]]): The names of the items of every group.
+
+        Raises:
+            ValueError: If a name is not the name of exactly one item, or an item is in more than one group.
+            ValueError: If the farmer is put in a group.
+        """
+        item_groups: List[tuple[int, ...]] = []
+        grouped: Set[int] = set()
+        for names in groups:
+            group: List[int] = []
+            for name in names:
+                index: int = self.__item_index(name)
+                if index == 0:
+                    raise ValueError(f"The farmer {name!r} crosses every time and cannot be part of a group")
+                if index in grouped:
+                    raise ValueError(f"{name!r} is in more than one group")
+                grouped.add(index)
+                group.append(index)
+            if group:
+                item_groups.append(tuple(sorted(group)))
+        self.item_groups = item_groups
+
+    def symmetric_bfs(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Performs a breadth-first search over the number of items of every group on each side, see `symmetry`.
+
+        The farmer and every item outside the `item_groups` form a group of their own. With groups of sizes
+        `s_1, ..., s_k` there are `2 * (s_1 + 1) * ... * (s_k + 1)` count vectors instead of `2^n` states, and the path
+        found over the counts is expanded into concrete moves from the source. The path is as short as the one found
+        by `bfs`.
+
+        The enumerated `badStates` are checked to be symmetric within the groups. The `badRules` are evaluated on one
+        state per count vector, so they have to be symmetric within the groups as well.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+            ValueError: If the items of a group are not all on the same side in the target state.
+            ValueError: If the bad states are not symmetric within the groups.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        grouped: Set[int] = {item for group in self.item_groups for item in group}
+        groups: List[tuple[int, ...]] = [(0,)] + self.item_groups + [
+            (item,) for item in range(1, len(self.itemNames)) if item not in grouped
+        ]
+        sizes: List[int] = [len(group) for group in groups]
+        target_counts: Counts = canonical(self.target.mask, groups)
+        for group, target_count in zip(groups, target_counts):
+            if 0 < target_count < len(group):
+                names: str = ", ".join(self.itemNames[item] for item in group)
+                raise ValueError(f"The items {names} should all be on the same side in the target state")
+        check_symmetric([state.mask for state in self.badStates], groups)
+
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        source_counts: Counts = canonical(self.source.mask, groups)
+        parents: Dict[Counts, Counts] = {source_counts: source_counts}
+        q: Deque[Counts] = deque([source_counts])
+        self.states_expanded = 0
+
+        while q:
+            curr: Counts = q.popleft()
+            if curr == target_counts:
+                counts_path: List[Counts] = [curr]
+                while counts_path[-1] != source_counts:
+                    counts_path.append(parents[counts_path[-1]])
+                path: List[State] = self.__path_from_masks(
+                    concrete_path(self.source.mask, counts_path[::-1], groups)
+                )
+                if print_actions:
+                    self.__moves_from_path(path)
+                return path, True
+
+            self.states_expanded += 1
+            for neighbour in count_moves(curr, sizes, self.capacity):
+                if neighbour not in parents and not is_bad(representative(neighbour, groups)):
+                    parents[neighbour] = curr
+                    q.append(neighbour)
+
+        return [], False
+
+    def external_bfs(
+        self,
+        directory: Optional[str] = None,
+        memory_limit: int = MEMORY_LIMIT,
+        print_actions: bool = False,
+    ) -> tuple[List[State], bool]:
+        """
+        Performs a breadth-first search that keeps its layers in sorted files, see `externalSearch.external_bfs`.
+
+        The memory use is bounded by `memory_limit` and the bad states instead of by the number of reachable states,
+        so games too large for the visited set of `bfs` can be searched as long as the layers fit on disk. Bad states
+        should then be given as rules, for example a `ContainerRule` over a memory-mapped binary instance.
+
+        Args:
+            directory (Optional[str], optional): The directory for the temporary layer files. Defaults to None, which
+                uses the system's temporary directory.
+            memory_limit (int, optional): The number of generated states held in memory before they are spilled to
+                disk. Defaults to `externalSearch.MEMORY_LIMIT`.
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+            ValueError: If the game has more than 64 items.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        masks: Optional[List[int]]
+        masks, self.states_expanded = external_bfs(
+            len(self.itemNames),
+            self.source.mask,
+            self.target.mask,
+            self.capacity,
+            self.bad_state_checker(),
+            directory,
+            memory_limit,
+        )
+        if masks is None:
+            return [], False
+
+        path: List[State] = self.__path_from_masks(masks)
+        if print_actions:
+            self.__moves_from_path(path)
+        return path, True
+
+    def set_crossing_costs(self, costs: Dict[str, int], mode: str = "max") -> None:
+        """
+        Gives items a crossing cost, such as the time they need to cross, which `dijkstra` minimises over a path.
+
+        A crossing costs the largest cost of the farmer and the items in the boat in mode `"max"`, as when the boat
+        is as slow as its slowest passenger, or the sum of their costs in mode `"sum"`. Items that are not named keep
+        their cost, which is initially 1, so by default every crossing costs 1 in mode `"max"`.
+
+        ### Example where the cow slows the boat down:
+            game.set_crossing_costs({"Farmer": 1, "Cow": 3, "Chicken": 1, "Grain": 1}, mode="max")
+
+        Args:
+            costs (Dict[str, int]): The crossing cost of items by name, integers of at least 0.
+            mode (str, optional): `"max"` or `"sum"`, see `COST_MODES`. Defaults to "max".
+
+        Raises:
+            ValueError: If the mode is unknown.
+            ValueError: If a name is not the name of exactly one item or a cost is not an integer of at least 0.
+        """
+        if mode not in COST_MODES:
+            raise ValueError(f"Unknown cost mode {mode!r}, expected one of {COST_MODES}")
+        crossing_costs: List[int] = list(self.crossing_costs)
+        for name, cost in costs.items():
+            if not isinstance(cost, int) or isinstance(cost, bool) or cost < 0:
+                raise ValueError(f"The crossing cost of {name!r} should be an integer of at least 0, got {cost!r}")
+            crossing_costs[self.__item_index(name)] = cost
+        self.crossing_costs = crossing_costs
+        self.cost_mode = mode
+
+    def __move_cost(self, move: int) -> int:
+        """
+        Private method that computes the cost of a crossing from the bitmask of the farmer and the items it moves.
+        """
+        costs: List[int] = [cost for i, cost in enumerate(self.crossing_costs) if move >> i & 1]
+        return max(costs) if self.cost_mode == "max" else sum(costs)
+
+    def path_cost(self, path: List[State]) -> int:
+        """
+        Computes the total crossing cost of a path, see `set_crossing_costs`.
+
+        Args:
+            path (List[State]): The states on the path, every state a crossing away from the previous one.
+
+        Returns:
+            int: The sum of the costs of the crossings on the path.
+        """
+        return sum(self.__move_cost(curr.mask ^ next_state.mask) for curr, next_state in zip(path, path[1:]))
+
+    def dijkstra(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Finds a path of least total crossing cost with Dial's variant of Dijkstra's algorithm, see `set_crossing_costs`.
+
+        The costs are small integers, so the states are queued in a `BucketQueue` with one bucket per possible cost
+        of a crossing, which pushes and pops in constant time instead of the logarithmic time of `heapq`. The
+        neighbours come from `State.neighbour_masks`, like in the other searches, and the cost of a crossing is
+        looked up by the bitmask of the moved items. With the default costs the result is as short as that of `bfs`.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        n_items: int = len(self.itemNames)
+        capacity: int = self.capacity
+        neighbour_masks = State.neighbour_masks
+        is_bad: Callable[[int], bool] = self.bad_state_checker()
+        target: int = self.target.mask
+        source: int = self.source.mask
+        self.states_expanded = 0
+
+        # the costliest crossing takes the farmer and the `capacity` costliest items
+        item_costs: List[int] = sorted(self.crossing_costs[1:], reverse=True)[:capacity]
+        if self.cost_mode == "max":
+            max_cost: int = max([self.crossing_costs[0]] + item_costs)
+        else:
+            max_cost = self.crossing_costs[0] + sum(item_costs)
+        move_costs: Dict[int, int] = {}
+
+        parents: MaskTable = MaskTable(n_items)
+        costs: MaskTable = MaskTable(n_items)
+        parents[source] = source
+        costs[source] = 0
+        queue: BucketQueue = BucketQueue(max_cost)
+        queue.push(0, source)
+
+        while queue:
+            cost, curr = queue.pop()
+            if cost > costs[curr]:
+                # an outdated entry of a state that was queued again with a lower cost
+                continue
+            if curr == target:
+                path: List[State] = self.__path_from_masks(self.__masks_from_parents(parents, curr))
+                if print_actions:
+                    self.__moves_from_path(path)
+                return path, True
+            self.states_expanded += 1
+            for neighbour in neighbour_masks(curr, n_items, capacity):
+                move: int = curr ^ neighbour
+                move_cost: Optional[int] = move_costs.get(move)
+                if move_cost is None:
+                    move_cost = move_costs[move] = self.__move_cost(move)
+                new_cost: int = cost + move_cost
+                old_cost: Optional[int] = costs.get(neighbour)
+                if (new_cost < old_cost if old_cost is not None else not is_bad(neighbour)):
+                    parents[neighbour] = curr
+                    costs[neighbour] = new_cost
+                    queue.push(new_cost, neighbour)
+
+        return [], False
+
+    def incremental_solve(self, print_actions: bool = False) -> tuple[List[State], bool]:
+        """
+        Finds a shortest path from a search tree over all states reachable from the source, kept between calls.
+
+        The first call grows the tree with a full breadth-first search. Afterwards `add_bad_states` and
+        `remove_bad_states` repair only the parts of the tree that change, see `incremental.IncrementalTree`, so
+        solving again after a small change to the bad states is much cheaper than a new `bfs`. Changing the target
+        reuses the tree as is, while changing the source, the capacity or the rules, or changing `badStates` directly,
+        grows it again on the next call.
+        `states_expanded` is set to the number of states handled by the build or the repairs since the last call.
+
+        Args:
+            print_actions (bool, optional): If True, prints the sequence of actions required to go from the source state
+                to the target state. Defaults to False.
+
+        Raises:
+            ValueError: If the source state is not specified.
+            ValueError: If the target state is not specified.
+
+        Returns:
+            tuple(List[State], bool): A tuple where the first element is the list of states representing the path from
+            the source to the target (if found), and the second element is a boolean indicating whether the search
+            was successful. If no path is found, defaults to ([], False).
+        """
+
+        if not isinstance(self.source, State):
+            raise ValueError("Source is not specified")
+        if not isinstance(self.target, State):
+            raise ValueError("Target is not specified")
+
+        self.__drop_stale()
+        tree: Optional[IncrementalTree] = self._incremental
+        if tree is None or tree.root != self.source.mask:
+            tree = IncrementalTree(len(self.itemNames), self.capacity, self.source.mask)
+            tree.build(self.bad_state_checker())
+            self._incremental = tree
+            self._cache_key = self.__game_key()
+        self.states_expanded = tree.touched
+        tree.touched = 0
+
+        masks: Optional[List[int]] = tree.path_to(self.target.mask)
+        if masks is None:
+            return [], False
+
+        path: List[State] = self.__path_from_masks(masks)
+        if print_actions:
+            self.__moves_from_path(path)
+        return path, True
+
+    def __path_from_masks(self, masks: List[int]) -> List[State]:
+        """
+        Private method that turns a list of bitmasks into a path of `State` objects linked through `prev`.
+
+        Args:
+            masks (List[int]): The bitmasks of the states on the path, starting at the source.
+
+        Returns:
+            List[State]: The path from the source to the target.
+        """
+        n_items: int = len(self.itemNames)
+        path: List[State] = []
+        prev: Optional[State] = None
+        for mask in masks:
+            prev = State.from_mask(mask, n_items, prev)
+            path.append(prev)
+        return path
+
+    def __stitch(self, forward_state: State, backward_state: State) -> List[State]:
+        """
+        Private method that joins the two halves found by `bidirectional_bfs` into a single path.
+
+        Args:
+            forward_state (State): The meeting state, linked through `prev` back to the source.
+            backward_state (State): The same meeting state, linked through `prev` back to the target.
+
+        Returns:
+            List[State]: The path from the source to the target, with every `prev` pointing towards the source.
+        """
+        path: List[State]
+        path, _ = self.__back_track(forward_state)
+        curr: Optional[State] = backward_state.prev
+        while curr:
+            path.append(State.from_mask(curr.mask, curr.n_items, path[-1]))
+            curr = curr.prev
+        return path
@@ -0,0 +1,314 @@
+"""
+Generators for the families of games in the `data` directory, with any number of items.
+
+The bad states are produced as chunks of increasing bitmasks, computed with NumPy bit operations when it is installed
+and with plain Python otherwise, and are streamed to the text format of `dataReader` or the binary format of
+`binaryFormat`. Only one chunk is held in memory at a time, so instances with more bad states than fit in memory can
+be written.
+"""
+
+import argparse
+from math import comb
+from typing import Callable, Iterator, List, Optional, Sequence, TextIO
+from .binaryFormat import write_instance
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# number of candidate states checked per chunk
+CHUNK_SIZE: int = 1 << 20
+
+# number of set bits of every byte, used when NumPy has no `bitwise_count`
+_BYTE_COUNTS: Optional["np.ndarray"] = None
+
+
+def _popcount(values: "np.ndarray") -> "np.ndarray":
+    """
+    Counts the set bits of every element of an array of unsigned 64-bit integers.
+    """
+    global _BYTE_COUNTS
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    if _BYTE_COUNTS is None:
+        _BYTE_COUNTS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+    return _BYTE_COUNTS[values.astype("<u8").view(np.uint8).reshape(-1, 8)].sum(axis=1, dtype=np.uint8)
+
+
+class GeneratedInstance:
+    """
+    A farmer game whose bad states are generated on demand, to be written to disk without holding them in memory.
+
+    Attributes:
+        item_names (tuple[str, ...]): The names of the items, the first one being the farmer.
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        n_bad_states (int): The number of bad states, known before they are generated.
+    """
+
+    def __init__(
+        self,
+        item_names: tuple[str, ...],
+        source: int,
+        target: int,
+        n_bad_states: int,
+        chunks: Callable[[], Iterator[Sequence[int]]],
+    ) -> None:
+        self.item_names: tuple[str, ...] = item_names
+        self.source: int = source
+        self.target: int = target
+        self.n_bad_states: int = n_bad_states
+        self._chunks: Callable[[], Iterator[Sequence[int]]] = chunks
+
+    def bad_state_chunks(self) -> Iterator[Sequence[int]]:
+        """
+        Generates the bad states from scratch.
+
+        Yields:
+            Sequence[int]: The next chunk of bitmasks, a NumPy array when NumPy is installed, every mask being larger
+            than those of the previous chunks.
+        """
+        return self._chunks()
+
+    def bad_masks(self) -> Iterator[int]:
+        """
+        Generates the bad states from scratch one bitmask at a time, in increasing order.
+
+        Yields:
+            int: The bitmask of the next bad state.
+        """
+        for chunk in self.bad_state_chunks():
+            yield from map(int, chunk)
+
+    def write_text(self, data_path: str, bad_states_path: str) -> None:
+        """
+        Writes the game in the text format read by `dataReader.game_reader` and `dataReader.bad_state_reader`.
+
+        Args:
+            data_path (str): Path of the file for the item names, the source and the target.
+            bad_states_path (str): Path of the file for the bad states.
+        """
+        n_items: int = len(self.item_names)
+        with open(data_path, "w") as file:
+            file.write(" ".join(self.item_names) + "\n")
+            file.write(_text_row(self.source, n_items) + "\n")
+            file.write(_text_row(self.target, n_items) + "\n")
+
+        with open(bad_states_path, "w") as file:
+            file.write(f"{self.n_bad_states}\n")
+            for chunk in self.bad_state_chunks():
+                _write_text_rows(file, chunk, n_items)
+
+    def write_binary(self, file_path: str) -> None:
+        """
+        Writes the game to a binary instance file with the sorted encoding, see `binaryFormat.write_instance`.
+
+        Args:
+            file_path (str): Path of the file to write.
+
+        Raises:
+            ValueError: If the game has more than 64 items.
+        """
+        write_instance(
+            file_path,
+            self.item_names,
+            self.source,
+            self.target,
+            self.bad_state_chunks(),  # type: ignore[arg-type]
+            encoding="sorted",
+            chunked=True,
+        )
+
+
+def _text_row(mask: int, n_items: int) -> str:
+    # the first value is the lowest bit
+    return " ".join(format(mask, f"0{n_items}b")[::-1])
+
+
+def _write_text_rows(file: TextIO, chunk: Sequence[int], n_items: int) -> None:
+    """
+    Writes bitmasks as rows of space-separated `0`/`1` values, building all rows of a NumPy chunk as one byte array.
+    """
+    if np is None or not isinstance(chunk, np.ndarray) or not len(chunk):
+        file.writelines(_text_row(mask, n_items) + "\n" for mask in chunk)
+        return
+    rows: np.ndarray = np.full((len(chunk), 2 * n_items), ord(" "), dtype=np.uint8)
+    bits: np.ndarray = (chunk[:, None] >> np.arange(n_items, dtype=np.uint64)) & np.uint64(1)
+    rows[:, 0::2] = ord("0") + bits.astype(np.uint8)
+    rows[:, -1] = ord("\n")
+    file.write(rows.tobytes().decode("ascii"))
+
+
+def pirates_item_names(n_pirates: int, n_gold: int) -> tuple[str, ...]:
+    """
+    Names the items of the pirates game: the captain, the pirates and the pieces of gold.
+    """
+    return ("Captain",) + tuple(f"Pirate{i}" for i in range(n_pirates)) + tuple(f"Gold{i}" for i in range(n_gold))
+
+
+def _pirates_chunks(n_pirates: int, n_gold: int, counted_gold: int, chunk_size: int) -> Iterator[Sequence[int]]:
+    n_items: int = 1 + n_pirates + n_gold
+    pirate_bits: int = (1 << n_pirates) - 1
+    gold_bits: int = (1 << counted_gold) - 1
+    # only states with the captain on the left, the lowest bit, can be bad
+    step: int = 2 * chunk_size
+    for start in range(1, 1 << n_items, step):
+        stop: int = min(start + step, 1 << n_items)
+        if np is None:
+            chunk: List[int] = []
+            for mask in range(start, stop, 2):
+                pirates_left: int = bin((mask >> 1) & pirate_bits).count("1")
+                if pirates_left >= 2 and bin((mask >> (n_pirates + 1)) & gold_bits).count("1") < pirates_left:
+                    chunk.append(mask)
+        else:
+            masks: np.ndarray = np.arange(start, stop, 2, dtype=np.uint64)
+            pirates: np.ndarray = _popcount((masks >> np.uint64(1)) & np.uint64(pirate_bits))
+            gold: np.ndarray = _popcount((masks >> np.uint64(n_pirates + 1)) & np.uint64(gold_bits))
+            chunk = masks[(pirates >= 2) & (gold < pirates)]
+        if len(chunk):
+            yield chunk
+
+
+def pirates_instance(n_pirates: int, n_gold: int, counted_gold: Optional[int] = None) -> GeneratedInstance:
+    """
+    Creates the pirates game with any number of pirates and pieces of gold.
+
+    The captain is the farmer. A state is bad when the captain is on the left with at least two pirates and less gold
+    than pirates, as the pirates would mutiny. The game is to move everything from the right to the left side.
+
+    Args:
+        n_pirates (int): The number of pirates.
+        n_gold (int): The number of pieces of gold.
+        counted_gold (Optional[int], optional): The number of pieces of gold, from the first, that the pirates count.
+            Defaults to None, which counts all of them. `data/generatePiratesExample.py` leaves the last piece out.
+
+    Raises:
+        ValueError: If `counted_gold` is negative or larger than `n_gold`.
+
+    Returns:
+        GeneratedInstance: The game, with its bad states generated on demand.
+    """
+    if counted_gold is None:
+        counted_gold = n_gold
+    if not 0 <= counted_gold <= n_gold:
+        raise ValueError(f"Between 0 and {n_gold} pieces of gold can be counted, got {counted_gold}")
+
+    item_names: tuple[str, ...] = pirates_item_names(n_pirates, n_gold)
+    # the captain is on the left, the uncounted gold can be anywhere
+    n_bad_states: int = (1 << (n_gold - counted_gold)) * sum(
+        comb(n_pirates, pirates) * comb(counted_gold, gold)
+        for pirates in range(2, n_pirates + 1)
+        for gold in range(min(pirates, counted_gold + 1))
+    )
+    return GeneratedInstance(
+        item_names,
+        0,
+        (1 << len(item_names)) - 1,
+        n_bad_states,
+        lambda: _pirates_chunks(n_pirates, n_gold, counted_gold, CHUNK_SIZE),  # type: ignore[arg-type]
+    )
+
+
+def alphabet_item_names(n_consonants: int, n_vowels: int, n_symbols: int) -> tuple[str, ...]:
+    """
+    Names the items of the alphabet game: the consonants, of which the first is the farmer, the vowels and the symbols.
+    """
+    return (
+        tuple(f"c{i}" for i in range(n_consonants))
+        + tuple(f"v{i}" for i in range(n_vowels))
+        + tuple(f"s{i}" for i in range(n_symbols))
+    )
+
+
+def _alphabet_chunks(n_consonants: int, n_vowels: int, n_symbols: int, chunk_size: int) -> Iterator[Sequence[int]]:
+    n_items: int = n_consonants + n_vowels + n_symbols
+    everything: int = (1 << n_items) - 1
+    # the bad states are the one in three items of every group and their complements, so there are few enough of them
+    # to sort at once
+    if np is None:
+        triples: List[int] = [
+            1 << consonant | 1 << vowel | 1 << symbol
+            for consonant in range(1, n_consonants)
+            for vowel in range(n_consonants, n_consonants + n_vowels)
+            for symbol in range(n_consonants + n_vowels, n_items)
+        ]
+        masks: Sequence[int] = sorted(triples + [everything ^ mask for mask in triples])
+    else:
+        bits: np.ndarray = np.uint64(1) << np.arange(n_items, dtype=np.uint64)
+        consonants, vowels, symbols = np.split(bits, [n_consonants, n_consonants + n_vowels])
+        triples_array: np.ndarray = (
+            consonants[1:, None, None] | vowels[None, :, None] | symbols[None, None, :]
+        ).ravel()
+        masks = np.sort(np.concatenate([triples_array, np.uint64(everything) ^ triples_array]))
+    for start in range(0, len(masks), chunk_size):
+        yield masks[start:start + chunk_size]
+
+
+def alphabet_instance(
+    n_consonants: int, n_vowels: int, n_symbols: int, item_names: Optional[tuple[str, ...]] = None
+) -> GeneratedInstance:
+    """
+    Creates the alphabet game with groups of any size.
+
+    The first consonant is the farmer. A state is bad when exactly one other consonant, one vowel and one symbol are on
+    one side and everything else is on the other side. The game is to move everything from the right to the left side.
+
+    Args:
+        n_consonants (int): The number of consonants, including the farmer.
+        n_vowels (int): The number of vowels.
+        n_symbols (int): The number of symbols.
+        item_names (Optional[tuple[str, ...]], optional): The names of the consonants, vowels and symbols in that
+            order. Defaults to None, which uses `alphabet_item_names`.
+
+    Raises:
+        ValueError: If `item_names` does not have a name for every item.
+
+    Returns:
+        GeneratedInstance: The game, with its bad states generated on demand.
+    """
+    if item_names is None:
+        item_names = alphabet_item_names(n_consonants, n_vowels, n_symbols)
+    elif len(item_names) != n_consonants + n_vowels + n_symbols:
+        raise ValueError(
+            f"Expected {n_consonants + n_vowels + n_symbols} item names, got {len(item_names)}"
+        )
+    # the farmer is never among the three items, so a state and its complement are always different
+    n_bad_states: int = 2 * max(n_consonants - 1, 0) * n_vowels * n_symbols
+    return GeneratedInstance(
+        item_names,
+        0,
+        (1 << len(item_names)) - 1,
+        n_bad_states,
+        lambda: _alphabet_chunks(n_consonants, n_vowels, n_symbols, CHUNK_SIZE),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a pirates or alphabet farmer game of any size.")
+    parser.add_argument("family", choices=("pirates", "alphabet"))
+    parser.add_argument("sizes", type=int, nargs="+", help="pirates and gold, or consonants, vowels and symbols")
+    parser.add_argument("--binary", metavar="FILE", help="binary instance file to write")
+    parser.add_argument("--text", nargs=2, metavar=("DATA", "BAD_STATES"), help="text files to write")
+    parser.add_argument("--counted-gold", type=int, help="number of pieces of gold the pirates count")
+    args = parser.parse_args(argv)
+
+    if args.family == "pirates":
+        if len(args.sizes) != 2:
+            parser.error("the pirates family takes the number of pirates and of pieces of gold")
+        instance: GeneratedInstance = pirates_instance(*args.sizes, counted_gold=args.counted_gold)
+    else:
+        if len(args.sizes) != 3:
+            parser.error("the alphabet family takes the number of consonants, vowels and symbols")
+        instance = alphabet_instance(*args.sizes)
+    if args.binary is None and args.text is None:
+        parser.error("at least one of --binary and --text is required")
+
+    if args.binary is not None:
+        instance.write_binary(args.binary)
+    if args.text is not None:
+        instance.write_text(*args.text)
+
+
+if __name__ == "__main__":
+    main()
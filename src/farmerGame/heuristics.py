@@ -0,0 +1,57 @@
+from typing import Callable
+from .state import State
+
+Heuristic = Callable[[State, State], int]
+
+
+def zero_heuristic(state: State, target: State) -> int:
+    """
+    Heuristic that always estimates zero remaining crossings, which turns A* into a uniform-cost search.
+
+    Args:
+        state (State): The state for which the remaining distance is estimated.
+        target (State): The target state of the search.
+
+    Returns:
+        int: Always 0.
+    """
+    return 0
+
+
+def misplaced_items_heuristic(state: State, target: State, capacity: int = 1) -> int:
+    """
+    Estimates the number of crossings needed by counting the non-farmer items that are on the wrong side.
+
+    The farmer takes at most `capacity` items per crossing and the crossings alternate between going left and going
+    right. The estimate is the smallest number of alternating crossings that contains enough left crossings for the
+    items that have to go left, enough right crossings for the items that have to go right and that leaves the farmer
+    on the side of the target. Bad states are ignored, so the estimate never exceeds the true distance and is
+    consistent, which keeps the paths found by A* optimal.
+
+    Args:
+        state (State): The state for which the remaining distance is estimated.
+        target (State): The target state of the search.
+        capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+
+    Returns:
+        int: A lower bound on the number of crossings from `state` to `target`.
+    """
+    wrong: int = (state.mask ^ target.mask) & ~1
+    to_left: int = bin(wrong & target.mask).count("1")
+    to_right: int = bin(wrong & ~target.mask).count("1")
+    left_crossings: int = -(-to_left // capacity)
+    right_crossings: int = -(-to_right // capacity)
+
+    farmer_left: int = state.mask & 1
+    # the crossings alternate, starting in the direction the farmer can go in from their current side
+    if farmer_left:
+        first, second = right_crossings, left_crossings
+    else:
+        first, second = left_crossings, right_crossings
+    crossings: int = max(2 * first - 1, 2 * second, 0)
+
+    # an odd number of crossings leaves the farmer on the other side
+    farmer_moves: int = farmer_left ^ (target.mask & 1)
+    if crossings % 2 != farmer_moves:
+        crossings += 1
+    return crossings
@@ -0,0 +1,169 @@
+import heapq
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set
+from .state import State
+
+
+class IncrementalTree:
+    """
+    A breadth-first search tree over every state reachable from a root, repaired in place when bad states change.
+
+    When states become bad, only the subtrees hanging below them are cut off and regrown from the rest of the tree.
+    When bad states become good again, the shorter distances they open up are propagated outwards. Both repairs run a
+    search ordered by distance over the affected states only, so the tree is always a shortest-path tree.
+
+    Attributes:
+        n_items (int): The number of items in the game.
+        capacity (int): The number of items the farmer can take along per crossing.
+        root (int): The bitmask of the state the tree is grown from.
+        distance (Dict[int, int]): The number of crossings from the root to every reachable state.
+        parent (Dict[int, int]): The state every reachable state was reached from, the root being its own parent.
+        children (Dict[int, Set[int]]): The states every state is the parent of.
+        touched (int): The number of states handled by the build and the repairs since it was last reset.
+    """
+
+    def __init__(self, n_items: int, capacity: int, root: int) -> None:
+        self.n_items: int = n_items
+        self.capacity: int = capacity
+        self.root: int = root
+        self.distance: Dict[int, int] = {}
+        self.parent: Dict[int, int] = {}
+        self.children: Dict[int, Set[int]] = {}
+        self.touched: int = 0
+
+    def _neighbours(self, mask: int) -> List[int]:
+        return State.neighbour_masks(mask, self.n_items, self.capacity)
+
+    def _attach(self, mask: int, parent: int, distance: int) -> None:
+        old_parent: Optional[int] = self.parent.get(mask)
+        if old_parent is not None and old_parent != mask:
+            self.children[old_parent].discard(mask)
+        self.distance[mask] = distance
+        self.parent[mask] = parent
+        self.children.setdefault(mask, set())
+        if parent != mask:
+            self.children[parent].add(mask)
+
+    def build(self, is_bad: Callable[[int], bool]) -> None:
+        """
+        Grows the tree from the root with a full breadth-first search.
+
+        Args:
+            is_bad (Callable[[int], bool]): Function returning True for the bitmask of a bad state.
+        """
+        self.distance, self.parent, self.children = {}, {}, {}
+        self._attach(self.root, self.root, 0)
+        q: Deque[int] = deque([self.root])
+        while q:
+            curr: int = q.popleft()
+            for neighbour in self._neighbours(curr):
+                if neighbour not in self.distance and not is_bad(neighbour):
+                    self._attach(neighbour, curr, self.distance[curr] + 1)
+                    q.append(neighbour)
+        self.touched += len(self.distance)
+
+    def _grow(
+        self, heap: List[tuple[int, int, int]], is_bad: Callable[[int], bool], allowed: Optional[Set[int]]
+    ) -> None:
+        """
+        Settles the states on the heap of (distance, state, parent) in order of distance and relaxes their neighbours.
+
+        A state is (re)attached when the heap offers it a shorter distance than it has. With `allowed` set, only those
+        states are relaxed, which is the case when the repair is known to be confined to them.
+        """
+        while heap:
+            distance, mask, parent = heapq.heappop(heap)
+            if self.distance.get(mask, distance + 1) <= distance:
+                continue
+            self._attach(mask, parent, distance)
+            self.touched += 1
+            for neighbour in self._neighbours(mask):
+                if allowed is not None and neighbour not in allowed:
+                    continue
+                if self.distance.get(neighbour, distance + 2) > distance + 1 and not is_bad(neighbour):
+                    heapq.heappush(heap, (distance + 1, neighbour, mask))
+
+    def add_bad(self, masks: Iterable[int], is_bad: Callable[[int], bool]) -> None:
+        """
+        Repairs the tree after the given states became bad.
+
+        The new bad states and their subtrees are removed. The removed states that are still good are then regrown,
+        starting from the distances their neighbours in the remaining tree offer. States that cannot be regrown are
+        no longer reachable.
+
+        Args:
+            masks (Iterable[int]): The bitmasks of the states that became bad.
+            is_bad (Callable[[int], bool]): Function returning True for the bitmask of a bad state, including the new
+                ones.
+
+        Raises:
+            ValueError: If the root became bad.
+        """
+        orphans: Set[int] = set()
+        for mask in masks:
+            if mask == self.root:
+                raise ValueError("The root of the tree cannot become bad")
+            if mask not in self.distance or mask in orphans:
+                continue
+            # cut the subtree below the new bad state
+            stack: List[int] = [mask]
+            while stack:
+                curr: int = stack.pop()
+                orphans.add(curr)
+                stack.extend(self.children[curr])
+        for orphan in orphans:
+            parent: int = self.parent[orphan]
+            if parent not in orphans:
+                self.children[parent].discard(orphan)
+        for orphan in orphans:
+            del self.distance[orphan], self.parent[orphan], self.children[orphan]
+
+        orphans = {orphan for orphan in orphans if not is_bad(orphan)}
+        heap: List[tuple[int, int, int]] = []
+        for orphan in orphans:
+            for neighbour in self._neighbours(orphan):
+                if neighbour in self.distance:
+                    heap.append((self.distance[neighbour] + 1, orphan, neighbour))
+        heapq.heapify(heap)
+        # only the cut-off states can get a new distance, the rest of the tree keeps its shortest paths
+        self._grow(heap, is_bad, orphans)
+
+    def remove_bad(self, masks: Iterable[int], is_bad: Callable[[int], bool]) -> None:
+        """
+        Repairs the tree after the given states became good again.
+
+        Every such state is attached to its closest neighbour in the tree, after which the shorter distances it opens
+        up, and the states it makes reachable, are propagated outwards.
+
+        Args:
+            masks (Iterable[int]): The bitmasks of the states that are no longer bad.
+            is_bad (Callable[[int], bool]): Function returning True for the bitmask of a bad state, without the removed
+                ones.
+        """
+        heap: List[tuple[int, int, int]] = []
+        for mask in masks:
+            if mask in self.distance or is_bad(mask):
+                continue
+            for neighbour in self._neighbours(mask):
+                if neighbour in self.distance:
+                    heap.append((self.distance[neighbour] + 1, mask, neighbour))
+        heapq.heapify(heap)
+        self._grow(heap, is_bad, None)
+
+    def path_to(self, target: int) -> Optional[List[int]]:
+        """
+        Follows the parents from a state back to the root.
+
+        Args:
+            target (int): The bitmask of the state to reach.
+
+        Returns:
+            Optional[List[int]]: The bitmasks on a shortest path from the root to `target`, or None if it cannot be
+            reached.
+        """
+        if target not in self.distance:
+            return None
+        path: List[int] = [target]
+        while path[-1] != self.root:
+            path.append(self.parent[path[-1]])
+        return path[::-1]
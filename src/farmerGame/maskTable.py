@@ -0,0 +1,83 @@
+from array import array
+from typing import Dict, Iterator, Optional, Union
+
+# the largest number of items for which a dense table is used, 2^20 entries of 8 bytes take 8 MiB
+DENSE_TABLE_MAX_ITEMS: int = 20
+
+
+class MaskTable:
+    """
+    A compact mapping from state bitmasks to unsigned integers, such as parent masks, next hops or distances.
+
+    For small games the values are kept in a flat `array` indexed directly by the bitmask, with the largest value of
+    the type code marking a missing entry. Larger games fall back to a `dict` from int to int. Either way no `State`
+    objects are kept alive, which is where the memory of a search with `State.prev` pointers goes.
+
+    Attributes:
+        n_items (int): The number of items of the states in the table.
+        typecode (str): The `array` type code of the values, `"Q"` for bitmasks and `"L"` or `"I"` for distances.
+        dense (bool): Whether the values are stored in a flat array instead of a dict.
+    """
+
+    __slots__ = ("n_items", "typecode", "dense", "_values", "_missing", "_size")
+
+    def __init__(self, n_items: int, typecode: str = "Q", dense: Optional[bool] = None) -> None:
+        """
+        Creates an empty table.
+
+        Args:
+            n_items (int): The number of items of the states in the table.
+            typecode (str, optional): The `array` type code of the values. Defaults to "Q".
+            dense (Optional[bool], optional): Whether to use a flat array. Defaults to None, which uses a flat array
+                when the game has at most `DENSE_TABLE_MAX_ITEMS` items.
+        """
+        self.n_items: int = n_items
+        self.typecode: str = typecode
+        self.dense: bool = n_items <= DENSE_TABLE_MAX_ITEMS if dense is None else dense
+        self._values: Union[array, Dict[int, int]]
+        if self.dense:
+            item_size: int = array(typecode).itemsize
+            self._values = array(typecode, b"\xff" * (item_size << n_items))
+            self._missing: int = self._values[0]
+        else:
+            self._values = {}
+            self._missing = -1
+        self._size: int = 0
+
+    def __setitem__(self, mask: int, value: int) -> None:
+        if self.dense:
+            if self._values[mask] == self._missing:
+                self._size += 1
+            self._values[mask] = value
+        else:
+            self._values[mask] = value  # type: ignore[index]
+            self._size = len(self._values)
+
+    def __getitem__(self, mask: int) -> int:
+        value: int = self._values[mask]
+        if value == self._missing:
+            raise KeyError(mask)
+        return value
+
+    def get(self, mask: int, default: Optional[int] = None) -> Optional[int]:
+        if self.dense:
+            value: int = self._values[mask]  # type: ignore[index]
+            return default if value == self._missing else value
+        return self._values.get(mask, default)  # type: ignore[union-attr]
+
+    def __contains__(self, mask: object) -> bool:
+        if self.dense:
+            return self._values[mask] != self._missing  # type: ignore[index]
+        return mask in self._values
+
+    def __iter__(self) -> Iterator[int]:
+        if not self.dense:
+            yield from self._values
+            return
+        missing: int = self._missing
+        for mask, value in enumerate(self._values):
+            if value != missing:
+                yield mask
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,230 @@
+import ctypes
+import multiprocessing
+import os
+from array import array
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from collections.abc import Iterable
+from .badStateRules import BadStateRule
+from .state import State
+
+# number of (state, parent) pairs a worker can hand to the other workers per exchange round
+BUFFER_PAIRS: int = 1 << 15
+
+
+def _owner(mask: int, workers: int) -> int:
+    """
+    Maps a bitmask to the worker that owns it, mixing the bits first so neighbouring masks spread over the workers.
+    """
+    return (((mask * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+
+def _worker(
+    index: int,
+    workers: int,
+    n_items: int,
+    capacity: int,
+    source: int,
+    bad_masks: frozenset,
+    bad_rules: Sequence[BadStateRule],
+    buffers: Any,
+    slots: Any,
+    buffer_pairs: int,
+    connection: Connection,
+) -> None:
+    """
+    The loop of a worker process, which owns the states that `_owner` maps to `index`.
+
+    The worker keeps the parents and the frontier of its own states only. It answers the commands of the coordinator:
+    - `expand`: generates the neighbours of its frontier and sorts them into a pending bucket per owner.
+    - `send`: packs the next part of every bucket into its region of the shared buffers, recording the offset and
+      the length of the part for every destination in `slots`.
+    - `receive`: reads the pairs addressed to it from the regions of all workers and keeps the new states.
+    - `advance`: makes the new states the frontier and reports whether it discovered the given target.
+    - `parent`: returns the parent of one of its states, used to rebuild the path.
+    - `stop`: ends the loop.
+    """
+    rules: tuple[BadStateRule, ...] = tuple(bad_rules)
+
+    def is_bad(mask: int) -> bool:
+        return mask in bad_masks or any(rule.is_bad(mask) for rule in rules)
+
+    neighbour_masks: Callable[[int, int, int], List[int]] = State.neighbour_masks
+    region: int = 2 * buffer_pairs
+    shared = memoryview(buffers).cast("B").cast("Q")
+    shared_slots = memoryview(slots).cast("B").cast("Q")
+
+    parents: Dict[int, int] = {}
+    frontier: List[int] = []
+    next_frontier: List[int] = []
+    if _owner(source, workers) == index:
+        parents[source] = source
+        frontier.append(source)
+    pending: List[array] = [array("Q") for _ in range(workers)]
+    sent: List[int] = [0] * workers
+
+    while True:
+        command, argument = connection.recv()
+        if command == "expand":
+            pending = [array("Q") for _ in range(workers)]
+            sent = [0] * workers
+            for mask in frontier:
+                parent: int = parents[mask]
+                for neighbour in neighbour_masks(mask, n_items, capacity):
+                    # the state this one was discovered from is always visited already
+                    if neighbour == parent or is_bad(neighbour):
+                        continue
+                    owner: int = _owner(neighbour, workers)
+                    if owner == index and neighbour in parents:
+                        continue
+                    pending[owner].append(neighbour)
+                    pending[owner].append(mask)
+            connection.send((len(frontier), sum(len(bucket) for bucket in pending) // 2))
+
+        elif command == "send":
+            remaining: int = 0
+            offset: int = 0
+            for destination in range(workers):
+                chunk: array = pending[destination][sent[destination]:sent[destination] + region - offset]
+                start: int = index * region + offset
+                shared[start:start + len(chunk)] = chunk
+                slot: int = 2 * (index * workers + destination)
+                shared_slots[slot] = start
+                shared_slots[slot + 1] = len(chunk)
+                offset += len(chunk)
+                sent[destination] += len(chunk)
+                remaining += len(pending[destination]) - sent[destination]
+            connection.send(remaining // 2)
+
+        elif command == "receive":
+            for origin in range(workers):
+                slot = 2 * (origin * workers + index)
+                start = shared_slots[slot]
+                pairs: List[int] = shared[start:start + shared_slots[slot + 1]].tolist()
+                for i in range(0, len(pairs), 2):
+                    if pairs[i] not in parents:
+                        parents[pairs[i]] = pairs[i + 1]
+                        next_frontier.append(pairs[i])
+            connection.send(None)
+
+        elif command == "advance":
+            frontier, next_frontier = next_frontier, []
+            connection.send((len(frontier), argument in parents))
+
+        elif command == "parent":
+            connection.send(parents[argument])
+
+        elif command == "stop":
+            break
+    connection.close()
+
+
+def _broadcast(connections: List[Connection], command: str, argument: Any = None) -> List[Any]:
+    """
+    Sends a command to every worker and waits for all replies, which synchronizes the workers at this point.
+    """
+    for connection in connections:
+        connection.send((command, argument))
+    return [connection.recv() for connection in connections]
+
+
+def _shared_buffers(context: Any, workers: int, buffer_pairs: int) -> tuple[Any, Any]:
+    """
+    Allocates the shared memory of the exchange: a region of `buffer_pairs` pairs per worker, and the offset and the
+    length of the part of every region addressed to every worker.
+    """
+    buffers = context.RawArray(ctypes.c_uint64, workers * 2 * buffer_pairs)
+    slots = context.RawArray(ctypes.c_uint64, workers * workers * 2)
+    return buffers, slots
+
+
+def parallel_bfs(
+    n_items: int,
+    source: int,
+    target: int,
+    capacity: int = 1,
+    bad_masks: Iterable[int] = (),
+    bad_rules: Sequence[BadStateRule] = (),
+    workers: Optional[int] = None,
+    buffer_pairs: int = BUFFER_PAIRS,
+) -> tuple[Optional[List[int]], int]:
+    """
+    Level-synchronous breadth-first search over bitmasks, spread over worker processes that each own a hash partition.
+
+    Every state belongs to exactly one worker, which alone keeps its parent. At every level each worker expands its
+    part of the frontier and sorts the new states by owner. The states are then exchanged through shared-memory
+    buffers, one region per worker packed with the states for every owner, in as many rounds as needed for the
+    regions to hold them, so the shared memory grows linearly with the number of workers. The coordinating process synchronizes the workers at every level boundary and rebuilds the path at the end by asking
+    the owners for the parents.
+
+    Args:
+        n_items (int): The number of items in the game.
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+        bad_masks (Iterable[int], optional): The bitmasks of the bad states. Defaults to no bad states.
+        bad_rules (Sequence[BadStateRule], optional): Rules marking states as bad. They are sent to the workers, so
+            they have to be picklable when processes are not forked. Defaults to no rules.
+        workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+        buffer_pairs (int, optional): The number of states a worker can hand to the other workers per exchange
+            round. Defaults to `BUFFER_PAIRS`.
+
+    Returns:
+        tuple(Optional[List[int]], int): The bitmasks on the path from `source` to `target` (or None when the target
+        cannot be reached) and the number of expanded states.
+    """
+    if source == target:
+        return [source], 0
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    )
+    buffers, slots = _shared_buffers(context, workers, buffer_pairs)
+    bad: frozenset = frozenset(bad_masks)
+
+    connections: List[Connection] = []
+    processes: List[Any] = []
+    for index in range(workers):
+        parent_end, child_end = context.Pipe()
+        process = context.Process(
+            target=_worker,
+            args=(index, workers, n_items, capacity, source, bad, tuple(bad_rules), buffers, slots, buffer_pairs,
+                  child_end),
+            daemon=True,
+        )
+        process.start()
+        child_end.close()
+        connections.append(parent_end)
+        processes.append(process)
+
+    expanded: int = 0
+    try:
+        while True:
+            replies: List[Any] = _broadcast(connections, "expand")
+            expanded += sum(reply[0] for reply in replies)
+            pending: int = sum(reply[1] for reply in replies)
+            while pending:
+                pending = sum(_broadcast(connections, "send"))
+                _broadcast(connections, "receive")
+
+            replies = _broadcast(connections, "advance", target)
+            if any(found for _, found in replies):
+                break
+            if not sum(size for size, _ in replies):
+                return None, expanded
+
+        path: List[int] = [target]
+        while path[-1] != source:
+            connection: Connection = connections[_owner(path[-1], workers)]
+            connection.send(("parent", path[-1]))
+            path.append(connection.recv())
+        return path[::-1], expanded
+    finally:
+        for connection in connections:
+            try:
+                connection.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in processes:
+            process.join()
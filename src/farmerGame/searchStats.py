@@ -0,0 +1,43 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class SearchStats:
+    """
+    Counters and timings collected by a search, see `FarmerGame.stats`.
+
+    Attributes:
+        generated (int): The number of neighbours generated.
+        expanded (int): The number of states whose neighbours were generated, which leaves out the target.
+        duplicates (int): The number of generated neighbours rejected because they were already visited.
+        bad_rejections (int): The number of generated neighbours rejected because they are bad. A bad state is
+            rejected, and looked up, every time it is generated.
+        peak_frontier (int): The largest number of states in one level of the frontier.
+        level_seconds (List[float]): The time spent on every depth level, starting at the source.
+        total_seconds (float): The time spent on the whole search.
+    """
+
+    generated: int = 0
+    expanded: int = 0
+    duplicates: int = 0
+    bad_rejections: int = 0
+    peak_frontier: int = 0
+    level_seconds: List[float] = field(default_factory=list)
+    total_seconds: float = 0.0
+
+    @property
+    def depth(self) -> int:
+        """
+        int: The number of levels the search has worked on.
+        """
+        return len(self.level_seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Converts the statistics into a dictionary, for example to send them to a metrics system as JSON.
+
+        Returns:
+            Dict[str, Any]: The attributes by name.
+        """
+        return asdict(self)
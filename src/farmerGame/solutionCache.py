@@ -0,0 +1,206 @@
+"""
+A persistent cache of solved games, so instances that are solved again in a later run are answered without a search.
+
+Games are keyed by a fingerprint of everything that determines the answer: the item names, the boat capacity, the
+source, the target, the bad states and the bad-state rules. The solutions, including the fact that a game has no
+solution, are kept in an SQLite file whose total size is bounded by evicting the least recently used entries, with an
+in-process memo of the most recent entries in front of it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import List, Optional, Sequence
+from .badStateRules import BadStateRule
+
+DEFAULT_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".cache", "farmerGame", "solutions.sqlite")
+# environment variable overriding the default cache file
+CACHE_PATH_VARIABLE: str = "FARMER_GAME_CACHE"
+DEFAULT_MAX_BYTES: int = 64 << 20
+DEFAULT_MEMO_SIZE: int = 128
+# bytes counted for every entry on top of its path, an estimate of the key and the SQLite bookkeeping
+ENTRY_OVERHEAD: int = 128
+
+
+def instance_fingerprint(
+    item_names: Sequence[str],
+    capacity: int,
+    source: int,
+    target: int,
+    bad_masks: Iterable[int],
+    bad_rules: Sequence[BadStateRule] = (),
+) -> Optional[str]:
+    """
+    Computes a fingerprint of a game that is the same in every run and for every order of the bad states and rules.
+
+    Args:
+        item_names (Sequence[str]): The names of the items, the first one being the farmer.
+        capacity (int): The number of items the farmer can take along per crossing.
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        bad_masks (Iterable[int]): The bitmasks of the bad states.
+        bad_rules (Sequence[BadStateRule], optional): The bad-state rules. Defaults to no rules.
+
+    Returns:
+        Optional[str]: The hexadecimal SHA-256 fingerprint, or None if one of the rules has no fingerprint.
+    """
+    rule_fingerprints: List[str] = []
+    for rule in bad_rules:
+        rule_fingerprint: Optional[str] = rule.fingerprint()
+        if rule_fingerprint is None:
+            return None
+        rule_fingerprints.append(rule_fingerprint)
+
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(item_names), capacity, source, target)).encode("utf-8"))
+    digest.update(("\nbad states:" + ",".join(map(str, sorted(set(bad_masks))))).encode("utf-8"))
+    digest.update(("\nbad rules:" + "\n".join(sorted(rule_fingerprints))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """
+    A size-bounded store of solutions keyed by `instance_fingerprint`, persisted in an SQLite file.
+
+    ### Example, the second call is answered from the cache:
+        cache = SolutionCache()
+        game.bfs(cache=cache)
+        game.bfs(cache=cache)
+
+    Attributes:
+        path (str): The path of the SQLite file.
+        max_bytes (int): The bound on the total size of the stored solutions.
+        memo_size (int): The number of solutions kept in memory.
+        hits (int): The number of lookups answered by the memo or the file.
+        misses (int): The number of lookups that found nothing.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ) -> None:
+        """
+        Args:
+            path (Optional[str], optional): The path of the SQLite file, created on first use. Defaults to None, which
+                takes the `FARMER_GAME_CACHE` environment variable or else `DEFAULT_CACHE_PATH`.
+            max_bytes (int, optional): The bound on the total size of the stored solutions, beyond which the least
+                recently used ones are evicted. Defaults to `DEFAULT_MAX_BYTES`.
+            memo_size (int, optional): The number of solutions kept in memory. Defaults to `DEFAULT_MEMO_SIZE`.
+        """
+        self.path: str = path or os.environ.get(CACHE_PATH_VARIABLE) or DEFAULT_CACHE_PATH
+        self.max_bytes: int = max_bytes
+        self.memo_size: int = memo_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._memo: "OrderedDict[str, tuple[tuple[int, ...], bool]]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory: str = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # several processes may share the file, so wait for their writes instead of failing
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS solutions ("
+                    "key TEXT PRIMARY KEY, path TEXT NOT NULL, solved INTEGER NOT NULL, "
+                    "size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+                )
+        return self._connection
+
+    def _remember(self, key: str, masks: tuple[int, ...], solved: bool) -> None:
+        self._memo[key] = (masks, solved)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def lookup(self, key: str) -> Optional[tuple[tuple[int, ...], bool]]:
+        """
+        Looks up the solution of a game and marks it as recently used.
+
+        Args:
+            key (str): The fingerprint of the game.
+
+        Returns:
+            Optional[tuple(tuple[int, ...], bool)]: The bitmasks on the path from the source to the target and whether
+            the game has a solution, or None if the game is not in the cache.
+        """
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            self.hits += 1
+            return self._memo[key]
+
+        connection: sqlite3.Connection = self._connect()
+        row = connection.execute("SELECT path, solved FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        with connection:
+            connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+
+        self.hits += 1
+        masks: tuple[int, ...] = tuple(int(mask) for mask in row[0].split(",")) if row[0] else ()
+        self._remember(key, masks, bool(row[1]))
+        return masks, bool(row[1])
+
+    def store(self, key: str, masks: Sequence[int], solved: bool) -> None:
+        """
+        Stores the solution of a game, evicting the least recently used solutions when the file grows too large.
+
+        Args:
+            key (str): The fingerprint of the game.
+            masks (Sequence[int]): The bitmasks on the path from the source to the target, empty without a solution.
+            solved (bool): Whether the game has a solution.
+        """
+        self._remember(key, tuple(masks), solved)
+        path: str = ",".join(map(str, masks))
+        connection: sqlite3.Connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO solutions (key, path, solved, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, path, int(solved), len(path) + ENTRY_OVERHEAD, time.time_ns()),
+            )
+            total: int = connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+            if total > self.max_bytes:
+                evicted: List[str] = []
+                for old_key, size in connection.execute("SELECT key, size FROM solutions ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append(old_key)
+                    total -= size
+                connection.executemany("DELETE FROM solutions WHERE key = ?", [(old_key,) for old_key in evicted])
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self) -> None:
+        """
+        Removes all solutions from the memo and the file.
+        """
+        self._memo.clear()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM solutions")
+
+    def close(self) -> None:
+        """
+        Closes the SQLite file, which is opened again on the next use.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "SolutionCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,4 +1,6 @@
 from typing import Optional, List
+from functools import lru_cache
+from itertools import combinations
 
 
 class State:
@@ -8,14 +10,19 @@ class State:
     Each state keeps track of the items' positions (whether they are on the left side or not) and a reference
     to the previous state, allowing for backtracking during the search for a solution.
 
+    The positions are packed into a single integer bitmask, where bit `i` is set when item `i` is on the left side.
+    The hash of a state is computed once on creation, which makes set and dictionary lookups cheap.
+
     Attributes:
         item_names (tuple[str, ...]): A class-level attribute that stores the names of the items involved in the game.
             It is initialized with a default value of "Item names not set" and can be updated using the `additem_names` method.
-        items_left (List[bool]): A list of boolean values indicating the position of each item.
-            `True` means the item is on the left side, and `False` means it is on the right.
+        mask (int): The bitmask of the positions, bit `i` is set when item `i` is on the left side.
+        n_items (int): The number of items in the state.
         prev (Optional[State]): A reference to the previous state, allowing the construction of a path through the states.
     """
 
+    __slots__ = ("mask", "n_items", "prev", "_hash")
+
     item_names: tuple[str, ...] = tuple("Item names not set")
 
     def __init__(self, items_left: List[bool], prev: Optional["State"] = None):
@@ -31,8 +38,100 @@ class State:
             prev (Optional["State"], optional): A reference to the previous `State` object, useful for backtracking through states.
                 Defaults to None.
         """
-        self.items_left: List[bool] = items_left
+        mask: int = 0
+        for i, left in enumerate(items_left):
+            if left:
+                mask |= 1 << i
+        self.mask: int = mask
+        self.n_items: int = len(items_left)
         self.prev: State | None = prev
+        self._hash: int = hash(mask)
+
+    @classmethod
+    def from_mask(
+        cls, mask: int, n_items: int, prev: Optional["State"] = None
+    ) -> "State":
+        """
+        Creates a `State` object directly from a bitmask, without going through a list of booleans.
+
+        Args:
+            mask (int): The bitmask of the positions, bit `i` is set when item `i` is on the left side.
+            n_items (int): The number of items in the state.
+            prev (Optional["State"], optional): A reference to the previous `State` object. Defaults to None.
+
+        Returns:
+            State: The state represented by `mask`.
+        """
+        state: State = cls.__new__(cls)
+        state.mask = mask
+        state.n_items = n_items
+        state.prev = prev
+        state._hash = hash(mask)
+        return state
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def move_masks(n_items: int, capacity: int = 1) -> tuple[int, ...]:
+        """
+        Lists the bitmasks of all crossings: the farmer alone or the farmer together with up to `capacity` other items.
+
+        Applying a crossing to a state is an XOR with its mask, which is only allowed when all moved items are on the
+        farmer's side. The result is cached per number of items and capacity.
+
+        Args:
+            n_items (int): The number of items in the game.
+            capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+
+        Returns:
+            tuple[int, ...]: The masks of all crossings, each including the farmer's bit.
+        """
+        items: List[int] = [1 << i for i in range(1, n_items)]
+        masks: List[int] = [1]
+        for size in range(1, min(capacity, len(items)) + 1):
+            masks.extend(1 | sum(combo) for combo in combinations(items, size))
+        return tuple(masks)
+
+    @staticmethod
+    def neighbour_masks(mask: int, n_items: int, capacity: int = 1) -> List[int]:
+        """
+        Computes the bitmasks of all states reachable from `mask` with one crossing, without creating `State` objects.
+
+        Only the items on the farmer's side are looked at: their bits are extracted with the lowest-set-bit trick and
+        combined into crossings of at most `capacity` items, so no candidate crossing is ever rejected.
+
+        Args:
+            mask (int): The bitmask of the current state.
+            n_items (int): The number of items in the game.
+            capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+
+        Returns:
+            List[int]: The bitmasks of the neighbouring states.
+        """
+        # the items on the same side as the farmer, farmer on the right means the unset bits
+        if mask & 1:
+            same_side: int = mask & ~1
+        else:
+            same_side = ~mask & ((1 << n_items) - 2)
+
+        farmer_moved: int = mask ^ 1
+        neighbours: List[int] = [farmer_moved]
+        items: List[int] = []
+        while same_side:
+            low: int = same_side & -same_side
+            items.append(low)
+            neighbours.append(farmer_moved ^ low)
+            same_side ^= low
+
+        for size in range(2, min(capacity, len(items)) + 1):
+            neighbours.extend(farmer_moved ^ sum(combo) for combo in combinations(items, size))
+        return neighbours
+
+    @property
+    def items_left(self) -> List[bool]:
+        """
+        List[bool]: The positions of the items, `True` means the item is on the left side.
+        """
+        return [bool(self.mask >> i & 1) for i in range(self.n_items)]
 
     @classmethod
     def add_item_names(cls, item_names: tuple[str, ...]) -> None:
@@ -58,7 +157,7 @@ class State:
                 [
                     self.item_names[i]
                     for i in range(len(self.item_names))
-                    if self.items_left[i]
+                    if self.mask >> i & 1
                 ]
             )
             + "]"
@@ -66,53 +165,30 @@ class State:
 
     def __eq__(self, other) -> bool:
         if isinstance(other, State):
-            return self.items_left == other.items_left
+            return self.mask == other.mask and self.n_items == other.n_items
         return False
 
     def __hash__(self) -> int:
         # This allows the state to be used in a set or as a dictionary key
-        return hash(tuple(self.items_left))
+        return self._hash
 
-    def get_neighbours(self) -> List["State"]:
+    def get_neighbours(self, capacity: int = 1) -> List["State"]:
         """
         Finds all neighboring states based on the current state's configuration.
 
         A neighboring state is one where:
         - Either only the first item (farmer) moves from one side to the other, or
-        - The first item (farmer) moves together with an item from the same side.
+        - The first item (farmer) moves together with at most `capacity` items from the same side.
+
+        Args:
+            capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
 
         Returns:
             List[State]: A list of neighboring states derived from the current state.
         """
-        neighbours: List[State] = []
-        prev: State = self
-
-        # farmer is on the right
-        if not self.items_left[0]:
-            self.items_left[0] = True
-            neighbour = State(self.items_left.copy(), prev)
-            neighbours.append(neighbour)
-
-            for i in range(1, len(self.items_left)):
-                if not self.items_left[i]:
-                    self.items_left[i] = True
-                    neighbour = State(self.items_left.copy(), prev)
-                    neighbours.append(neighbour)
-                    self.items_left[i] = False
-            self.items_left[0] = False
-
-        # farmer is on the left
-        if self.items_left[0]:
-            self.items_left[0] = False
-            neighbour = State(self.items_left.copy(), prev)
-            neighbours.append(neighbour)
-
-            for i in range(1, len(self.items_left)):
-                if self.items_left[i]:
-                    self.items_left[i] = False
-                    neighbour = State(self.items_left.copy(), prev)
-                    neighbours.append(neighbour)
-                    self.items_left[i] = True
-            self.items_left[0] = True
-
-        return neighbours
+        n_items: int = self.n_items
+        from_mask = State.from_mask
+        return [
+            from_mask(mask, n_items, self)
+            for mask in State.neighbour_masks(self.mask, n_items, capacity)
+        ]
@@ -0,0 +1,160 @@
+from typing import Collection, Container, Iterator, Optional, Sequence, Union
+from collections.abc import Iterable
+from bisect import bisect_left
+from .state import State
+
+# the largest number of items for which a dense set is used, 2^28 bits take 32 MiB
+DENSE_MAX_ITEMS: int = 28
+
+# rough number of bytes a Python set spends per stored int, used to pick the smaller representation
+SET_BYTES_PER_ENTRY: int = 64
+
+
+class StateBitSet:
+    """
+    A set of states of a game with `n_items` items, stored as a dense bit array with one bit per possible state.
+
+    The bit of a state is found directly through its bitmask, so membership tests and insertions are a single index
+    operation and the memory use is 2^n bits regardless of the number of stored states. Both `State` objects and
+    plain bitmasks can be added and looked up.
+
+    Attributes:
+        n_items (int): The number of items of the states in the set.
+        bits (bytearray): The bit array, bit `mask % 8` of byte `mask // 8` is set when `mask` is in the set.
+    """
+
+    __slots__ = ("n_items", "bits", "_size")
+
+    def __init__(self, n_items: int, bits: Optional[bytearray] = None) -> None:
+        """
+        Creates an empty set, or a set backed by an existing bit array.
+
+        Args:
+            n_items (int): The number of items of the states in the set.
+            bits (Optional[bytearray], optional): An existing bit array of at least 2^n bits to use as storage, for
+                example a memory-mapped file. Defaults to None, which allocates a new zeroed array.
+        """
+        n_bytes: int = max(1, (1 << n_items) >> 3)
+        # the size of an existing bit array is only counted when it is asked for
+        self._size: Optional[int] = None
+        if bits is None:
+            bits = bytearray(n_bytes)
+            self._size = 0
+        elif len(bits) < n_bytes:
+            raise ValueError(f"A bit array of {n_bytes} bytes is needed for {n_items} items, got {len(bits)}")
+        self.n_items: int = n_items
+        self.bits: bytearray = bits
+
+    @classmethod
+    def from_masks(cls, masks: Iterable[int], n_items: int) -> "StateBitSet":
+        """
+        Creates a set containing the given bitmasks.
+
+        Args:
+            masks (Iterable[int]): The bitmasks to add.
+            n_items (int): The number of items of the states in the set.
+
+        Returns:
+            StateBitSet: The set containing all of `masks`.
+        """
+        bit_set: StateBitSet = cls(n_items)
+        for mask in masks:
+            bit_set.add(mask)
+        return bit_set
+
+    def add(self, item: Union[State, int]) -> None:
+        mask: int = item if type(item) is int else item.mask  # type: ignore[union-attr]
+        bit: int = 1 << (mask & 7)
+        byte: int = self.bits[mask >> 3]
+        if not byte & bit:
+            self.bits[mask >> 3] = byte | bit
+            if self._size is not None:
+                self._size += 1
+
+    def discard(self, item: Union[State, int]) -> None:
+        mask: int = item if type(item) is int else item.mask  # type: ignore[union-attr]
+        bit: int = 1 << (mask & 7)
+        byte: int = self.bits[mask >> 3]
+        if byte & bit:
+            self.bits[mask >> 3] = byte & ~bit
+            if self._size is not None:
+                self._size -= 1
+
+    def __contains__(self, item: object) -> bool:
+        mask: int = item if type(item) is int else item.mask  # type: ignore[attr-defined]
+        return self.bits[mask >> 3] >> (mask & 7) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low: int = byte & -byte
+                yield byte_index << 3 | low.bit_length() - 1
+                byte ^= low
+
+    def __len__(self) -> int:
+        if self._size is None:
+            self._size = sum(bin(byte).count("1") for byte in self.bits)
+        return self._size
+
+
+class SortedMaskArray:
+    """
+    A read-only set of bitmasks stored as a sorted sequence of unsigned 64-bit integers, looked up by binary search.
+
+    The sequence can be any buffer of masks, such as an `array("Q")` or a `memoryview` of a memory-mapped file, so a
+    large set of states can be used without copying it into Python objects.
+
+    Attributes:
+        masks (Sequence[int]): The sorted bitmasks without duplicates.
+    """
+
+    __slots__ = ("masks",)
+
+    def __init__(self, masks: Sequence[int]) -> None:
+        """
+        Args:
+            masks (Sequence[int]): The sorted bitmasks without duplicates.
+        """
+        self.masks: Sequence[int] = masks
+
+    def __contains__(self, item: object) -> bool:
+        mask: int = item if type(item) is int else item.mask  # type: ignore[attr-defined]
+        position: int = bisect_left(self.masks, mask)
+        return position < len(self.masks) and self.masks[position] == mask
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.masks)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+
+def new_visited_set(n_items: int) -> Union[StateBitSet, set]:
+    """
+    Creates an empty set of bitmasks for the visited states of a search.
+
+    Args:
+        n_items (int): The number of items in the game.
+
+    Returns:
+        Union[StateBitSet, set]: A `StateBitSet` when the game has at most `DENSE_MAX_ITEMS` items, a `set` otherwise.
+    """
+    if n_items <= DENSE_MAX_ITEMS:
+        return StateBitSet(n_items)
+    return set()
+
+
+def mask_container(masks: Collection[int], n_items: int) -> Container[int]:
+    """
+    Stores a collection of bitmasks in whichever of a `StateBitSet` or a `frozenset` takes the least memory.
+
+    Args:
+        masks (Collection[int]): The bitmasks to store.
+        n_items (int): The number of items in the game.
+
+    Returns:
+        Container[int]: A container supporting membership tests of bitmasks.
+    """
+    if n_items <= DENSE_MAX_ITEMS and len(masks) * SET_BYTES_PER_ENTRY > (1 << n_items) >> 3:
+        return StateBitSet.from_masks(masks, n_items)
+    return frozenset(masks)
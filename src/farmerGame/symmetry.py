@@ -0,0 +1,143 @@
+"""
+Symmetry reduction for games with interchangeable items.
+
+When the items of a group can be swapped without changing which states are bad, a state is described up to symmetry
+by how many items of every group are on the left side. The search runs over these count vectors, whose number is the
+product of the group sizes plus one instead of two to the power of the number of items, and the solution is expanded
+into concrete moves afterwards.
+
+Groups are tuples of item indices. The first group is always the farmer on its own.
+"""
+
+from collections import Counter
+from math import comb, prod
+from typing import Collection, Iterator, List, Sequence
+
+Counts = tuple[int, ...]
+
+
+def canonical(mask: int, groups: Sequence[Sequence[int]]) -> Counts:
+    """
+    Maps a bitmask to the number of items of every group on the left side.
+
+    Args:
+        mask (int): The bitmask of the state, bit `i` is set when item `i` is on the left side.
+        groups (Sequence[Sequence[int]]): The item indices of every group.
+
+    Returns:
+        Counts: The number of items on the left side per group.
+    """
+    return tuple(sum(mask >> item & 1 for item in group) for group in groups)
+
+
+def representative(counts: Counts, groups: Sequence[Sequence[int]]) -> int:
+    """
+    Picks the bitmask of one state with the given counts, with the first items of every group on the left side.
+
+    Args:
+        counts (Counts): The number of items on the left side per group.
+        groups (Sequence[Sequence[int]]): The item indices of every group.
+
+    Returns:
+        int: The bitmask of the state.
+    """
+    mask: int = 0
+    for count, group in zip(counts, groups):
+        for item in group[:count]:
+            mask |= 1 << item
+    return mask
+
+
+def class_size(counts: Counts, groups: Sequence[Sequence[int]]) -> int:
+    """
+    Counts the states with the given counts.
+
+    Args:
+        counts (Counts): The number of items on the left side per group.
+        groups (Sequence[Sequence[int]]): The item indices of every group.
+
+    Returns:
+        int: The number of bitmasks that `canonical` maps to `counts`.
+    """
+    return prod(comb(len(group), count) for count, group in zip(counts, groups))
+
+
+def count_moves(counts: Counts, sizes: Sequence[int], capacity: int = 1) -> Iterator[Counts]:
+    """
+    Generates the count vectors reachable with one crossing, the farmer being the first group.
+
+    Args:
+        counts (Counts): The number of items on the left side per group.
+        sizes (Sequence[int]): The number of items per group.
+        capacity (int, optional): The number of items the farmer can take along per crossing. Defaults to 1.
+
+    Yields:
+        Counts: The counts after the farmer crosses with some of the items on their side.
+    """
+    farmer_left: int = counts[0]
+    direction: int = -1 if farmer_left else 1
+    available: List[int] = [
+        count if farmer_left else size - count for count, size in zip(counts, sizes)
+    ]
+
+    def choose(group: int, room: int, taken: List[int]) -> Iterator[Counts]:
+        if group == len(counts):
+            yield (1 - farmer_left,) + tuple(
+                count + direction * amount for count, amount in zip(counts[1:], taken)
+            )
+            return
+        for amount in range(min(room, available[group]) + 1):
+            taken.append(amount)
+            yield from choose(group + 1, room - amount, taken)
+            taken.pop()
+
+    yield from choose(1, capacity, [])
+
+
+def check_symmetric(bad_masks: Collection[int], groups: Sequence[Sequence[int]]) -> None:
+    """
+    Checks that the bad states are closed under swapping items within a group.
+
+    A set of bad states is symmetric when every count vector that one bad state maps to is fully bad, which is the
+    case when the number of bad states per count vector equals the number of states with those counts.
+
+    Args:
+        bad_masks (Collection[int]): The bitmasks of the bad states, without repeats.
+        groups (Sequence[Sequence[int]]): The item indices of every group.
+
+    Raises:
+        ValueError: If some but not all states of a count vector are bad.
+    """
+    for counts, n_bad in Counter(canonical(mask, groups) for mask in bad_masks).items():
+        if n_bad != class_size(counts, groups):
+            raise ValueError(
+                f"The bad states are not symmetric within the item groups: {n_bad} of the "
+                f"{class_size(counts, groups)} states with counts {counts} per group are bad"
+            )
+
+
+def concrete_path(source: int, counts_path: Sequence[Counts], groups: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Expands a path of count vectors into a path of bitmasks starting at a concrete source.
+
+    Every step moves the required number of items of each group, taking the items with the lowest indices on the
+    farmer's side. Any choice gives a valid path when the bad states are symmetric.
+
+    Args:
+        source (int): The bitmask of the source state, which `canonical` maps to `counts_path[0]`.
+        counts_path (Sequence[Counts]): The count vectors on the path.
+        groups (Sequence[Sequence[int]]): The item indices of every group.
+
+    Returns:
+        List[int]: The bitmasks on the path.
+    """
+    path: List[int] = [source]
+    for curr, next_counts in zip(counts_path, counts_path[1:]):
+        mask: int = path[-1]
+        farmer_left: int = curr[0]
+        for count, next_count, group in zip(curr, next_counts, groups):
+            on_farmer_side: List[int] = [item for item in group if (mask >> item & 1) == farmer_left]
+            for item in on_farmer_side[:abs(next_count - count)]:
+                mask ^= 1 << item
+        path.append(mask)
+    return path
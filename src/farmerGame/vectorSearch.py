@@ -0,0 +1,116 @@
+from typing import List, Optional, Sequence
+from collections.abc import Iterable
+from .badStateRules import BadStateRule
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The vectorized search requires numpy, install it with `pip install numpy`")
+
+
+def _contains_sorted(sorted_masks: "np.ndarray", masks: "np.ndarray") -> "np.ndarray":
+    """
+    Vectorized membership test of `masks` in the sorted array `sorted_masks`.
+
+    Args:
+        sorted_masks (np.ndarray): A sorted array of unique bitmasks.
+        masks (np.ndarray): The bitmasks to look up.
+
+    Returns:
+        np.ndarray: A boolean array that is True where the mask is contained in `sorted_masks`.
+    """
+    if sorted_masks.size == 0:
+        return np.zeros(masks.shape, dtype=bool)
+    positions = np.searchsorted(sorted_masks, masks)
+    np.minimum(positions, sorted_masks.size - 1, out=positions)
+    return sorted_masks[positions] == masks
+
+
+def vectorized_bfs(
+    source: int,
+    target: int,
+    move_masks: Sequence[int],
+    bad_masks: Iterable[int] = (),
+    bad_rules: Sequence[BadStateRule] = (),
+) -> tuple[Optional[List[int]], int]:
+    """
+    Level-synchronous breadth-first search over bitmasks, expanding a whole level with NumPy operations at once.
+
+    Each level is stored as a sorted `uint64` array. A level is expanded by XOR-ing it with every move mask for which
+    the moved items are on the farmer's side, after which bad states and visited states are removed with vectorized
+    membership tests. Because every move is its own inverse, the neighbours of a level can only lie in the previous
+    level, the level itself or the next level, so only those two levels are checked instead of a visited set over
+    the whole search. Parents are kept as index arrays into the previous level instead of `State.prev` pointers.
+
+    Args:
+        source (int): The bitmask of the source state.
+        target (int): The bitmask of the target state.
+        move_masks (Sequence[int]): The bitmasks of all possible crossings, each including the farmer's bit.
+        bad_masks (Iterable[int], optional): The bitmasks of the bad states. Defaults to no bad states.
+        bad_rules (Sequence[BadStateRule], optional): Rules marking states as bad, applied to every new level with
+            `BadStateRule.is_bad_array`. Defaults to no rules.
+
+    Raises:
+        ImportError: If numpy is not installed.
+
+    Returns:
+        tuple(Optional[List[int]], int): The bitmasks on the path from `source` to `target` (or None when the target
+        cannot be reached) and the number of expanded states.
+    """
+    _require_numpy()
+
+    moves = np.array(move_masks, dtype=np.uint64)
+    bad = np.unique(np.fromiter(bad_masks, dtype=np.uint64))
+    one = np.uint64(1)
+
+    levels: List[np.ndarray] = [np.array([source], dtype=np.uint64)]
+    parents: List[np.ndarray] = [np.array([-1], dtype=np.int64)]
+    previous = np.empty(0, dtype=np.uint64)
+    expanded: int = 0
+    found: Optional[int] = 0 if source == target else None
+
+    while found is None and levels[-1].size:
+        frontier = levels[-1]
+        expanded += frontier.size
+        farmer_left = (frontier & one).astype(bool)
+
+        children_parts: List[np.ndarray] = []
+        parent_parts: List[np.ndarray] = []
+        for move in moves:
+            on_side = frontier & move
+            valid = np.nonzero(np.where(farmer_left, on_side == move, on_side == 0))[0]
+            children_parts.append(frontier[valid] ^ move)
+            parent_parts.append(valid)
+        children = np.concatenate(children_parts)
+        child_parents = np.concatenate(parent_parts)
+
+        keep = ~(_contains_sorted(frontier, children) | _contains_sorted(previous, children))
+        if bad.size:
+            keep &= ~_contains_sorted(bad, children)
+        for rule in bad_rules:
+            keep &= ~rule.is_bad_array(children)
+        children, first = np.unique(children[keep], return_index=True)
+        child_parents = child_parents[keep][first]
+
+        previous = frontier
+        levels.append(children)
+        parents.append(child_parents)
+
+        hit = np.nonzero(children == np.uint64(target))[0]
+        if hit.size:
+            found = int(hit[0])
+
+    if found is None:
+        return None, expanded
+
+    path: List[int] = []
+    index: int = found
+    for depth in range(len(levels) - 1, -1, -1):
+        path.append(int(levels[depth][index]))
+        index = int(parents[depth][index])
+    return path[::-1], expanded
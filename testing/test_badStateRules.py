@@ -0,0 +1,111 @@
+import os
+import unittest
+from src.farmerGame.badStateRules import (
+    AllOf,
+    CountRule,
+    OutnumberRule,
+    PredicateRule,
+    TogetherWithoutRule,
+    np,
+)
+from src.farmerGame.dataReader import bad_state_reader
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.state import State
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBadStateRules(unittest.TestCase):
+
+    def setUp(self):
+        self.wolf_goat_cabbage_rules = [
+            TogetherWithoutRule([1, 2], [0]),
+            TogetherWithoutRule([2, 3], [0]),
+        ]
+        # captain, three pirates and the first four of the five gold pieces, as in piratesBadStates.txt
+        self.pirates_rules = [
+            AllOf(
+                CountRule([0], at_least=1),
+                CountRule([1, 2, 3], at_least=2),
+                OutnumberRule([1, 2, 3], [4, 5, 6, 7]),
+            )
+        ]
+
+    @staticmethod
+    def enumerate_bad_masks(rules, n_items):
+        return {mask for mask in range(1 << n_items) if any(rule.is_bad(mask) for rule in rules)}
+
+    def test_together_without_matches_bad_states_file(self):
+        """Test that the wolf goat cabbage rules mark exactly the states of badstates.txt"""
+        bad_states = bad_state_reader(os.path.join(DATA_DIR, "badstates.txt"))
+        self.assertEqual(
+            self.enumerate_bad_masks(self.wolf_goat_cabbage_rules, 4),
+            {state.mask for state in bad_states},
+        )
+
+    def test_all_of_matches_pirates_file(self):
+        """Test that the mutiny rule marks exactly the states of piratesBadStates.txt"""
+        bad_states = bad_state_reader(os.path.join(DATA_DIR, "piratesBadStates.txt"))
+        self.assertEqual(
+            self.enumerate_bad_masks(self.pirates_rules, 9),
+            {state.mask for state in bad_states},
+        )
+
+    def test_count_rule_right_side(self):
+        """Test that a count rule can count the items on the right side"""
+        rule = CountRule([1, 2, 3], at_least=2, at_most=2, left=False)
+        self.assertTrue(rule.is_bad(0b0011))
+        self.assertFalse(rule.is_bad(0b0001))
+        self.assertFalse(rule.is_bad(0b1111))
+
+    def test_predicate_rule(self):
+        """Test that a predicate rule is called with the bitmask"""
+        rule = PredicateRule(lambda mask: mask == 0b0101)
+        self.assertTrue(rule(0b0101))
+        self.assertFalse(rule(0b0100))
+
+    def test_game_with_rules(self):
+        """Test that a game with rules finds the same path length as a game with enumerated bad states"""
+        game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"), bad_rules=self.wolf_goat_cabbage_rules)
+        game.set_source(State([False, False, False, False]))
+        game.set_target(State([True, True, True, True]))
+
+        for search in (game.bfs, game.bidirectional_bfs, game.astar):
+            path, success = search()
+            self.assertTrue(success)
+            self.assertEqual(len(path), 8)
+            for state in path:
+                self.assertFalse(game.is_bad(state))
+
+    def test_add_bad_rule_marking_source(self):
+        """Test that adding a rule marking the source as bad raises an error"""
+        game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        game.set_source(State([True, False, False, False]))
+        with self.assertRaises(ValueError):
+            game.add_bad_rules([CountRule([0], at_least=1)])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_is_bad_array_matches_is_bad(self):
+        """Test that the vectorized rules agree with the scalar rules"""
+        masks = np.arange(1 << 9, dtype=np.uint64)
+        rules = self.pirates_rules + self.wolf_goat_cabbage_rules + [
+            CountRule([1, 2], at_least=1, left=False),
+            PredicateRule(lambda mask: mask % 3 == 0),
+        ]
+        for rule in rules:
+            expected = [rule.is_bad(mask) for mask in range(1 << 9)]
+            self.assertEqual(rule.is_bad_array(masks).tolist(), expected)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_vectorized_bfs_with_rules(self):
+        """Test that the vectorized search applies the rules"""
+        game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"), bad_rules=self.wolf_goat_cabbage_rules)
+        game.set_source(State([False, False, False, False]))
+        game.set_target(State([True, True, True, True]))
+        path, success = game.vectorized_bfs()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.farmerGame.batch import Instance, find_instances, main, solve_batch, solve_instance
+from src.farmerGame.farmerGame import FarmerGame
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_find_instances_in_directory(self):
+        """Test that data files are paired with the bad-states file sharing their prefix"""
+        instances = {instance.name: instance for instance in find_instances(DATA_DIR)}
+        self.assertEqual(sorted(instances), ["alphabet", "data", "pirates"])
+        self.assertTrue(instances["alphabet"].bad_states_path.endswith("alphabetBadStates.txt"))
+        self.assertTrue(instances["data"].bad_states_path.endswith("badstates.txt"))
+
+    def test_find_instances_in_manifest(self):
+        """Test that a manifest lists instances relative to its own directory"""
+        self.write("gameData.txt", "Farmer Wolf\n0 0\n1 1\n")
+        manifest = self.write("manifest.txt", "# comment\ngameData.txt\n\n")
+        instances = find_instances(manifest)
+        self.assertEqual(len(instances), 1)
+        self.assertEqual(instances[0].name, "gameData")
+        self.assertIsNone(instances[0].bad_states_path)
+        self.assertEqual(solve_instance(instances[0])["steps"], 1)
+
+    def test_solve_batch(self):
+        """Test that the example instances are solved in worker processes and written as JSON Lines"""
+        output = io.StringIO()
+        counts = solve_batch(find_instances(DATA_DIR), output, workers=2, progress=None)
+
+        records = {record["instance"]: record for record in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(counts, {"solved": 3})
+        self.assertEqual(records["data"]["steps"], 7)
+        self.assertEqual(records["pirates"]["steps"], 15)
+        self.assertEqual(records["alphabet"]["steps"], 27)
+        self.assertEqual(records["data"]["path"][0], "0 0 0 0")
+
+    def test_timeout(self):
+        """Test that an instance taking longer than the timeout is reported as such"""
+        n_items = 24
+        data = self.write(
+            "bigData.txt",
+            " ".join(f"Item{i}" for i in range(n_items)) + "\n" + "0 " * n_items + "\n" + "1 " * n_items + "\n",
+        )
+        record = solve_instance(Instance("big", data), timeout=0.05)
+        self.assertEqual(record["status"], "timeout")
+
+    def test_error(self):
+        """Test that an unreadable instance is reported as an error and sets the exit code"""
+        self.write("brokenData.txt", "Farmer Wolf\n0 0\n")
+        output = os.path.join(self.directory.name, "results.jsonl")
+        self.assertEqual(main([self.directory.name, "-o", output, "-q", "-j", "1"]), 1)
+        with open(output) as file:
+            record = json.loads(file.readline())
+        self.assertEqual(record["status"], "error")
+        self.assertIn("ValueError", record["error"])
+
+    @unittest.skipIf(multiprocessing.get_start_method() != "fork", "the patched strategy only reaches forked workers")
+    def test_crashed_worker(self):
+        """Test that a worker dying on one instance is reported for that instance and the others are still solved"""
+        def crash_on_pirates(game):
+            if game.itemNames[0] == "Captain":
+                os._exit(1)
+            return game.bfs()
+
+        output = io.StringIO()
+        with mock.patch.object(FarmerGame, "crash_on_pirates", crash_on_pirates, create=True):
+            counts = solve_batch(
+                find_instances(DATA_DIR), output, strategy="crash_on_pirates", workers=2, progress=None
+            )
+
+        records = {record["instance"]: record for record in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(counts, {"solved": 2, "error": 1})
+        self.assertEqual(sorted(records), ["alphabet", "data", "pirates"])
+        self.assertEqual(records["pirates"]["status"], "error")
+        self.assertIn("BrokenProcessPool", records["pirates"]["error"])
+        self.assertEqual(records["alphabet"]["steps"], 27)
+
+
+if __name__ == "__main__":
+    unittest.main()
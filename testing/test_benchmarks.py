@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+from benchmarks.families import alphabet_game, pirates_game
+from benchmarks.run import compare, main, run
+from src.farmerGame.dataReader import bad_state_reader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_alphabet_family_matches_example(self):
+        """Test that the alphabet family reproduces the bad states of the example at its size"""
+        game = alphabet_game(5, 5, 5)
+        expected = {state.mask for state in bad_state_reader(os.path.join(DATA_DIR, "alphabetBadStates.txt"))}
+        self.assertEqual({state.mask for state in game.badStates}, expected)
+        self.assertEqual(len(game.bfs()[0]) - 1, 27)
+
+    def test_pirates_family(self):
+        """Test that the pirates family marks a mutiny as bad and can be solved"""
+        game = pirates_game(3, 5)
+        self.assertEqual(len(game.itemNames), 9)
+        for state in game.badStates:
+            items_left = state.items_left
+            self.assertTrue(items_left[0])
+            self.assertLess(sum(items_left[4:]), sum(items_left[1:4]))
+        self.assertTrue(game.bfs()[1])
+
+    def test_run_and_compare(self):
+        """Test that a run records every strategy and that a second run can be compared to the saved results"""
+        results = run(["pirates"], ["bfs", "astar"], [(2, 2)], repeat=1, progress=None)
+        self.assertEqual([record["strategy"] for record in results], ["bfs", "astar"])
+        for record in results:
+            self.assertTrue(record["success"])
+            self.assertGreater(record["states_expanded"], 0)
+            self.assertGreater(record["peak_bytes"], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            main(
+                ["--family", "pirates", "--strategy", "bfs", "--size", "2,2", "--repeat", "1", "-o", output, "--quiet"]
+            )
+            with open(output, "r") as file:
+                saved = json.load(file)
+        self.assertEqual(saved["results"][0]["steps"], results[0]["steps"])
+        self.assertEqual(len(compare(saved["results"], results)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from src.farmerGame.binaryFormat import (
+    CHUNK_SIZE,
+    convert_text_instance,
+    load_instance,
+    write_instance,
+)
+from src.farmerGame.dataReader import bad_state_reader, game_reader
+from src.farmerGame.state import State
+from src.farmerGame.stateSet import SortedMaskArray, StateBitSet
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "instance.fgb")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that every example instance survives a conversion in every encoding"""
+        examples = [
+            ("data.txt", "badstates.txt"),
+            ("alphabetData.txt", "alphabetBadStates.txt"),
+            ("piratesData.txt", "piratesBadStates.txt"),
+        ]
+        for data, bad_states in examples:
+            text_game = game_reader(os.path.join(DATA_DIR, data))
+            bad_masks = {state.mask for state in bad_state_reader(os.path.join(DATA_DIR, bad_states))}
+            for encoding, container in (("sorted", SortedMaskArray), ("dense", StateBitSet)):
+                convert_text_instance(
+                    os.path.join(DATA_DIR, data), os.path.join(DATA_DIR, bad_states), self.path, encoding
+                )
+                game = load_instance(self.path)
+                self.assertEqual(game.itemNames, text_game.itemNames)
+                self.assertEqual(game.source, text_game.source)
+                self.assertEqual(game.target, text_game.target)
+                masks = game.badRules[0].masks
+                self.assertIsInstance(masks, container)
+                self.assertEqual(set(masks), bad_masks)
+                self.assertEqual(len(masks), len(bad_masks))
+
+    def test_loaded_game_is_solved(self):
+        """Test that a loaded game avoids the bad states stored in the file"""
+        convert_text_instance(
+            os.path.join(DATA_DIR, "data.txt"), os.path.join(DATA_DIR, "badstates.txt"), self.path
+        )
+        game = load_instance(self.path)
+        path, success = game.bfs()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 8)
+        self.assertTrue(game.is_bad(State([False, True, True, False])))
+
+    def test_presorted_stream(self):
+        """Test that a presorted stream of masks larger than a chunk is written without sorting"""
+        masks = range(3, 4 * CHUNK_SIZE, 3)
+        write_instance(self.path, tuple(f"Item{i}" for i in range(20)), 0, (1 << 20) - 1, iter(masks), "sorted", True)
+        stored = load_instance(self.path).badRules[0].masks
+        self.assertEqual(len(stored), len(masks))
+        self.assertIn(3 * 1000, stored)
+        self.assertNotIn(3 * 1000 + 1, stored)
+
+    def test_presorted_stream_out_of_order(self):
+        """Test that a presorted stream that is not increasing is rejected"""
+        with self.assertRaises(ValueError):
+            write_instance(self.path, ("Farmer", "Wolf"), 0, 3, iter([2, 1]), "sorted", True)
+
+    def test_not_an_instance(self):
+        """Test that a file without the magic bytes is rejected"""
+        with open(self.path, "wb") as file:
+            file.write(bytes(64))
+        with self.assertRaises(ValueError):
+            load_instance(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import heapq
+import random
+import unittest
+from src.farmerGame.bucketQueue import BucketQueue
+
+
+class TestBucketQueue(unittest.TestCase):
+
+    def test_pops_in_order_of_priority(self):
+        """Test that a Dijkstra-like sequence of pushes and pops matches a binary heap"""
+        rng = random.Random(1)
+        for max_step in (0, 1, 5):
+            queue = BucketQueue(max_step)
+            heap = []
+            current = 0
+            for _ in range(500):
+                if heap and rng.random() < 0.5:
+                    priority, item = queue.pop()
+                    self.assertEqual(priority, heapq.heappop(heap)[0])
+                    current = priority
+                else:
+                    priority = current + rng.randint(0, max_step)
+                    queue.push(priority, len(heap))
+                    heapq.heappush(heap, (priority, len(heap)))
+                self.assertEqual(len(queue), len(heap))
+
+    def test_ring_wraps_around(self):
+        """Test that priorities beyond the number of buckets are popped in order"""
+        queue = BucketQueue(2)
+        queue.push(0, 10)
+        self.assertEqual(queue.pop(), (0, 10))
+        queue.push(2, 20)
+        queue.push(1, 11)
+        self.assertEqual(queue.pop(), (1, 11))
+        queue.push(3, 30)
+        self.assertEqual([queue.pop(), queue.pop()], [(2, 20), (3, 30)])
+
+    def test_invalid_use(self):
+        """Test that priorities out of range, negative steps and popping an empty queue raise"""
+        queue = BucketQueue(3)
+        with self.assertRaises(ValueError):
+            queue.push(4, 0)
+        with self.assertRaises(IndexError):
+            queue.pop()
+        with self.assertRaises(ValueError):
+            BucketQueue(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
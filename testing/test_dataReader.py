@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from src.farmerGame.badStateRules import ContainerRule
+from src.farmerGame.dataReader import (
+    bad_state_array_reader,
+    bad_state_bitset_reader,
+    bad_state_reader,
+    game_reader,
+    iter_bad_state_masks,
+    np,
+)
+from src.farmerGame.state import State
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestDataReader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.bad_states_path = os.path.join(DATA_DIR, "badstates.txt")
+        self.expected_masks = {0b0110, 0b1110, 0b1100, 0b1001, 0b0001, 0b0011}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        path = os.path.join(self.directory.name, "file.txt")
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_game_reader(self):
+        """Test that the game file is read, ignoring anything after the third line"""
+        game = game_reader(os.path.join(DATA_DIR, "data.txt"))
+        self.assertEqual(game.itemNames, ("Farmer", "Wolf", "Goat", "Cabbage"))
+        self.assertEqual(game.source, State([False] * 4))
+        self.assertEqual(game.target, State([True] * 4))
+
+    def test_game_reader_wrong_width(self):
+        """Test that a source without a value for every item is rejected"""
+        path = self.write("Farmer Wolf\n0 0 0\n1 1\n")
+        with self.assertRaises(ValueError):
+            game_reader(path)
+
+    def test_game_reader_missing_target(self):
+        """Test that a game file without a target is rejected"""
+        path = self.write("Farmer Wolf\n0 0\n")
+        with self.assertRaises(ValueError):
+            game_reader(path)
+
+    def test_bad_state_reader(self):
+        """Test that the bad states are read and trailing content is ignored"""
+        bad_states = bad_state_reader(self.bad_states_path)
+        self.assertEqual({state.mask for state in bad_states}, self.expected_masks)
+        self.assertIn(State([False, True, True, False]), bad_states)
+
+    def test_iter_bad_state_masks(self):
+        """Test that the bad states are streamed as masks in file order"""
+        self.assertEqual(
+            list(iter_bad_state_masks(self.bad_states_path)),
+            [0b0110, 0b1110, 0b1100, 0b1001, 0b0001, 0b0011],
+        )
+
+    def test_declared_count_too_large(self):
+        """Test that a file with fewer states than declared is rejected"""
+        path = self.write("3\n0 1\n1 0\n")
+        with self.assertRaises(ValueError):
+            bad_state_reader(path)
+
+    def test_inconsistent_width(self):
+        """Test that rows of different widths are rejected"""
+        path = self.write("2\n0 1\n1 0 1\n")
+        with self.assertRaises(ValueError):
+            bad_state_reader(path)
+        with self.assertRaises(ValueError):
+            list(iter_bad_state_masks(self.bad_states_path, n_items=5))
+
+    def test_invalid_values(self):
+        """Test that values other than 0 and 1 are rejected"""
+        for content in ("1\n0 2\n", "1\n01 1\n", "x\n0 1\n"):
+            with self.assertRaises(ValueError):
+                bad_state_reader(self.write(content))
+
+    def test_bitset_reader(self):
+        """Test that the bad states can be streamed straight into a bitset"""
+        bad_states = bad_state_bitset_reader(self.bad_states_path)
+        self.assertEqual(set(bad_states), self.expected_masks)
+        self.assertEqual(bad_states.n_items, 4)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array_reader(self):
+        """Test that the bad states can be streamed straight into a sorted array"""
+        bad_states = bad_state_array_reader(self.bad_states_path)
+        self.assertEqual(bad_states.tolist(), sorted(self.expected_masks))
+
+    def test_container_rule(self):
+        """Test that bad states read in bulk can be used by a game through a rule"""
+        game = game_reader(os.path.join(DATA_DIR, "data.txt"))
+        game.add_bad_rules([ContainerRule(bad_state_bitset_reader(self.bad_states_path))])
+        path, success = game.bfs()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 8)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_container_rule_arrays(self):
+        """Test that the vectorized lookups of a container rule agree with the scalar ones"""
+        masks = np.arange(16, dtype=np.uint64)
+        for container in (
+            bad_state_bitset_reader(self.bad_states_path),
+            bad_state_array_reader(self.bad_states_path),
+            frozenset(self.expected_masks),
+        ):
+            rule = ContainerRule(container)
+            expected = [mask in self.expected_masks for mask in range(16)]
+            self.assertEqual(rule.is_bad_array(masks).tolist(), expected)
+            self.assertEqual([rule.is_bad(mask) for mask in range(16)], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
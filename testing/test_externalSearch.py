@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from src.farmerGame.externalSearch import _read_masks, _subtract, _write_masks, external_bfs
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.state import State
+
+
+class TestExternalSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        self.game.set_source(State([False, False, False, False]))
+        self.game.set_target(State([True, True, True, True]))
+
+    def test_masks_round_trip(self):
+        """Test that masks written to a file are streamed back in order, across chunk boundaries"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "masks.bin")
+            masks = list(range(0, 2 ** 64 - 1, 2 ** 58))
+            self.assertEqual(_write_masks(path, masks, chunk_size=5), len(masks))
+            self.assertEqual(list(_read_masks(path, chunk_size=3)), masks)
+
+    def test_subtract(self):
+        """Test that the streaming difference keeps the masks missing from the second stream"""
+        self.assertEqual(list(_subtract([1, 3, 4, 7, 9], [0, 3, 5, 7, 8])), [1, 4, 9])
+        self.assertEqual(list(_subtract([1, 2], [])), [1, 2])
+
+    def test_matches_bfs(self):
+        """Test that the external search finds a valid shortest path, also when every layer is spilled in runs"""
+        self.game.add_bad_states(
+            [
+                State([False, True, True, False]),
+                State([False, True, True, True]),
+                State([False, False, True, True]),
+                State([True, False, False, True]),
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+            ]
+        )
+        path, _ = self.game.bfs()
+        for memory_limit in (1, 2, 1000):
+            external_path, success = self.game.external_bfs(memory_limit=memory_limit)
+            self.assertTrue(success)
+            self.assertEqual(len(external_path), len(path))
+            for curr, next_state in zip(external_path, external_path[1:]):
+                self.assertIn(next_state, curr.get_neighbours())
+                self.assertNotIn(next_state, self.game.badStates)
+                self.assertIs(next_state.prev, curr)
+
+    def test_capacity(self):
+        """Test that the external search uses the crossings of a larger boat"""
+        path, expanded = external_bfs(7, 0, 2 ** 7 - 1, capacity=2, memory_limit=16)
+        self.assertEqual(len(path) - 1, 5)
+        self.assertGreater(expanded, 0)
+
+    def test_source_is_target(self):
+        """Test that a search from the target to itself returns a path of one state"""
+        self.assertEqual(external_bfs(4, 0b1111, 0b1111), ([0b1111], 0))
+
+    def test_no_solution_removes_files(self):
+        """Test that an unreachable target is reported and that the layer files are removed"""
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(self.game.external_bfs(directory=directory), ([], False))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_too_many_items(self):
+        """Test that games with more items than fit in a 64-bit mask are rejected"""
+        with self.assertRaises(ValueError):
+            external_bfs(65, 0, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
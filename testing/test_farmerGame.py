@@ -1,4 +1,6 @@
 import unittest
+from itertools import product
+from unittest import mock
 from src.farmerGame.farmerGame import FarmerGame
 from src.farmerGame.state import State
 
@@ -102,6 +104,436 @@ class TestFarmerGame(unittest.TestCase):
         path, success = self.game.bfs(print_actions=True)
         self.assertTrue(success)
 
+    def test_bidirectional_bfs_matches_bfs(self):
+        """Test that the bidirectional BFS finds a path as short as the BFS."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+
+        path, success = self.game.bfs()
+        bi_path, bi_success = self.game.bidirectional_bfs()
+
+        self.assertTrue(bi_success)
+        self.assertEqual(len(bi_path), len(path))
+        self.assertEqual(bi_path[0], self.initial_state)
+        self.assertEqual(bi_path[-1], self.target_state)
+        self.assert_valid_path(bi_path)
+
+    def test_bidirectional_bfs_expands_fewer_states(self):
+        """Test that the bidirectional BFS expands fewer states than the BFS on a larger game."""
+        n_items = 12
+        game = FarmerGame(tuple(f"Item{i}" for i in range(n_items)))
+        game.set_source(State([False] * n_items))
+        game.set_target(State([True] * n_items))
+
+        path, _ = game.bfs()
+        bfs_expanded = game.states_expanded
+        bi_path, success = game.bidirectional_bfs()
+
+        self.assertTrue(success)
+        self.assertEqual(len(bi_path), len(path))
+        self.assertLess(game.states_expanded, bfs_expanded)
+
+    def test_bidirectional_bfs_no_solution(self):
+        """Test that the bidirectional BFS returns no solution when blocked by bad states."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+
+        self.assertEqual(self.game.bidirectional_bfs(), ([], False))
+
+    def test_astar_finds_optimal_path(self):
+        """Test that A* finds a path as short as the BFS and reports the expanded states."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+
+        path, _ = self.game.bfs()
+        astar_path, success = self.game.astar()
+
+        self.assertTrue(success)
+        self.assertEqual(len(astar_path), len(path))
+        self.assert_valid_path(astar_path)
+        self.assertGreater(self.game.states_expanded, 0)
+
+    def test_astar_custom_heuristic(self):
+        """Test that A* accepts a custom heuristic."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+
+        path, success = self.game.astar(heuristic=lambda state, target: 0)
+
+        self.assertTrue(success)
+        self.assertEqual(len(path), 6)
+
+    def test_astar_no_solution(self):
+        """Test that A* returns no solution when blocked by bad states."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+
+        self.assertEqual(self.game.astar(), ([], False))
+
+    def test_compact_bfs_matches_bfs(self):
+        """Test that the compact BFS rebuilds a valid path as short as the BFS."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+
+        path, _ = self.game.bfs()
+        compact_path, success = self.game.compact_bfs()
+
+        self.assertTrue(success)
+        self.assertEqual(compact_path, path)
+        self.assertIsNone(compact_path[0].prev)
+        for curr, next_state in zip(compact_path, compact_path[1:]):
+            self.assertIs(next_state.prev, curr)
+
+    def test_compact_bfs_no_solution(self):
+        """Test that the compact BFS returns no solution when blocked by bad states."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+
+        self.assertEqual(self.game.compact_bfs(), ([], False))
+
+    def test_capacity(self):
+        """Test that all searches agree on the shortest path when the boat carries two items."""
+        n_items = 7
+        game = FarmerGame(tuple(f"Item{i}" for i in range(n_items)), capacity=2)
+        game.set_source(State([False] * n_items))
+        game.set_target(State([True] * n_items))
+
+        for search in (game.bfs, game.compact_bfs, game.bidirectional_bfs, game.astar):
+            path, success = search()
+            self.assertTrue(success)
+            # six items need three trips over and two trips back
+            self.assertEqual(len(path) - 1, 5)
+            for curr, next_state in zip(path, path[1:]):
+                self.assertIn(next_state, curr.get_neighbours(capacity=2))
+
+    def test_invalid_capacity(self):
+        """Test that a boat without room for an item is rejected."""
+        with self.assertRaises(ValueError):
+            FarmerGame(self.item_names, capacity=0)
+
+    def test_path_from_every_source(self):
+        """Test that the precomputed tree answers a query from every state as well as the BFS."""
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.game.precompute()
+
+        for values in product([False, True], repeat=4):
+            source = State(list(values))
+            if self.game.is_bad(source):
+                continue
+            self.game.set_source(source)
+            path, success = self.game.bfs()
+            tree_path, tree_success = self.game.path_from(source)
+
+            self.assertEqual(tree_success, success)
+            self.assertEqual(len(tree_path), len(path))
+            self.assertEqual(self.game.distance_to_target(), len(path) - 1 if success else None)
+            if success:
+                self.assertEqual(tree_path[0], source)
+                self.assertEqual(tree_path[-1], self.target_state)
+                self.assert_valid_path(tree_path)
+
+    def test_path_from_after_new_bad_states(self):
+        """Test that adding bad states drops the precomputed tree."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.assertEqual(self.game.distance_to_target(), 5)
+
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+
+        path, success = self.game.path_from()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 8)
+
+    def test_solve_many_snapshots_bad_states_once(self):
+        """Test that all searches of a batch share one bad-state check."""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        states = [State(list(values)) for values in product([False, True], repeat=4)]
+        pairs = [(source, target) for source in states for target in states if source != target]
+        with mock.patch.object(FarmerGame, "bad_state_checker", wraps=self.game.bad_state_checker) as checker:
+            results = dict(self.game.solve_many(pairs))
+        self.assertEqual(len(results), len(pairs))
+        self.assertEqual(checker.call_count, 1)
+
+    def test_solve_many(self):
+        """Test that a batch of queries is answered like separate BFS runs, without touching source and target."""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        states = [State(list(values)) for values in product([False, True], repeat=4)]
+        pairs = list(product(states, [self.target_state, self.initial_state])) + [
+            (self.initial_state, states[5])
+        ]
+
+        results = dict(self.game.solve_many(pairs))
+
+        self.assertEqual(sorted(results), list(range(len(pairs))))
+        self.assertIsNone(self.game.source)
+        self.assertIsNone(self.game.target)
+        for index, (source, target) in enumerate(pairs):
+            path, success = results[index]
+            if self.game.is_bad(source) or self.game.is_bad(target):
+                self.assertEqual((path, success), ([], False))
+                continue
+            self.game.set_source(source)
+            self.game.set_target(target)
+            expected_path, expected_success = self.game.bfs()
+            self.assertEqual(success, expected_success)
+            self.assertEqual(len(path), len(expected_path))
+            if success:
+                self.assertEqual(path[0], source)
+                self.assertEqual(path[-1], target)
+                self.assert_valid_path(path)
+
+    def test_components_match_bfs(self):
+        """Test that two states share a component exactly when the BFS finds a path between them."""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.assertEqual(self.game.label_components(), 1)
+        states = [State(list(values)) for values in product([False, True], repeat=4)]
+        for source, target in product(states, repeat=2):
+            if self.game.is_bad(source) or self.game.is_bad(target):
+                self.assertFalse(self.game.is_reachable(source, target))
+                continue
+            self.game.set_source(source)
+            self.game.set_target(target)
+            self.assertEqual(self.game.is_reachable(), self.game.bfs()[1])
+
+    def test_bfs_skips_unreachable_target(self):
+        """Test that the BFS gives up without expanding states when the labels separate source and target."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        self.assertFalse(self.game.is_reachable())
+        self.assertEqual(self.game.bfs(), ([], False))
+        self.assertEqual(self.game.states_expanded, 0)
+
+    def test_direct_changes_drop_cached_results(self):
+        """Test that changing the capacity or the bad states directly drops the labels and the precomputed tree."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        self.assertFalse(self.game.is_reachable())
+        self.game.capacity = 3
+        path, success = self.game.bfs()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 2)
+
+        self.game.capacity = 1
+        self.assertEqual(self.game.path_from(), ([], False))
+        self.game.badStates.clear()
+        path, success = self.game.path_from()
+        self.assertTrue(success)
+        self.assertEqual(len(path), 6)
+
+    def test_components_after_new_bad_states(self):
+        """Test that adding bad states drops the labels, while changing the target keeps them."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.assertTrue(self.game.is_reachable())
+        self.game.set_target(State([True, True, False, False]))
+        self.assertIsNotNone(self.game._components)
+
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states([State([True, False, False, False]), State([True, True, False, False])])
+        self.game.add_bad_states([State([True, False, True, False]), State([True, False, False, True])])
+        self.assertIsNone(self.game._components)
+        self.assertFalse(self.game.is_reachable())
+
+    def test_ida_star_matches_bfs(self):
+        """Test that IDA* finds a path as short as the BFS between every pair of states, also with a tiny table."""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        states = [State(list(values)) for values in product([False, True], repeat=4)]
+        for source, target in product(states, repeat=2):
+            if self.game.is_bad(source) or self.game.is_bad(target):
+                continue
+            self.game.set_source(source)
+            self.game.set_target(target)
+            path, _ = self.game.bfs()
+            for table_size in (0, 1 << 20):
+                ida_path, success = self.game.ida_star(table_size=table_size)
+                self.assertTrue(success)
+                self.assertEqual(len(ida_path), len(path))
+                self.assertEqual(ida_path[0], source)
+                self.assertEqual(ida_path[-1], target)
+                self.assert_valid_path(ida_path)
+
+    def test_ida_star_no_solution(self):
+        """Test that IDA* proves that no solution exists, or gives up at the maximum depth."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states([State([True, False, False, False]), State([True, True, False, False])])
+        self.assertEqual(self.game.ida_star(max_depth=4), ([], False))
+        self.assertTrue(self.game.ida_star(max_depth=5)[1])
+
+        self.game.add_bad_states([State([True, False, True, False]), State([True, False, False, True])])
+        self.assertEqual(self.game.ida_star(), ([], False))
+
+    def test_optimal_paths(self):
+        """Test that both solutions of the puzzle are counted and generated, each once and each optimal."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+
+        self.assertEqual(self.game.count_optimal_paths(), 2)
+        paths = list(self.game.optimal_paths())
+        self.assertEqual(len(paths), 2)
+        self.assertNotEqual([state.mask for state in paths[0]], [state.mask for state in paths[1]])
+        for path in paths:
+            self.assertEqual(len(path), 8)
+            self.assertEqual(path[0], self.initial_state)
+            self.assertEqual(path[-1], self.target_state)
+            self.assert_valid_path(path)
+            for curr, next_state in zip(path, path[1:]):
+                self.assertIs(next_state.prev, curr)
+        self.assertEqual(len(list(self.game.optimal_paths(limit=1))), 1)
+
+    def test_count_optimal_paths_without_enumerating(self):
+        """Test that a number of paths far too large to enumerate is counted, and that the generator stays lazy."""
+        n_items = 16
+        game = FarmerGame(tuple(f"Item{i}" for i in range(n_items)))
+        game.set_source(State([False] * n_items))
+        game.set_target(State([True] * n_items))
+
+        count = game.count_optimal_paths()
+        self.assertGreater(count, 10 ** 12)
+        paths = game.optimal_paths()
+        first = next(paths)
+        self.assertEqual(len(first), len(game.bfs()[0]))
+        self.assertEqual(len(list(game.optimal_paths(limit=5))), 5)
+
+    def test_optimal_paths_no_solution(self):
+        """Test that an unreachable target has no optimal paths."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        self.assertEqual(self.game.count_optimal_paths(), 0)
+        self.assertEqual(list(self.game.optimal_paths()), [])
+
+    def test_dijkstra_unit_costs_match_bfs(self):
+        """Test that with the default costs dijkstra finds a path as short as bfs."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        path, found = self.game.dijkstra()
+        self.assertTrue(found)
+        self.assert_valid_path(path)
+        self.assertEqual(len(path), len(self.game.bfs()[0]))
+        self.assertEqual(self.game.path_cost(path), len(path) - 1)
+
+    def test_dijkstra_weighted_costs(self):
+        """Test that dijkstra minimises the cost of the crossings instead of their number."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        # the goat crosses three times in every solution
+        self.game.set_crossing_costs({"Goat": 5})
+        path, found = self.game.dijkstra()
+        self.assertTrue(found)
+        self.assert_valid_path(path)
+        self.assertEqual(self.game.path_cost(path), 3 * 5 + 4)
+
+        self.game.set_crossing_costs({"Farmer": 2, "Goat": 1}, mode="sum")
+        path, found = self.game.dijkstra()
+        self.assertEqual(self.game.path_cost(path), 7 * 2 + 5)
+
+    def test_dijkstra_combines_passenger_costs(self):
+        """Test that the cost of a crossing combines the farmer and the items in the boat in either mode."""
+        game = FarmerGame(("Farmer", "Cow", "Chicken"), capacity=2)
+        game.set_source(State([False, False, False]))
+        game.set_target(State([True, True, True]))
+        # taking both at once costs 5, one at a time costs 3 + 1 + 3
+        game.set_crossing_costs({"Cow": 2, "Chicken": 2}, mode="sum")
+        path, found = game.dijkstra()
+        self.assertTrue(found)
+        self.assertEqual((len(path), game.path_cost(path)), (2, 5))
+        game.set_crossing_costs({"Cow": 4}, mode="max")
+        path, found = game.dijkstra()
+        self.assertEqual((len(path), game.path_cost(path)), (2, 4))
+
+    def test_dijkstra_no_solution(self):
+        """Test that dijkstra reports an unreachable target."""
+        self.game.set_source(self.initial_state)
+        self.game.set_target(self.target_state)
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        self.assertEqual(self.game.dijkstra(), ([], False))
+
+    def test_set_crossing_costs_invalid(self):
+        """Test that unknown items, invalid costs and unknown modes raise a ValueError."""
+        for costs, mode in (({"Horse": 1}, "max"), ({"Goat": -1}, "max"), ({"Goat": 1.5}, "sum"), ({}, "min")):
+            with self.assertRaises(ValueError):
+                self.game.set_crossing_costs(costs, mode)
+        self.assertEqual(self.game.crossing_costs, [1, 1, 1, 1])
+        self.assertEqual(self.game.cost_mode, "max")
+
+    @staticmethod
+    def wolf_goat_cabbage_bad_states():
+        return [
+            State([False, True, True, False]),
+            State([False, True, True, True]),
+            State([False, False, True, True]),
+            State([True, False, False, True]),
+            State([True, False, False, False]),
+            State([True, True, False, False]),
+        ]
+
+    def assert_valid_path(self, path):
+        for curr, next_state in zip(path, path[1:]):
+            self.assertIn(next_state, curr.get_neighbours())
+            self.assertNotIn(next_state, self.game.badStates)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.farmerGame import generators
+from src.farmerGame.binaryFormat import load_instance, write_instance
+from src.farmerGame.dataReader import bad_state_reader, game_reader, iter_bad_state_masks
+from src.farmerGame.generators import alphabet_instance, main, pirates_instance
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def brute_force_pirates(n_pirates, n_gold, counted_gold):
+    bad_masks = []
+    for mask in range(1 << (1 + n_pirates + n_gold)):
+        pirates_left = bin((mask >> 1) & ((1 << n_pirates) - 1)).count("1")
+        gold_left = bin((mask >> (n_pirates + 1)) & ((1 << counted_gold) - 1)).count("1")
+        if mask & 1 and pirates_left >= 2 and gold_left < pirates_left:
+            bad_masks.append(mask)
+    return bad_masks
+
+
+class TestGenerators(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.directory.name, "data.txt")
+        self.bad_states_path = os.path.join(self.directory.name, "badStates.txt")
+        self.binary_path = os.path.join(self.directory.name, "instance.fgb")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pirates_match_brute_force(self):
+        """Test that the pirates bad states and their count match a check of every state, with and without numpy"""
+        for numpy in (generators.np, None):
+            with mock.patch.object(generators, "np", numpy), mock.patch.object(generators, "CHUNK_SIZE", 8):
+                for n_pirates in range(4):
+                    for n_gold in range(4):
+                        for counted_gold in range(n_gold + 1):
+                            instance = pirates_instance(n_pirates, n_gold, counted_gold)
+                            expected = brute_force_pirates(n_pirates, n_gold, counted_gold)
+                            self.assertEqual(list(instance.bad_masks()), expected)
+                            self.assertEqual(instance.n_bad_states, len(expected))
+
+    def test_alphabet_sorted_and_counted(self):
+        """Test that the alphabet bad states are increasing, counted and the same with and without numpy"""
+        for n_consonants, n_vowels, n_symbols in ((1, 2, 2), (2, 1, 3), (4, 3, 2)):
+            results = []
+            for numpy in (generators.np, None):
+                with mock.patch.object(generators, "np", numpy), mock.patch.object(generators, "CHUNK_SIZE", 5):
+                    instance = alphabet_instance(n_consonants, n_vowels, n_symbols)
+                    results.append(list(instance.bad_masks()))
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], sorted(set(results[0])))
+            self.assertEqual(len(results[0]), instance.n_bad_states)
+
+    def test_reproduces_data_examples(self):
+        """Test that the generated text files hold the example games in the data directory"""
+        examples = [
+            (pirates_instance(3, 5, counted_gold=4), "piratesData.txt", "piratesBadStates.txt"),
+            (
+                alphabet_instance(5, 5, 5, item_names=tuple("bcdfgaeiou!@#$%")),
+                "alphabetData.txt",
+                "alphabetBadStates.txt",
+            ),
+        ]
+        for instance, data, bad_states in examples:
+            instance.write_text(self.data_path, self.bad_states_path)
+            with open(self.data_path) as generated, open(os.path.join(DATA_DIR, data)) as original:
+                self.assertEqual(generated.read(), original.read())
+            self.assertEqual(
+                bad_state_reader(self.bad_states_path), bad_state_reader(os.path.join(DATA_DIR, bad_states))
+            )
+
+    def test_binary_round_trip(self):
+        """Test that a game written in chunks to the binary format loads with the same bad states as the text files"""
+        with mock.patch.object(generators, "CHUNK_SIZE", 16):
+            instance = pirates_instance(3, 4)
+            instance.write_binary(self.binary_path)
+            instance.write_text(self.data_path, self.bad_states_path)
+        game = load_instance(self.binary_path)
+        text_game = game_reader(self.data_path)
+        self.assertEqual(game.itemNames, text_game.itemNames)
+        self.assertEqual(game.source, text_game.source)
+        self.assertEqual(game.target, text_game.target)
+        self.assertEqual(list(game.badRules[0].masks), list(iter_bad_state_masks(self.bad_states_path)))
+        self.assertTrue(game.bfs()[1])
+
+    def test_chunks_must_increase(self):
+        """Test that chunks that are not strictly increasing are rejected"""
+        for chunks in ([[1, 2], [2, 3]], [[1, 3, 2]]):
+            with self.assertRaises(ValueError):
+                write_instance(self.binary_path, ("a", "b"), 0, 3, chunks, encoding="sorted", chunked=True)
+        with self.assertRaises(ValueError):
+            write_instance(self.binary_path, ("a", "b"), 0, 3, [[1]], encoding="auto", chunked=True)
+
+    def test_invalid_parameters(self):
+        """Test that impossible family parameters raise a ValueError"""
+        with self.assertRaises(ValueError):
+            pirates_instance(2, 3, counted_gold=4)
+        with self.assertRaises(ValueError):
+            alphabet_instance(2, 2, 2, item_names=("a", "b"))
+
+    def test_main_writes_both_formats(self):
+        """Test that the command line writes the text and binary files"""
+        main(["alphabet", "2", "2", "2", "--binary", self.binary_path, "--text", self.data_path, self.bad_states_path])
+        self.assertEqual(len(load_instance(self.binary_path).badRules[0].masks), 8)
+        self.assertEqual(len(bad_state_reader(self.bad_states_path)), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from itertools import product
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.heuristics import misplaced_items_heuristic, zero_heuristic
+from src.farmerGame.state import State
+
+
+class TestHeuristics(unittest.TestCase):
+
+    def setUp(self):
+        self.target_state = State([True, True, True, True])
+
+    def test_zero_heuristic(self):
+        """Test that the zero heuristic never estimates any crossings"""
+        self.assertEqual(zero_heuristic(State([False] * 4), self.target_state), 0)
+
+    def test_misplaced_items_round_trips(self):
+        """Test that the estimate accounts for the farmer rowing back for every item but the last"""
+        self.assertEqual(misplaced_items_heuristic(State([False] * 4), self.target_state), 5)
+        self.assertEqual(misplaced_items_heuristic(State([True, True, True, False]), self.target_state), 2)
+        self.assertEqual(misplaced_items_heuristic(State([False, True, True, True]), self.target_state), 1)
+        self.assertEqual(misplaced_items_heuristic(self.target_state, self.target_state), 0)
+
+    def test_misplaced_items_capacity(self):
+        """Test that a larger boat lowers the estimate"""
+        source = State([False] * 5)
+        target = State([True] * 5)
+        self.assertEqual(misplaced_items_heuristic(source, target, capacity=2), 3)
+
+    def test_misplaced_items_admissible(self):
+        """Test that the estimate never exceeds the true distance for any pair of states"""
+        game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        states = [State(list(values)) for values in product([False, True], repeat=4)]
+        for source, target in product(states, repeat=2):
+            game.set_source(source)
+            game.set_target(target)
+            path, success = game.bfs()
+            self.assertTrue(success)
+            self.assertLessEqual(misplaced_items_heuristic(source, target), len(path) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
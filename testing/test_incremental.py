@@ -0,0 +1,155 @@
+import random
+import unittest
+from src.farmerGame.badStateRules import PredicateRule
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.incremental import IncrementalTree
+from src.farmerGame.state import State
+
+
+class TestIncrementalTree(unittest.TestCase):
+
+    def assert_matches_rebuild(self, tree, is_bad):
+        """Checks that a repaired tree has the distances of a fresh build and consistent parents and children"""
+        fresh = IncrementalTree(tree.n_items, tree.capacity, tree.root)
+        fresh.build(is_bad)
+        self.assertEqual(tree.distance, fresh.distance)
+        self.assertEqual(set(tree.children), set(tree.distance))
+        for mask, parent in tree.parent.items():
+            if mask != tree.root:
+                self.assertIn(mask, tree.children[parent])
+                self.assertIn(parent, State.neighbour_masks(mask, tree.n_items, tree.capacity))
+                self.assertEqual(tree.distance[parent] + 1, tree.distance[mask])
+
+    def test_build_reaches_all_states_without_bad_states(self):
+        """Test that without bad states every state is reached and the root is its own parent"""
+        tree = IncrementalTree(4, 1, 0b1111)
+        tree.build(lambda mask: False)
+        self.assertEqual(len(tree.distance), 2 ** 4)
+        self.assertEqual(tree.touched, 2 ** 4)
+        self.assertEqual(tree.path_to(0b1111), [0b1111])
+        self.assertEqual(len(tree.path_to(0)), 6)
+
+    def test_random_repairs_match_rebuild(self):
+        """Test that after random additions and removals of bad states the tree equals a fresh build"""
+        rng = random.Random(3)
+        for _ in range(40):
+            n_items = rng.randint(2, 6)
+            capacity = rng.randint(1, 2)
+            root = (1 << n_items) - 1
+            bad = set()
+            tree = IncrementalTree(n_items, capacity, root)
+            tree.build(bad.__contains__)
+            for _ in range(8):
+                if bad and rng.random() < 0.4:
+                    removed = rng.sample(sorted(bad), rng.randint(1, len(bad)))
+                    bad.difference_update(removed)
+                    tree.remove_bad(removed, bad.__contains__)
+                else:
+                    added = rng.sample(range(root), rng.randint(1, 3))
+                    bad.update(added)
+                    tree.add_bad(added, bad.__contains__)
+                self.assert_matches_rebuild(tree, bad.__contains__)
+
+    def test_root_cannot_become_bad(self):
+        """Test that making the root bad raises a ValueError"""
+        tree = IncrementalTree(3, 1, 0b111)
+        tree.build(lambda mask: False)
+        with self.assertRaises(ValueError):
+            tree.add_bad([0b111], lambda mask: mask == 0b111)
+
+
+class TestIncrementalSolve(unittest.TestCase):
+
+    def setUp(self):
+        self.game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        self.game.set_source(State([True, True, True, True]))
+        self.game.set_target(State([False, False, False, False]))
+
+    @staticmethod
+    def wolf_goat_cabbage_bad_states():
+        return [
+            State([False, True, True, False]),
+            State([False, True, True, True]),
+            State([False, False, True, True]),
+            State([True, False, False, True]),
+            State([True, False, False, False]),
+            State([True, True, False, False]),
+        ]
+
+    def test_add_bad_states_repairs_tree(self):
+        """Test that adding bad states after a solve repairs the tree instead of dropping it"""
+        path, found = self.game.incremental_solve()
+        self.assertTrue(found)
+        self.assertEqual(len(path), 6)
+        tree = self.game._incremental
+
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.assertIs(self.game._incremental, tree)
+        path, found = self.game.incremental_solve()
+        self.assertTrue(found)
+        self.assertEqual(len(path), 8)
+        self.assertLess(self.game.states_expanded, 2 ** 4)
+        for state in path:
+            self.assertFalse(self.game.is_bad(state))
+
+    def test_remove_bad_states_repairs_tree(self):
+        """Test that removing bad states after a solve shortens the path again"""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.assertEqual(len(self.game.incremental_solve()[0]), 8)
+        tree = self.game._incremental
+
+        self.game.remove_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.assertIs(self.game._incremental, tree)
+        self.assertEqual(self.game.badStates, set())
+        path, found = self.game.incremental_solve()
+        self.assertTrue(found)
+        self.assertEqual(len(path), 6)
+
+    def test_remove_bad_states_ignores_unknown_states(self):
+        """Test that removing a state that is not bad leaves the game unchanged"""
+        self.game.add_bad_states(self.wolf_goat_cabbage_bad_states())
+        self.game.incremental_solve()
+        self.game.remove_bad_states([State([True, False, True, False])])
+        self.assertEqual(len(self.game.badStates), 6)
+        self.assertEqual(self.game.states_expanded, 16 - 6)
+
+    def test_target_becomes_unreachable(self):
+        """Test that cutting off the target is reported and undone by removing the bad states again"""
+        self.game.incremental_solve()
+        # every state after the first crossing
+        blocked = [State.from_mask(mask, 4) for mask in State.neighbour_masks(0b1111, 4)]
+        self.game.add_bad_states(blocked)
+        self.assertEqual(self.game.incremental_solve(), ([], False))
+        self.game.remove_bad_states(blocked)
+        self.assertEqual(len(self.game.incremental_solve()[0]), 6)
+
+    def test_rules_and_source_changes_rebuild(self):
+        """Test that adding rules drops the tree and that a new source grows a new one"""
+        self.game.incremental_solve()
+        self.game.add_bad_rules([PredicateRule(lambda mask: mask == 0b1010)])
+        self.assertIsNone(self.game._incremental)
+        self.assertEqual(len(self.game.incremental_solve()[0]), 6)
+        self.assertEqual(self.game.states_expanded, 2 ** 4 - 1)
+
+        self.game.set_source(State([True, True, False, False]))
+        self.game.incremental_solve()
+        self.assertEqual(self.game._incremental.root, State([True, True, False, False]).mask)
+
+    def test_matches_bfs_on_random_changes(self):
+        """Test that the incremental solve finds paths as short as bfs after every change"""
+        rng = random.Random(11)
+        masks = range(1, 2 ** 4 - 1)
+        self.game.incremental_solve()
+        for _ in range(30):
+            if self.game.badStates and rng.random() < 0.4:
+                self.game.remove_bad_states(rng.sample(sorted(self.game.badStates, key=hash), 1))
+            else:
+                self.game.add_bad_states([State.from_mask(rng.choice(masks), 4)])
+            path, found = self.game.incremental_solve()
+            expected, expected_found = self.game.bfs()
+            self.assertEqual(found, expected_found)
+            self.assertEqual(len(path), len(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
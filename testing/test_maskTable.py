@@ -0,0 +1,47 @@
+import unittest
+from src.farmerGame.maskTable import MaskTable
+
+
+class TestMaskTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = [MaskTable(4, dense=True), MaskTable(4, dense=False)]
+
+    def test_set_and_get(self):
+        """Test that values are stored and looked up in both representations"""
+        for table in self.tables:
+            table[0b0101] = 0b0100
+            table[0b0000] = 0b0000
+            self.assertEqual(table[0b0101], 0b0100)
+            self.assertEqual(table.get(0b0000), 0)
+            self.assertIsNone(table.get(0b1111))
+            self.assertEqual(table.get(0b1111, 7), 7)
+            self.assertIn(0b0101, table)
+            self.assertNotIn(0b1111, table)
+            self.assertEqual(len(table), 2)
+            self.assertEqual(sorted(table), [0b0000, 0b0101])
+
+    def test_missing_key(self):
+        """Test that a missing mask raises a KeyError"""
+        for table in self.tables:
+            with self.assertRaises(KeyError):
+                table[0b0011]
+
+    def test_overwrite(self):
+        """Test that overwriting a value does not change the size"""
+        for table in self.tables:
+            table[3] = 1
+            table[3] = 2
+            self.assertEqual(table[3], 2)
+            self.assertEqual(len(table), 1)
+
+    def test_distance_typecode(self):
+        """Test that a table of distances uses its own missing marker"""
+        table = MaskTable(4, typecode="L")
+        table[1] = 0
+        self.assertEqual(table[1], 0)
+        self.assertNotIn(2, table)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import ctypes
+import multiprocessing
+import unittest
+from src.farmerGame.badStateRules import TogetherWithoutRule
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.parallelSearch import _shared_buffers, parallel_bfs
+from src.farmerGame.state import State
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.item_names = ("Farmer", "Wolf", "Goat", "Cabbage")
+        self.game = FarmerGame(self.item_names)
+        self.game.set_source(State([False, False, False, False]))
+        self.game.set_target(State([True, True, True, True]))
+
+    def test_path_without_bad_states(self):
+        """Test that the parallel search finds the shortest path on the masks directly"""
+        path, expanded = parallel_bfs(4, 0b0000, 0b1111, workers=2)
+        self.assertEqual(len(path), 6)
+        self.assertEqual(path[0], 0b0000)
+        self.assertEqual(path[-1], 0b1111)
+        self.assertGreater(expanded, 0)
+
+    def test_source_is_target(self):
+        """Test that a search from the target to itself returns a path of one state without starting workers"""
+        path, expanded = parallel_bfs(4, 0b1111, 0b1111, workers=2)
+        self.assertEqual(path, [0b1111])
+        self.assertEqual(expanded, 0)
+
+    def test_matches_bfs(self):
+        """Test that the parallel search returns a valid path as short as the BFS"""
+        self.game.add_bad_states([State([False, True, True, False]), State([True, False, False, True])])
+        self.game.add_bad_rules([TogetherWithoutRule([2, 3], [0])])
+        path, _ = self.game.bfs()
+        parallel_path, success = self.game.parallel_bfs(workers=3)
+
+        self.assertTrue(success)
+        self.assertEqual(len(parallel_path), len(path))
+        for curr, next_state in zip(parallel_path, parallel_path[1:]):
+            self.assertIn(next_state, curr.get_neighbours())
+            self.assertFalse(self.game.is_bad(next_state))
+            self.assertIs(next_state.prev, curr)
+
+    def test_small_buffers(self):
+        """Test that levels larger than the shared buffers are exchanged in several rounds"""
+        n_items = 10
+        path, _ = parallel_bfs(n_items, 0, (1 << n_items) - 1, capacity=2, workers=3, buffer_pairs=4)
+        game = FarmerGame(tuple(f"Item{i}" for i in range(n_items)), capacity=2)
+        game.set_source(State.from_mask(0, n_items))
+        game.set_target(State.from_mask((1 << n_items) - 1, n_items))
+        expected, _ = game.bfs()
+        self.assertEqual(len(path), len(expected))
+        for curr, next_mask in zip(path, path[1:]):
+            self.assertIn(next_mask, State.neighbour_masks(curr, n_items, 2))
+
+    def test_shared_memory_linear_in_workers(self):
+        """Test that the exchange buffers hold one region per worker instead of one per pair of workers"""
+        workers, buffer_pairs = 128, 1 << 10
+        buffers, slots = _shared_buffers(multiprocessing.get_context(), workers, buffer_pairs)
+        self.assertEqual(ctypes.sizeof(buffers), workers * 2 * buffer_pairs * 8)
+        self.assertEqual(ctypes.sizeof(slots), workers * workers * 2 * 8)
+
+    def test_no_solution(self):
+        """Test that the parallel search reports an unreachable target"""
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        path, success = self.game.parallel_bfs(workers=2)
+        self.assertFalse(success)
+        self.assertEqual(path, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.searchStats import SearchStats
+from src.farmerGame.state import State
+from src.farmerGame.vectorSearch import np
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def setUp(self):
+        self.game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        self.game.set_source(State([False, False, False, False]))
+        self.game.set_target(State([True, True, True, True]))
+        self.game.add_bad_states(
+            [
+                State([False, True, True, False]),
+                State([False, True, True, True]),
+                State([False, False, True, True]),
+                State([True, False, False, True]),
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+            ]
+        )
+
+    def test_bfs_counters(self):
+        """Test that every generated neighbour is counted as a duplicate, a bad state or a new state"""
+        path, success = self.game.bfs()
+        stats = self.game.stats
+
+        self.assertTrue(success)
+        self.assertEqual(stats.expanded, self.game.states_expanded)
+        self.assertGreater(stats.bad_rejections, 0)
+        self.assertGreater(stats.duplicates, 0)
+        self.assertEqual(stats.depth, len(path))
+        self.assertGreaterEqual(stats.total_seconds, sum(stats.level_seconds))
+        self.assertEqual(stats.peak_frontier, 2)
+        new_states = stats.generated - stats.duplicates - stats.bad_rejections
+        self.assertGreaterEqual(new_states, stats.expanded)
+
+    def test_hooks(self):
+        """Test that the hooks see every expanded state but the target, every completed level and the path"""
+        expanded = []
+        levels = []
+        goals = []
+        path, _ = self.game.bfs(
+            on_expand=expanded.append,
+            on_level=lambda depth, stats: levels.append((depth, stats.expanded)),
+            on_goal=lambda path, stats: goals.append((path, stats)),
+        )
+
+        self.assertEqual(len(expanded), self.game.stats.expanded)
+        self.assertEqual(expanded[0], self.game.source)
+        self.assertNotIn(self.game.target, expanded)
+        self.assertEqual([depth for depth, _ in levels], list(range(len(path) - 1)))
+        self.assertEqual(goals, [(path, self.game.stats)])
+
+    def test_expanded_across_strategies(self):
+        """Test that every strategy leaves the target out of the expanded states"""
+        breadth_first = ("bfs", "compact_bfs", "vectorized_bfs", "parallel_bfs", "external_bfs", "dijkstra")
+        for strategy in breadth_first + ("symmetric_bfs",):
+            with self.subTest(strategy=strategy):
+                if strategy == "vectorized_bfs" and np is None:
+                    self.skipTest("numpy is not installed")
+                getattr(self.game, strategy)()
+                self.assertEqual(self.game.states_expanded, 9)
+        self.assertEqual(self.game.stats.expanded, 9)
+
+        self.game.set_target(self.game.source)
+        for strategy in breadth_first + ("symmetric_bfs", "bidirectional_bfs", "astar", "ida_star"):
+            with self.subTest(strategy=strategy):
+                if strategy == "vectorized_bfs" and np is None:
+                    self.skipTest("numpy is not installed")
+                self.assertTrue(getattr(self.game, strategy)()[1])
+                self.assertEqual(self.game.states_expanded, 0)
+
+    def test_no_solution(self):
+        """Test that an exhausted search reports every level and never calls the goal hook"""
+        self.game.add_bad_states([State([True, False, True, False])])
+        goals = []
+        self.assertEqual(self.game.bfs(on_goal=lambda path, stats: goals.append(path)), ([], False))
+        self.assertEqual(goals, [])
+        self.assertEqual(self.game.stats.expanded, 1)
+        self.assertEqual(self.game.stats.bad_rejections, 4)
+        self.assertEqual(self.game.stats.generated, 4)
+
+    def test_as_dict(self):
+        """Test that the statistics convert to a plain dictionary"""
+        stats = SearchStats(generated=3, level_seconds=[0.5])
+        self.assertEqual(stats.as_dict()["generated"], 3)
+        self.assertEqual(stats.as_dict()["level_seconds"], [0.5])
+        self.assertEqual(stats.depth, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from array import array
+from src.farmerGame.badStateRules import ContainerRule, PredicateRule, TogetherWithoutRule
+from src.farmerGame.binaryFormat import load_instance, write_instance
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.solutionCache import ENTRY_OVERHEAD, SolutionCache, instance_fingerprint
+from src.farmerGame.state import State
+from src.farmerGame.stateSet import SortedMaskArray
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache", "solutions.sqlite")
+        self.cache = SolutionCache(self.path)
+        self.game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        self.game.set_source(State([False, False, False, False]))
+        self.game.set_target(State([True, True, True, True]))
+        self.game.add_bad_rules([TogetherWithoutRule([1, 2], [0]), TogetherWithoutRule([2, 3], [0])])
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_fingerprint_ignores_order(self):
+        """Test that the fingerprint does not depend on the order of the bad states and rules"""
+        first = TogetherWithoutRule([1, 2], [0])
+        second = TogetherWithoutRule([2, 3], [0])
+        self.assertEqual(
+            instance_fingerprint(("F", "A", "B", "C"), 1, 0, 15, [3, 5], [first, second]),
+            instance_fingerprint(("F", "A", "B", "C"), 1, 0, 15, [5, 3], [second, first]),
+        )
+        self.assertNotEqual(
+            instance_fingerprint(("F", "A", "B", "C"), 1, 0, 15, [3], [first]),
+            instance_fingerprint(("F", "A", "B", "C"), 2, 0, 15, [3], [first]),
+        )
+        self.assertIsNone(instance_fingerprint(("F", "A"), 1, 0, 3, [], [PredicateRule(lambda mask: False)]))
+
+    def test_fingerprint_of_mapped_masks(self):
+        """Test that sorted masks get the same fingerprint from a list, an array and a memory-mapped binary file"""
+        masks = [3, 5, 6, 9, 12]
+        binary_path = os.path.join(self.directory.name, "instance.fgb")
+        write_instance(binary_path, ("F", "A", "B", "C"), 0, 15, masks, encoding="sorted")
+        mapped = load_instance(binary_path).badRules[0]
+        self.assertIsInstance(mapped.masks.masks, memoryview)
+        self.assertEqual(mapped.fingerprint(), ContainerRule(SortedMaskArray(masks)).fingerprint())
+        self.assertEqual(mapped.fingerprint(), ContainerRule(SortedMaskArray(array("Q", masks))).fingerprint())
+        self.assertNotEqual(mapped.fingerprint(), ContainerRule(SortedMaskArray(masks[1:])).fingerprint())
+
+    def test_bfs_uses_cache_across_instances(self):
+        """Test that a second cache on the same file answers without searching"""
+        path, success = self.game.bfs(cache=self.cache)
+        self.assertTrue(success)
+        self.assertGreater(self.game.states_expanded, 0)
+        self.cache.close()
+
+        cache = SolutionCache(self.path)
+        cached_path, cached_success = self.game.bfs(cache=cache)
+        cache.close()
+        self.assertTrue(cached_success)
+        self.assertEqual(self.game.states_expanded, 0)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual([state.mask for state in cached_path], [state.mask for state in path])
+        for curr, next_state in zip(cached_path, cached_path[1:]):
+            self.assertIs(next_state.prev, curr)
+
+    def test_no_solution_is_cached(self):
+        """Test that a game without a solution is cached as such"""
+        self.game.add_bad_states([State([True, False, True, False])])
+        self.game.add_bad_rules([TogetherWithoutRule([1, 3], [0])])
+        self.assertEqual(self.game.bfs(cache=self.cache), ([], False))
+        self.assertEqual(self.game.bfs(cache=self.cache), ([], False))
+        self.assertEqual(self.game.states_expanded, 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_changed_game_misses(self):
+        """Test that adding a bad state changes the key, so the old solution is not returned"""
+        path, _ = self.game.bfs(cache=self.cache)
+        self.game.add_bad_states([path[1]])
+        self.game.bfs(cache=self.cache)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_eviction(self):
+        """Test that the least recently used solutions are evicted when the file grows too large"""
+        cache = SolutionCache(
+            os.path.join(self.directory.name, "small.sqlite"), max_bytes=3 * (ENTRY_OVERHEAD + 3), memo_size=0
+        )
+        for key in ("a", "b", "c"):
+            cache.store(key, [1, 2], True)
+        self.assertIsNotNone(cache.lookup("a"))
+        cache.store("d", [1, 2], True)
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.lookup("b"))
+        self.assertEqual(cache.lookup("a"), ((1, 2), True))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -56,6 +56,46 @@ class TestState(unittest.TestCase):
         invalid_state = State([False, False, True, True])  # Example invalid state
         self.assertNotIn(invalid_state, neighbors)
 
+    def test_from_mask(self):
+        """Test that a State built from a bitmask equals the State built from booleans"""
+        state = State.from_mask(0b1001, 4)
+        self.assertEqual(state, self.state1)
+        self.assertEqual(hash(state), hash(self.state1))
+        self.assertEqual(state.items_left, self.items_left1)
+        self.assertEqual(self.state2.mask, 0b0110)
+
+    def test_slots(self):
+        """Test that State objects do not carry a per-instance __dict__"""
+        self.assertFalse(hasattr(self.state1, "__dict__"))
+
+    def test_neighbours_move_farmer_side_items(self):
+        """Test that only the farmer and items on the farmer's side are moved"""
+        neighbors = self.state1.get_neighbours()
+        self.assertEqual(
+            neighbors,
+            [State([False, False, False, True]), State([False, False, False, False])],
+        )
+        for neighbor in neighbors:
+            self.assertIs(neighbor.prev, self.state1)
+        # the original state is left untouched
+        self.assertEqual(self.state1.items_left, self.items_left1)
+
+    def test_neighbours_with_capacity(self):
+        """Test that a larger boat takes every combination of up to `capacity` items from the farmer's side"""
+        state = State([False, False, False, False, True])
+        neighbor_masks = {neighbor.mask for neighbor in state.get_neighbours(capacity=2)}
+        self.assertEqual(
+            neighbor_masks,
+            {0b10001, 0b10011, 0b10101, 0b11001, 0b10111, 0b11011, 0b11101},
+        )
+        self.assertEqual(len(state.get_neighbours(capacity=3)), 8)
+
+    def test_move_masks(self):
+        """Test that the precomputed crossings are the farmer alone or with up to `capacity` items"""
+        self.assertEqual(State.move_masks(4), (0b0001, 0b0011, 0b0101, 0b1001))
+        self.assertEqual(len(State.move_masks(5, 2)), 1 + 4 + 6)
+        self.assertEqual(len(State.move_masks(3, 5)), 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from src.farmerGame.state import State
+from src.farmerGame.stateSet import (
+    DENSE_MAX_ITEMS,
+    StateBitSet,
+    mask_container,
+    new_visited_set,
+)
+
+
+class TestStateBitSet(unittest.TestCase):
+
+    def setUp(self):
+        self.bit_set = StateBitSet(4)
+
+    def test_add_and_contains(self):
+        """Test that states and masks can be added and looked up interchangeably"""
+        self.bit_set.add(State([True, False, False, True]))
+        self.bit_set.add(0b0110)
+        self.assertIn(0b1001, self.bit_set)
+        self.assertIn(State([False, True, True, False]), self.bit_set)
+        self.assertNotIn(0b0000, self.bit_set)
+        self.assertEqual(len(self.bit_set), 2)
+
+    def test_add_twice(self):
+        """Test that adding a state twice does not change the size"""
+        self.bit_set.add(0b0001)
+        self.bit_set.add(0b0001)
+        self.assertEqual(len(self.bit_set), 1)
+
+    def test_discard(self):
+        """Test that discarded states are no longer contained"""
+        self.bit_set.add(0b1111)
+        self.bit_set.discard(0b1111)
+        self.bit_set.discard(0b1110)
+        self.assertNotIn(0b1111, self.bit_set)
+        self.assertEqual(len(self.bit_set), 0)
+
+    def test_iteration_is_sorted(self):
+        """Test that iterating yields the stored masks in increasing order"""
+        masks = [0b1111, 0b0000, 0b1000, 0b0011]
+        bit_set = StateBitSet.from_masks(masks, 4)
+        self.assertEqual(list(bit_set), sorted(masks))
+
+    def test_existing_buffer(self):
+        """Test that an existing bit array is used as storage and counted lazily"""
+        bit_set = StateBitSet(4, bytearray([0b00000101, 0b10000000]))
+        self.assertEqual(list(bit_set), [0, 2, 15])
+        self.assertEqual(len(bit_set), 3)
+        with self.assertRaises(ValueError):
+            StateBitSet(5, bytearray(2))
+
+    def test_representation_choice(self):
+        """Test that small games get dense sets and sparse bad states stay in a frozenset"""
+        self.assertIsInstance(new_visited_set(4), StateBitSet)
+        self.assertIsInstance(new_visited_set(DENSE_MAX_ITEMS + 1), set)
+        self.assertIsInstance(mask_container(range(16), 4), StateBitSet)
+        self.assertIsInstance(mask_container([1, 2], 20), frozenset)
+
+
+if __name__ == "__main__":
+    unittest.main()
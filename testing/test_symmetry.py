@@ -0,0 +1,118 @@
+import os
+import unittest
+from itertools import product
+from src.farmerGame.badStateRules import AllOf, CountRule, OutnumberRule
+from src.farmerGame.dataReader import bad_state_reader, game_reader
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.state import State
+from src.farmerGame.symmetry import (
+    canonical,
+    check_symmetric,
+    class_size,
+    concrete_path,
+    count_moves,
+    representative,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestSymmetry(unittest.TestCase):
+
+    def setUp(self):
+        self.groups = [(0,), (1, 2), (3, 4, 5)]
+
+    def test_canonical_and_representative(self):
+        """Test that a representative maps back to its counts and that the class sizes add up to all states"""
+        self.assertEqual(canonical(0b101011, self.groups), (1, 1, 2))
+        total = 0
+        for counts in product(range(2), range(3), range(4)):
+            self.assertEqual(canonical(representative(counts, self.groups), self.groups), counts)
+            total += class_size(counts, self.groups)
+        self.assertEqual(total, 2 ** 6)
+
+    def test_count_moves_match_concrete_moves(self):
+        """Test that the count moves are exactly the counts of the concrete neighbours"""
+        sizes = [len(group) for group in self.groups]
+        for capacity in (1, 2):
+            for mask in range(2 ** 6):
+                expected = {canonical(neighbour, self.groups) for neighbour in State.neighbour_masks(mask, 6, capacity)}
+                moves = list(count_moves(canonical(mask, self.groups), sizes, capacity))
+                self.assertEqual(len(moves), len(set(moves)))
+                self.assertEqual(set(moves), expected)
+
+    def test_check_symmetric(self):
+        """Test that a bad state without the states it can be swapped with is reported"""
+        check_symmetric([0b000011, 0b000101], self.groups)
+        with self.assertRaises(ValueError):
+            check_symmetric([0b000011], self.groups)
+
+    def test_concrete_path(self):
+        """Test that a path of counts expands into concrete moves from the source"""
+        path = concrete_path(0b000000, [(0, 0, 0), (1, 1, 0), (0, 1, 0), (1, 1, 1)], self.groups)
+        self.assertEqual(path, [0b000000, 0b000011, 0b000010, 0b001011])
+
+    def test_pirates_example(self):
+        """Test that the pirates example is solved optimally with the groups it is symmetric in"""
+        game = game_reader(os.path.join(DATA_DIR, "piratesData.txt"))
+        game.add_bad_states(bad_state_reader(os.path.join(DATA_DIR, "piratesBadStates.txt")))
+        game.set_item_groups([["Pirate0", "Pirate1", "Pirate2"], ["Gold0", "Gold1", "Gold2", "Gold3"]])
+
+        path, success = game.symmetric_bfs()
+
+        self.assertTrue(success)
+        self.assertEqual(len(path), len(game.bfs()[0]))
+        self.assertEqual(path[0], game.source)
+        self.assertEqual(path[-1], game.target)
+        for curr, next_state in zip(path, path[1:]):
+            self.assertIn(next_state, curr.get_neighbours())
+            self.assertFalse(game.is_bad(next_state))
+
+        # the example's bad states leave the last piece of gold out, so it cannot join the other gold
+        game.set_item_groups([["Pirate0", "Pirate1", "Pirate2"], ["Gold0", "Gold1", "Gold2", "Gold3", "Gold4"]])
+        with self.assertRaises(ValueError):
+            game.symmetric_bfs()
+
+    def test_large_symmetric_game(self):
+        """Test that a game far too large for bfs is solved over the counts, with bad states given by rules"""
+        n_pirates, n_gold = 30, 40
+        n_items = 1 + n_pirates + n_gold
+        names = ("Captain",) + tuple(f"Pirate{i}" for i in range(n_pirates)) + tuple(f"Gold{i}" for i in range(n_gold))
+        pirates = list(range(1, n_pirates + 1))
+        gold = list(range(n_pirates + 1, n_items))
+        game = FarmerGame(
+            names,
+            bad_rules=[AllOf(CountRule([0], at_least=1), CountRule(pirates, at_least=2), OutnumberRule(pirates, gold))],
+        )
+        game.set_source(State.from_mask(0, n_items))
+        game.set_target(State.from_mask(2 ** n_items - 1, n_items))
+        game.set_item_groups([[names[i] for i in pirates], [names[i] for i in gold]])
+
+        path, success = game.symmetric_bfs()
+
+        self.assertTrue(success)
+        self.assertEqual(path[-1], game.target)
+        self.assertLessEqual(game.states_expanded, 2 * (n_pirates + 1) * (n_gold + 1))
+        for curr, next_state in zip(path, path[1:]):
+            self.assertIn(next_state, curr.get_neighbours())
+            self.assertFalse(game.is_bad(next_state))
+
+    def test_invalid_groups(self):
+        """Test that unknown names, the farmer, overlapping groups and a split target are rejected"""
+        game = FarmerGame(("Farmer", "Wolf", "Goat", "Cabbage"))
+        with self.assertRaises(ValueError):
+            game.set_item_groups([["Wolf", "Sheep"]])
+        with self.assertRaises(ValueError):
+            game.set_item_groups([["Farmer", "Wolf"]])
+        with self.assertRaises(ValueError):
+            game.set_item_groups([["Wolf", "Goat"], ["Goat", "Cabbage"]])
+
+        game.set_item_groups([["Wolf", "Goat"]])
+        game.set_source(State([False, False, False, False]))
+        game.set_target(State([True, True, False, True]))
+        with self.assertRaises(ValueError):
+            game.symmetric_bfs()
+
+
+if __name__ == "__main__":
+    unittest.main()
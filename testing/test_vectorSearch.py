@@ -0,0 +1,74 @@
+import unittest
+from src.farmerGame.farmerGame import FarmerGame
+from src.farmerGame.state import State
+from src.farmerGame.vectorSearch import np, vectorized_bfs
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.item_names = ("Farmer", "Wolf", "Goat", "Cabbage")
+        self.game = FarmerGame(self.item_names)
+        self.game.set_source(State([False, False, False, False]))
+        self.game.set_target(State([True, True, True, True]))
+
+    def test_path_without_bad_states(self):
+        """Test that the vectorized search finds the shortest path on the masks directly"""
+        path, expanded = vectorized_bfs(0b0000, 0b1111, State.move_masks(4))
+        self.assertEqual(len(path), 6)
+        self.assertEqual(path[0], 0b0000)
+        self.assertEqual(path[-1], 0b1111)
+        self.assertGreater(expanded, 0)
+
+    def test_source_is_target(self):
+        """Test that a search from the target to itself returns a path of one state"""
+        path, _ = vectorized_bfs(0b1111, 0b1111, State.move_masks(4))
+        self.assertEqual(path, [0b1111])
+
+    def test_matches_bfs(self):
+        """Test that the vectorized search returns a valid path as short as the BFS"""
+        self.game.add_bad_states(
+            [
+                State([False, True, True, False]),
+                State([False, True, True, True]),
+                State([False, False, True, True]),
+                State([True, False, False, True]),
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+            ]
+        )
+        path, _ = self.game.bfs()
+        vectorized_path, success = self.game.vectorized_bfs()
+
+        self.assertTrue(success)
+        self.assertEqual(len(vectorized_path), len(path))
+        for curr, next_state in zip(vectorized_path, vectorized_path[1:]):
+            self.assertIn(next_state, curr.get_neighbours())
+            self.assertNotIn(next_state, self.game.badStates)
+            self.assertIs(next_state.prev, curr)
+
+    def test_capacity(self):
+        """Test that the vectorized search uses the crossings of a larger boat"""
+        game = FarmerGame(tuple(f"Item{i}" for i in range(7)), capacity=2)
+        game.set_source(State([False] * 7))
+        game.set_target(State([True] * 7))
+        path, success = game.vectorized_bfs()
+        self.assertTrue(success)
+        self.assertEqual(len(path) - 1, 5)
+
+    def test_no_solution(self):
+        """Test that the vectorized search returns no solution when blocked by bad states"""
+        self.game.add_bad_states(
+            [
+                State([True, False, False, False]),
+                State([True, True, False, False]),
+                State([True, False, True, False]),
+                State([True, False, False, True]),
+            ]
+        )
+        self.assertEqual(self.game.vectorized_bfs(), ([], False))
+
+
+if __name__ == "__main__":
+    unittest.main()